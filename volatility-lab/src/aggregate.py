@@ -0,0 +1,274 @@
+import numpy as np
+import pandas as pd
+
+RANKING_KEYS = ["event_name", "metric", "pre", "post"]
+
+RANKING_COLUMNS = RANKING_KEYS + [
+    "n_tickers", "n_events", "avg_pct_change", "median_pct_change", "std_pct_change",
+    "avg_pct_up", "share_tickers_up",
+    "event_avg_pct_change", "event_median_pct_change", "event_std_pct_change",
+]
+
+
+class RunningStats:
+    """
+    Mergeable count / sum / sum of squares / min / max of a stream of values (NaNs skipped).
+    """
+
+    __slots__ = ("count", "total", "total_sq", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, values) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.total_sq += float(np.dot(values, values))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "RunningStats") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else np.nan
+
+    @property
+    def std(self) -> float:
+        """
+        Sample standard deviation (ddof=1).
+        """
+        if self.count < 2:
+            return np.nan
+        var = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return float(np.sqrt(max(var, 0.0)))
+
+
+class TDigest:
+    """
+    Mergeable quantile sketch (merging t-digest with the arcsine scale function).
+
+    Values and merged-in centroids are kept as weighted centroids. Once more
+    than buffer_factor * compression of them pile up, neighbouring centroids
+    are merged greedily while each spans at most one unit of
+    k(q) = compression / (2 pi) * asin(2q - 1). The tails therefore stay
+    fine-grained, and memory stays O(compression) however many values the
+    sketch has seen. Streams shorter than the buffer are never compressed,
+    so their quantiles are exact.
+    """
+
+    __slots__ = ("compression", "buffer_factor", "means", "weights", "min", "max", "_pending")
+
+    def __init__(self, compression: float = 200.0, buffer_factor: int = 10):
+        self.compression = compression
+        self.buffer_factor = buffer_factor
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.min = np.inf
+        self.max = -np.inf
+        # (means, weights) not yet folded into the sorted centroid arrays
+        self._pending: list[tuple[np.ndarray, np.ndarray]] = []
+
+    def _push(self, means: np.ndarray, weights: np.ndarray) -> None:
+        self._pending.append((means, weights))
+        if len(self.means) + sum(len(m) for m, _ in self._pending) > self.buffer_factor * self.compression:
+            self._flush()
+            self._compress()
+
+    def add(self, values) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._push(values, np.ones(len(values)))
+
+    def merge(self, other: "TDigest") -> None:
+        other._flush()
+        if len(other.means) == 0:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._push(other.means, other.weights)
+
+    @property
+    def count(self) -> float:
+        self._flush()
+        return float(self.weights.sum())
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        means = np.concatenate([self.means] + [m for m, _ in self._pending])
+        weights = np.concatenate([self.weights] + [w for _, w in self._pending])
+        self._pending = []
+        order = np.argsort(means, kind="stable")
+        self.means, self.weights = means[order], weights[order]
+
+    def _q_limit(self, q: float) -> float:
+        # furthest q a centroid starting at q may reach: one unit of k further on
+        scale = self.compression / (2.0 * np.pi)
+        k = min(scale * np.arcsin(2.0 * q - 1.0) + 1.0, scale * np.pi / 2.0)
+        return (np.sin(k / scale) + 1.0) / 2.0
+
+    def _compress(self) -> None:
+        if len(self.means) < 2:
+            return
+        means, weights = self.means.tolist(), self.weights.tolist()
+        total = float(self.weights.sum())
+
+        out_m, out_w = [], []
+        cur_m, cur_w = means[0], weights[0]
+        before = 0.0
+        limit = self._q_limit(0.0)
+        for m, w in zip(means[1:], weights[1:]):
+            if (before + cur_w + w) / total <= limit:
+                cur_w += w
+                cur_m += (m - cur_m) * w / cur_w
+            else:
+                out_m.append(cur_m)
+                out_w.append(cur_w)
+                before += cur_w
+                limit = self._q_limit(before / total)
+                cur_m, cur_w = m, w
+        out_m.append(cur_m)
+        out_w.append(cur_w)
+
+        self.means = np.asarray(out_m)
+        self.weights = np.asarray(out_w)
+
+    def quantile(self, q: float) -> float:
+        self._flush()
+        if len(self.means) == 0:
+            return np.nan
+        if len(self.means) == 1:
+            return float(self.means[0])
+        centres = np.cumsum(self.weights) - self.weights / 2.0
+        target = q * self.weights.sum()
+        if target <= centres[0]:
+            return float(self.min if q <= 0 else self.means[0])
+        if target >= centres[-1]:
+            return float(self.max if q >= 1 else self.means[-1])
+        return float(np.interp(target, centres, self.means))
+
+
+class _MetricAggregate:
+    __slots__ = ("n_tickers", "tickers", "ticker_digest", "events", "event_digest", "n_events", "pct_up_sum", "n_up")
+
+    def __init__(self, compression: float):
+        self.n_tickers = 0
+        self.tickers = RunningStats()
+        self.ticker_digest = TDigest(compression)
+        self.events = RunningStats()
+        self.event_digest = TDigest(compression)
+        self.n_events = 0
+        self.pct_up_sum = 0.0
+        self.n_up = 0
+
+    def merge(self, other: "_MetricAggregate") -> None:
+        self.n_tickers += other.n_tickers
+        self.tickers.merge(other.tickers)
+        self.ticker_digest.merge(other.ticker_digest)
+        self.events.merge(other.events)
+        self.event_digest.merge(other.event_digest)
+        self.n_events += other.n_events
+        self.pct_up_sum += other.pct_up_sum
+        self.n_up += other.n_up
+
+
+class UniverseAggregate:
+    """
+    Streaming cross-sectional estimator ranking for a ticker universe.
+
+    Each ticker's event summary (and optionally its event rows) is folded
+    into fixed-size statistics per (event_name, metric, pre, post) and then
+    dropped, so memory does not grow with the number of tickers or events.
+    Aggregates built by parallel workers combine exactly with merge():
+    counts, sums and sums of squares add up, and the t-digest sketches for
+    the medians merge.
+
+    Ticker-level columns weight every ticker equally (avg_pct_change is the
+    mean of per-ticker avg_pct_change); event_* columns pool every event of
+    every ticker.
+    """
+
+    __slots__ = ("compression", "groups", "tickers")
+
+    def __init__(self, compression: float = 200.0):
+        self.compression = compression
+        self.groups: dict[tuple, _MetricAggregate] = {}
+        self.tickers: set[str] = set()
+
+    def _group(self, key: tuple) -> _MetricAggregate:
+        agg = self.groups.get(key)
+        if agg is None:
+            agg = self.groups[key] = _MetricAggregate(self.compression)
+        return agg
+
+    def add_ticker(self, ticker: str, summary: pd.DataFrame, rows: pd.DataFrame | None = None) -> None:
+        """
+        Fold in one ticker's event summary (panel_event_study output) and, optionally, its event rows.
+        """
+        if summary.empty:
+            return
+        self.tickers.add(ticker)
+
+        for rec in summary[RANKING_KEYS + ["n_events", "avg_delta", "pct_up", "avg_pct_change"]].itertuples(index=False):
+            agg = self._group(tuple(rec[:4]))
+            agg.n_tickers += 1
+            agg.tickers.add([rec.avg_pct_change])
+            agg.ticker_digest.add([rec.avg_pct_change])
+            agg.n_events += int(rec.n_events)
+            agg.pct_up_sum += float(rec.pct_up)
+            agg.n_up += int(rec.avg_delta > 0)
+
+        if rows is not None and not rows.empty:
+            pre, post = int(summary["pre"].iloc[0]), int(summary["post"].iloc[0])
+            pct = pd.to_numeric(rows["pct_change"], errors="coerce").to_numpy(dtype=np.float64)
+            for (event_name, metric), idx in rows.groupby(["event_name", "metric"], sort=False).indices.items():
+                agg = self._group((event_name, metric, pre, post))
+                agg.events.add(pct[idx])
+                agg.event_digest.add(pct[idx])
+
+    def merge(self, other: "UniverseAggregate") -> None:
+        for key, agg in other.groups.items():
+            self._group(key).merge(agg)
+        self.tickers |= other.tickers
+
+    def ranking(self) -> pd.DataFrame:
+        """
+        One row per (event_name, metric, pre, post), most reactive (highest avg_pct_change) first.
+        """
+        records = []
+        for key, agg in self.groups.items():
+            n = agg.n_tickers
+            records.append(key + (
+                n,
+                agg.n_events,
+                agg.tickers.mean,
+                agg.ticker_digest.quantile(0.5),
+                agg.tickers.std,
+                agg.pct_up_sum / n if n else np.nan,
+                agg.n_up / n * 100.0 if n else np.nan,
+                agg.events.mean,
+                agg.event_digest.quantile(0.5),
+                agg.events.std,
+            ))
+        if not records:
+            return pd.DataFrame(columns=RANKING_COLUMNS)
+        ranking = pd.DataFrame.from_records(records, columns=RANKING_COLUMNS)
+        return ranking.sort_values(by="avg_pct_change", ascending=False, ignore_index=True)
@@ -0,0 +1,293 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.cli import build_vol_panel, event_metrics, run_event_comparison
+from src.event_study import event_paths, pre_post_event_change
+from src.quality import validate_ohlc
+from src.synthetic import synthetic_event_dates, synthetic_ohlc
+from src.volatility import (
+    PrefixSums,
+    annualize_vol,
+    bar_variance_terms,
+    chunked_vol_panel,
+    close_to_close_volatility,
+    compute_log_returns,
+    ewma_volatility,
+    fit_garch,
+    fused_vol_panel,
+    garch_variance,
+    garch_volatility,
+    garman_klass_volatility,
+    parkinson_volatility,
+    parse_int_list,
+    rogers_satchell_volatility,
+    rolling_mean_multi,
+    rolling_std_multi,
+    yang_zhang_volatility,
+)
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = Path(__file__).resolve().parent.parent / "benchmarks" / "baseline.json"
+
+# timings below this are mostly interpreter noise and are never flagged
+MIN_COMPARABLE_SECONDS = 1e-3
+
+RESULT_COLUMNS = ["case", "n_bars", "n_events", "seconds", "bars_per_sec", "ns_per_bar", "events_per_sec", "peak_mb"]
+
+# fixed per-bar GARCH(1,1) parameters for the filter-only case (fitting is timed separately)
+BENCH_GARCH_PARAMS = (1e-6, 0.08, 0.9)
+
+
+class BenchContext:
+    """
+    Inputs shared by every case at one history length, built once outside the timed region.
+    """
+
+    def __init__(self, n_bars: int, windows: list[int], pre: int, post: int, event_every: int, workdir: Path):
+        self.n_bars = n_bars
+        self.windows = windows
+        self.pre = pre
+        self.post = post
+        self.df = synthetic_ohlc(n_bars)
+        self.events = synthetic_event_dates(self.df.index, every=event_every)
+        self.panel = fused_vol_panel(self.df, windows=windows)
+        self.returns = self.panel["log_return"].to_numpy()
+        self.metric = f"c2c_{windows[0]}"
+
+        self.event_file = workdir / f"events_{n_bars}.csv"
+        pd.DataFrame({"date": self.events.strftime("%Y-%m-%d")}).to_csv(self.event_file, index=False)
+
+
+# name -> (builds the zero-argument call to time, whether throughput is also per event)
+CASES: dict[str, tuple[Callable[[BenchContext], Callable[[], object]], bool]] = {
+    "compute_log_returns": (lambda c: lambda: compute_log_returns(c.df["Adj Close"]), False),
+    "annualize_vol": (lambda c: lambda: annualize_vol(c.panel["log_return"]), False),
+    "prefix_sums": (lambda c: lambda: PrefixSums(c.returns), False),
+    "rolling_mean_multi": (lambda c: lambda: rolling_mean_multi(c.returns, c.windows), False),
+    "rolling_std_multi": (lambda c: lambda: rolling_std_multi(c.returns, c.windows), False),
+    "close_to_close_volatility": (lambda c: lambda: close_to_close_volatility(c.df, windows=c.windows), False),
+    "parkinson_volatility": (lambda c: lambda: parkinson_volatility(c.df, windows=c.windows), False),
+    "garman_klass_volatility": (lambda c: lambda: garman_klass_volatility(c.df, windows=c.windows), False),
+    "rogers_satchell_volatility": (lambda c: lambda: rogers_satchell_volatility(c.df, windows=c.windows), False),
+    "yang_zhang_volatility": (lambda c: lambda: yang_zhang_volatility(c.df, windows=c.windows), False),
+    "ewma_volatility": (lambda c: lambda: ewma_volatility(c.df, windows=c.windows), False),
+    "garch_variance": (lambda c: lambda: garch_variance(c.returns, *BENCH_GARCH_PARAMS), False),
+    "fit_garch": (lambda c: lambda: fit_garch(c.returns - c.returns.mean()), False),
+    "garch_volatility": (lambda c: lambda: garch_volatility(c.df, params=BENCH_GARCH_PARAMS), False),
+    "validate_ohlc": (lambda c: lambda: validate_ohlc(c.df), False),
+    "bar_variance_terms": (lambda c: lambda: bar_variance_terms(c.df), False),
+    "fused_vol_panel": (lambda c: lambda: fused_vol_panel(c.df, windows=c.windows), False),
+    "chunked_vol_panel": (lambda c: lambda: chunked_vol_panel(c.df, windows=c.windows), False),
+    "build_vol_panel": (lambda c: lambda: build_vol_panel(c.df, windows=c.windows), False),
+    "pre_post_event_change": (
+        lambda c: lambda: pre_post_event_change(c.panel[c.metric], c.events, pre=c.pre, post=c.post),
+        True,
+    ),
+    "event_paths": (
+        lambda c: lambda: event_paths(c.panel, c.events, pre=c.pre, post=c.post, metrics=event_metrics(c.windows)),
+        True,
+    ),
+    "run_event_comparison": (
+        lambda c: lambda: run_event_comparison(
+            c.panel, str(c.event_file), "BENCH", c.pre, c.post, metrics=event_metrics(c.windows)
+        ),
+        True,
+    ),
+}
+
+
+def _best_seconds(fn: Callable[[], object], repeat: int) -> float:
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak_mb(fn: Callable[[], object]) -> float:
+    """
+    Peak bytes allocated while fn runs (numpy buffers included), in MiB.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return (peak - before) / 2**20
+
+
+def run_benchmarks(
+    sizes: list[int] = DEFAULT_SIZES,
+    cases: list[str] | None = None,
+    windows: list[int] = [20, 60, 120],
+    pre: int = 20,
+    post: int = 20,
+    event_every: int = 50,
+    repeat: int = 3,
+    memory: bool = True,
+    verbose: bool = False,
+) -> pd.DataFrame:
+    """
+    Time every case on synthetic GBM histories of each size (no network).
+
+    Each case is run `repeat` times and the best wall time is kept; peak
+    memory comes from one extra run under tracemalloc, so it does not skew
+    the timings.
+
+    Returns one row per (case, n_bars) with RESULT_COLUMNS.
+    """
+    names = list(CASES) if cases is None else cases
+    unknown = sorted(set(names) - set(CASES))
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {unknown}")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_bars in sizes:
+            ctx = BenchContext(int(n_bars), [int(w) for w in windows], pre, post, event_every, Path(tmp))
+            n_events = len(ctx.events)
+
+            for name in names:
+                build, per_event = CASES[name]
+                fn = build(ctx)
+                seconds = _best_seconds(fn, repeat)
+                rows.append({
+                    "case": name,
+                    "n_bars": ctx.n_bars,
+                    "n_events": n_events if per_event else 0,
+                    "seconds": seconds,
+                    "bars_per_sec": ctx.n_bars / seconds,
+                    "ns_per_bar": seconds / ctx.n_bars * 1e9,
+                    "events_per_sec": n_events / seconds if per_event else np.nan,
+                    "peak_mb": _peak_mb(fn) if memory else np.nan,
+                })
+                if verbose:
+                    r = rows[-1]
+                    print(f"{name:<28} n={ctx.n_bars:>10,}  {seconds * 1e3:10.2f} ms  "
+                          f"{r['bars_per_sec']:14,.0f} bars/s  {r['ns_per_bar']:9.1f} ns/bar  {r['peak_mb']:9.1f} MiB")
+
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def save_results(results: pd.DataFrame, path: Path) -> Path:
+    """
+    Write benchmark results as JSON, with the interpreter/library versions they were taken on.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": json.loads(results.to_json(orient="records")),
+    }
+    path.write_text(json.dumps(doc, indent=2) + "\n")
+    return path
+
+
+def load_results(path: Path) -> pd.DataFrame:
+    doc = json.loads(Path(path).read_text())
+    return pd.DataFrame(doc["results"], columns=RESULT_COLUMNS)
+
+
+def add_to_baseline(baseline: pd.DataFrame, results: pd.DataFrame) -> pd.DataFrame:
+    """
+    The baseline plus the (case, n_bars) rows of results it does not have yet.
+
+    Existing entries are kept as they are, so adding a case never moves the
+    reference timings the other cases are compared against.
+    """
+    known = pd.MultiIndex.from_frame(baseline[["case", "n_bars"]])
+    new = results[~pd.MultiIndex.from_frame(results[["case", "n_bars"]]).isin(known)]
+    return pd.concat([baseline, new], ignore_index=True)
+
+
+def compare_to_baseline(results: pd.DataFrame, baseline: pd.DataFrame, tolerance: float = 1.5) -> pd.DataFrame:
+    """
+    Line results up with a stored baseline by (case, n_bars).
+
+    Adds time_ratio and mem_ratio (current / baseline) and a `regression`
+    flag for cases more than `tolerance` times slower. Cases missing from
+    the baseline get NaN ratios and are never flagged.
+    """
+    base = baseline[["case", "n_bars", "seconds", "peak_mb"]].rename(
+        columns={"seconds": "baseline_seconds", "peak_mb": "baseline_peak_mb"}
+    )
+    out = results.merge(base, on=["case", "n_bars"], how="left")
+    out["time_ratio"] = out["seconds"] / out["baseline_seconds"]
+    out["mem_ratio"] = out["peak_mb"] / out["baseline_peak_mb"]
+
+    comparable = out["baseline_seconds"] >= MIN_COMPARABLE_SECONDS
+    out["regression"] = comparable & (out["time_ratio"] > tolerance)
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Volatility Lab benchmarks on synthetic OHLC (no network)")
+    ap.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="History lengths in bars, comma-separated (1k to 10M)")
+    ap.add_argument("--cases", default=None, help="Subset of cases, comma-separated (default: all)")
+    ap.add_argument("--windows", default="20,60,120", help="Rolling windows, comma-separated")
+    ap.add_argument("--event_every", type=int, default=50, help="One synthetic event per this many bars")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best is kept)")
+    ap.add_argument("--no_memory", action="store_true", help="Skip the tracemalloc peak-memory run")
+    ap.add_argument("--out", default="reports/benchmark_results.json", help="Where to write this run's results")
+    ap.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Stored baseline to compare against")
+    ap.add_argument("--save_baseline", action="store_true", help="Overwrite the baseline with this run instead of comparing")
+    ap.add_argument("--add_to_baseline", action="store_true", help="Add cases/sizes missing from the baseline, keeping its existing entries")
+    ap.add_argument("--tolerance", type=float, default=1.5, help="Flag cases slower than baseline by more than this factor")
+    args = ap.parse_args(argv)
+
+    results = run_benchmarks(
+        sizes=parse_int_list(args.sizes),
+        cases=args.cases.split(",") if args.cases else None,
+        windows=parse_int_list(args.windows),
+        event_every=args.event_every,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        verbose=True,
+    )
+    print(f"\nSaved results: {save_results(results, Path(args.out))}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        print(f"Saved baseline: {save_results(results, baseline_path)}")
+        return 0
+    if args.add_to_baseline and baseline_path.exists():
+        merged = add_to_baseline(load_results(baseline_path), results)
+        print(f"Saved baseline: {save_results(merged, baseline_path)}")
+        return 0
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save_baseline to create one.")
+        return 0
+
+    cmp = compare_to_baseline(results, load_results(baseline_path), tolerance=args.tolerance)
+    print("\nAgainst baseline (time_ratio > 1 is slower):")
+    print(cmp[["case", "n_bars", "seconds", "baseline_seconds", "time_ratio", "mem_ratio", "regression"]].to_string(index=False))
+
+    slow = cmp[cmp["regression"]]
+    if not slow.empty:
+        print(f"\n{len(slow)} case(s) slower than {args.tolerance}x baseline: {sorted(set(slow['case']))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,103 @@
 import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
-from src.data_loader import load_ohlc_data
+from src.aggregate import UniverseAggregate
+from src.correlation import CORRELATION_METHODS, correlation_event_study, rolling_cov_panel, universe_returns
+from src.data_loader import load_ohlc_batch, load_ohlc_data
 from src.volatility import (
-    close_to_close_volatility,
-    parkinson_volatility,
-    garman_klass_volatility,
-    rogers_satchell_volatility,
+    SESSION_HOURS,
+    TRADING_DAYS,
+    EXTRA_ESTIMATORS,
+    chunked_vol_panel,
+    extend_vol_panel,
+    extra_panel_columns,
+    extra_vol_panel,
+    fused_vol_panel,
+    panel_columns,
+    parse_int_list,
+    periods_per_year_from_args,
 )
-from src.event_study import load_event_dates, pre_post_event_change, summarize_changes
+from src.event_study import event_paths, extend_event_study, load_event_dates, panel_event_study
+from src.plotting import PlotJob, PlotQueue, render_plot, response_curve_job, ticker_plot_job, universe_plot_job
+from src.profiling import PipelineProfiler, StageHook, stage
+from src.quality import QUALITY_MODES, quality_summary, validate_ohlc
+from src.reports import OUTPUT_FORMATS, append_report, read_report, report_path, write_partitioned, write_report
+from src.significance import event_significance
+from src.sweep import sweep_event_study
+from src.trading_calendar import EventDates
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    """
+    Settings process_ticker applies to every ticker of a run, built once from the CLI args (from_args).
+
+    - windows, periods_per_year, compact, chunk_size, extra_estimators: how the vol panel is built
+    - events, event_name, pre, post: the event study (skipped without events)
+    - paths: day-by-day event response curves (event_curves report, event_response.png)
+    - significance, seed, significance_workers: placebo/bootstrap p-values and CIs
+    - make_plot, output_format, compression: what gets written and how
+    - dataset_dir: append panels/rows to partitioned datasets there instead (universe)
+    - incremental: extend the panel and event rows an earlier run left in the output directory
+    - quality, float32: how the bars were cleaned and loaded (part of the incremental run state)
+    """
+
+    windows: tuple[int, ...] = (20, 60, 120)
+    events: str | None = None
+    event_name: str = "EVENT"
+    pre: int = 20
+    post: int = 20
+    make_plot: bool = False
+    periods_per_year: float = TRADING_DAYS
+    output_format: str = "csv"
+    compression: str | None = None
+    dataset_dir: Path | None = None
+    compact: bool = False
+    chunk_size: int | None = None
+    significance: int = 0
+    seed: int = 0
+    significance_workers: int = 0
+    extra_estimators: tuple[str, ...] = ()
+    paths: bool = False
+    incremental: bool = False
+    quality: str = "off"
+    float32: bool = False
+
+    @classmethod
+    def from_args(cls, args, reports: Path) -> "RunOptions":
+        return cls(
+            windows=tuple(parse_int_list(args.windows)),
+            events=args.events,
+            event_name=args.event_name,
+            pre=args.pre,
+            post=args.post,
+            make_plot=args.make_plot,
+            periods_per_year=periods_per_year_from_args(args),
+            output_format=args.output_format,
+            compression=args.compression,
+            dataset_dir=reports if args.partitioned else None,
+            compact=args.compact,
+            chunk_size=args.chunk_size,
+            significance=args.significance,
+            seed=args.seed,
+            # universe runs spend --jobs on tickers, a single ticker on placebo batches
+            significance_workers=0 if args.universe else (args.jobs or 0),
+            extra_estimators=tuple(args.extra_estimators),
+            paths=args.event_paths,
+            incremental=args.incremental,
+            quality=args.quality,
+            float32=args.float32,
+        )
+
 
 def ensure_reports_dir() -> Path:
     p = Path("reports")
@@ -19,13 +105,35 @@ def ensure_reports_dir() -> Path:
     return p
 
 
-def build_vol_panel(df: pd.DataFrame, windows=(20, 60, 120)) -> pd.DataFrame:
-    c2c = close_to_close_volatility(df, price_col="Adj Close", windows=list(windows))
-    park = parkinson_volatility(df, windows=list(windows))
-    gk = garman_klass_volatility(df, windows=list(windows))
-    rs = rogers_satchell_volatility(df, windows=list(windows))
-    panel = c2c.join(park).join(gk).join(rs)
-    return panel
+def build_vol_panel(
+    df: pd.DataFrame,
+    windows=(20, 60, 120),
+    periods_per_year: float = TRADING_DAYS,
+    compact: bool = False,
+    chunk_size: int | None = None,
+    extra_estimators=(),
+) -> pd.DataFrame:
+    if compact or chunk_size:
+        # float32 without log_return (compact) and/or bounded-memory chunks
+        panel = chunked_vol_panel(
+            df,
+            windows=list(windows),
+            chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+            price_col="Adj Close",
+            periods_per_year=periods_per_year,
+            compact=compact,
+        )
+    else:
+        panel = fused_vol_panel(df, windows=list(windows), price_col="Adj Close", periods_per_year=periods_per_year)
+    if not extra_estimators:
+        return panel
+
+    # yz/ewma/garch columns appended after rs_*, on the same log-return index
+    extra = extra_vol_panel(
+        df, list(extra_estimators), windows=list(windows), price_col="Adj Close", periods_per_year=periods_per_year
+    )
+    extra = extra.reindex(panel.index).astype(panel.dtypes.iloc[-1])
+    return pd.concat([panel, extra], axis=1)
 
 
 def run_event_comparison(
@@ -35,63 +143,545 @@ def run_event_comparison(
     pre: int,
     post: int,
     metrics: list[str],
+    previous_rows: pd.DataFrame | None = None,
+    n_previous: int = 0,
 ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    events = load_event_dates(event_file)
+    # parsed once per file; the day numbers are reused by every ticker's calendar lookup
+    events = EventDates.from_csv(event_file)
 
-    # per-event rows for each metric
-    all_rows = []
-    summaries = []
+    if previous_rows is not None:
+        # incremental: keep the rows of the first n_previous panel rows, add the completed ones
+        rows_df, summary_df = extend_event_study(
+            vol_panel, previous_rows, n_previous, events, pre=pre, post=post, metrics=metrics, event_name=event_name
+        )
+    else:
+        # every metric in one pass: events are matched once and shared
+        rows_df, summary_df = panel_event_study(
+            vol_panel, events, pre=pre, post=post, metrics=metrics, event_name=event_name
+        )
+    if rows_df.empty:
+        rows_df, summary_df = pd.DataFrame(), pd.DataFrame()
 
-    for m in metrics:
-        if m not in vol_panel.columns:
-            continue
+    # ranking by avg_pct_change (higher = more reactive)
+    ranking_df = summary_df.sort_values(by="avg_pct_change", ascending=False) if not summary_df.empty else pd.DataFrame()
 
-        rows = pre_post_event_change(vol_panel[m], events, pre=pre, post=post)
-        if rows.empty:
-            continue
+    return rows_df, summary_df, ranking_df
 
-        rows.insert(0, "event_name", event_name)
-        rows.insert(1, "metric", m)
-        all_rows.append(rows)
 
-        summary = summarize_changes(rows)
-        summary.insert(0, "event_name", event_name)
-        summary.insert(1, "metric", m)
-        summary.insert(2, "pre", pre)
-        summary.insert(3, "post", post)
-        summaries.append(summary)
+def save_plot(vol_panel: pd.DataFrame, ticker: str, out_path: Path, plot_cols: list[str]):
+    # Agg canvas, no pyplot; skipped when no column has data
+    job = ticker_plot_job(vol_panel, ticker, out_path, plot_cols)
+    if job is not None:
+        render_plot(job)
+
+
+def run_sweep(df: pd.DataFrame, args, options: RunOptions, reports: Path) -> None:
+    """
+    Every (pre, post, window) configuration from one loaded frame, into reports/sweep_results.csv.
+    """
+    pres = parse_int_list(args.pre_grid) if args.pre_grid else [args.pre]
+    posts = parse_int_list(args.post_grid) if args.post_grid else [args.post]
+
+    results = sweep_event_study(
+        df,
+        load_event_dates(args.events),
+        pres=pres,
+        posts=posts,
+        windows=list(options.windows),
+        event_name=options.event_name,
+        periods_per_year=options.periods_per_year,
+    )
+
+    sweep_out = write_report(results, reports, "sweep_results", options.output_format, options.compression)
+    print(f"Saved sweep results ({len(pres)}x{len(posts)}x{len(options.windows)} configurations): {sweep_out}")
+
+    if not results.empty:
+        print("\nMost reactive estimator per configuration (top 10 by avg_pct_change):")
+        top = results[results["rank"] == 1].sort_values(by="avg_pct_change", ascending=False)
+        print(top.head(10).to_string(index=False))
+
+
+def run_quality(
+    frames: dict[str, pd.DataFrame], args, reports: Path, profiler: PipelineProfiler | None = None
+) -> dict[str, pd.DataFrame]:
+    """
+    Validate (and with --quality mask/drop/repair, fix) every loaded frame before any estimator runs.
+
+    Writes reports/data_quality_summary (one row per ticker) and, for each
+    ticker with flagged bars, its data_quality report listing them (in
+    reports/<TICKER>/ for universe runs). Returns the frames to continue with.
+    """
+    checked, results = {}, {}
+    for t, df in frames.items():
+        with stage(profiler, "validate_ohlc", t):
+            checked[t], results[t] = validate_ohlc(df, mode=args.quality)
+
+    summary = quality_summary(results)
+    summary_out = write_report(summary, reports, "data_quality_summary", args.output_format, args.compression)
+    for t, result in results.items():
+        out_dir = reports / t if args.universe else reports
+        if result.n_flagged:
+            out_dir.mkdir(parents=True, exist_ok=True)
+            write_report(result.bars(), out_dir, "data_quality", args.output_format, args.compression, index=True)
+        else:
+            # a clean reload must not leave an older run's list of bad bars behind
+            report_path(out_dir, "data_quality", args.output_format).unlink(missing_ok=True)
+
+    flagged = summary[summary["flagged"] > 0]
+    if flagged.empty:
+        print(f"Data quality: no flagged bars ({summary_out})")
+    else:
+        print(f"Data quality: {int(flagged['flagged'].sum())} flagged bars in {len(flagged)} ticker(s), see {summary_out}")
+    return checked
+
+
+# what an --incremental run must share with the one that left the reports behind
+RUN_STATE_FILE = "run_state.json"
+
+
+def run_state(df: pd.DataFrame, options: RunOptions) -> dict:
+    """
+    The settings the saved reports depend on, split by report:
+      - panel:  first bar, input dtype and --quality mode of the bars, windows,
+                annualization, layout and format of the vol panel
+      - events: events file (resolved path + sha256 of its contents), event name, pre and post
+    """
+    events = None
+    if options.events:
+        path = Path(options.events)
+        events = {"path": str(path.resolve()), "sha256": hashlib.sha256(path.read_bytes()).hexdigest()}
+    return {
+        "panel": {
+            "start": df.index[0].isoformat() if len(df) else None,
+            "float32": options.float32,
+            "quality": options.quality,
+            "windows": list(options.windows),
+            "periods_per_year": options.periods_per_year,
+            "compact": options.compact,
+            "output_format": options.output_format,
+            "extra_estimators": list(options.extra_estimators),
+        },
+        "events": {"file": events, "event_name": options.event_name, "pre": options.pre, "post": options.post},
+    }
+
+
+def load_previous_run(
+    df: pd.DataFrame, out_dir: Path, options: RunOptions, state: dict
+) -> tuple[pd.DataFrame | None, pd.DataFrame | None]:
+    """
+    The vol panel and event rows an earlier run wrote to out_dir, where --incremental can extend them.
+
+    The panel is None (full rebuild) unless the earlier run's panel state
+    equals this one (same first bar, windows, ...), it is in the engine layout
+    and it ends on a bar of df, so it is a prefix of a full rebuild. The event
+    rows are None (full event study) unless the panel is reused and the
+    events file, event name, pre and post are unchanged.
+    """
+    state_path = out_dir / RUN_STATE_FILE
+    path = report_path(out_dir, "vol_panel", options.output_format)
+    if not state_path.exists() or not path.exists():
+        return None, None
+    previous_state = json.loads(state_path.read_text())
+    if previous_state.get("panel") != state["panel"]:
+        return None, None
+
+    panel = read_report(path, index_col=df.index.name or "Date")
+    if panel.empty or list(panel.columns) != panel_columns(list(options.windows), include_returns=not options.compact):
+        return None, None
+    index = pd.DatetimeIndex(panel.index)
+    if df.index.tz is not None:
+        index = index.tz_convert(df.index.tz) if index.tz is not None else index.tz_localize(df.index.tz)
+    panel.index = index.rename(df.index.name)
+    if index[-1] not in df.index:
+        return None, None
+    panel = panel.astype(np.float32 if options.compact else np.float64)
+
+    rows_path = report_path(out_dir, "event_rows", options.output_format)
+    if not options.events or previous_state.get("events") != state["events"] or not rows_path.exists():
+        return panel, None
+    try:
+        rows = read_report(rows_path)
+    except pd.errors.EmptyDataError:  # the earlier run had no usable events
+        rows = pd.DataFrame()
+    return panel, rows
+
+
+def save_run_state(out_dir: Path, state: dict | None) -> None:
+    if state is not None:
+        (out_dir / RUN_STATE_FILE).write_text(json.dumps(state, indent=2))
+
+
+def event_metrics(windows: list[int], extra_estimators=()) -> list[str]:
+    metrics = []
+    for w in windows:
+        metrics += [f"c2c_{w}", f"park_{w}", f"gk_{w}", f"rs_{w}"]
+    return metrics + extra_panel_columns(list(extra_estimators), windows)
+
+
+def load_universe(path: str) -> list[str]:
+    """
+    Read a ticker universe: one ticker per line (or a CSV with a 'ticker' column).
+    Blank lines and '#' comments are ignored.
+    """
+    tickers = []
+    for line in Path(path).read_text().splitlines():
+        t = line.split("#", 1)[0].split(",", 1)[0].strip()
+        if t and t.lower() != "ticker":
+            tickers.append(t.upper())
+    return list(dict.fromkeys(tickers))
+
+
+def process_ticker(
+    df: pd.DataFrame,
+    ticker: str,
+    out_dir: Path,
+    options: RunOptions,
+    verbose: bool = True,
+    profiler: PipelineProfiler | None = None,
+    plot_queue: PlotQueue | None = None,
+    aggregate: UniverseAggregate | None = None,
+) -> pd.DataFrame:
+    """
+    Vol panel, optional plot and optional event study for one ticker, written into out_dir.
+
+    What is computed and written comes from options (see RunOptions). With
+    options.dataset_dir the vol panel and event rows are appended to
+    partitioned datasets (dataset_dir/vol_panel, dataset_dir/event_rows)
+    instead. With options.incremental only bars after the last row of the
+    vol panel already in out_dir are computed and appended, and only events
+    whose post window has since completed get new rows, as long as the
+    earlier run's state (RUN_STATE_FILE) matches; see load_previous_run.
+    With a profiler,
+    each step is recorded as a stage tagged with the ticker. With a
+    plot_queue the plot is handed to it instead of being rendered here.
+    With an aggregate, the summary and event rows are also folded into it
+    (universe ranking).
+
+    Returns the event summary (empty if no events were given).
+    """
+    windows = list(options.windows)
+    metrics = event_metrics(windows, options.extra_estimators)
+    fmt, compression = options.output_format, options.compression
+    dataset_dir = options.dataset_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = previous_rows = state = None
+    if dataset_dir is None:
+        state = run_state(df, options)
+        if options.incremental and not options.extra_estimators:
+            # the recursive extra estimators (and partitioned datasets) always rebuild
+            previous, previous_rows = load_previous_run(df, out_dir, options, state)
+        # dropped until every report of this run is written, so a failed run is never extended
+        (out_dir / RUN_STATE_FILE).unlink(missing_ok=True)
+
+    with stage(profiler, "build_vol_panel", ticker):
+        if previous is not None:
+            vol_panel = extend_vol_panel(df, previous, windows=windows, periods_per_year=options.periods_per_year)
+        else:
+            vol_panel = build_vol_panel(
+                df,
+                windows=windows,
+                periods_per_year=options.periods_per_year,
+                compact=options.compact,
+                chunk_size=options.chunk_size,
+                extra_estimators=options.extra_estimators,
+            )
 
-    rows_df = pd.concat(all_rows, ignore_index=True) if all_rows else pd.DataFrame()
-    summary_df = pd.concat(summaries, ignore_index=True) if summaries else pd.DataFrame()
+    # Save vol panel
+    with stage(profiler, "write_vol_panel", ticker):
+        if dataset_dir is not None:
+            vol_out = write_partitioned(
+                vol_panel, dataset_dir / "vol_panel", ticker, fmt, compression, date_col="Date"
+            )
+        elif previous is not None:
+            new_rows = vol_panel.iloc[len(previous):]
+            vol_out = append_report(new_rows, out_dir, "vol_panel", fmt, compression, index=True)
+        else:
+            vol_out = write_report(vol_panel, out_dir, "vol_panel", fmt, compression, index=True)
+    if verbose:
+        if previous is not None:
+            print(f"Appended {len(vol_panel) - len(previous)} rows to vol panel: {vol_out}")
+        else:
+            print(f"Saved vol panel: {vol_out}")
 
-    # ranking by avg_pct_change (higher = more reactive)
-    ranking_df = summary_df.sort_values(by="avg_pct_change", ascending=False) if not summary_df.empty else pd.DataFrame()
+    # Optional plot
+    if options.make_plot:
+        plot_out = out_dir / "vol_plot.png"
+        # without a queue this renders right away
+        plots = plot_queue if plot_queue is not None else PlotQueue()
+        with stage(profiler, "plot", ticker):
+            plots.submit(ticker_plot_job(
+                vol_panel,
+                ticker,
+                plot_out,
+                plot_cols=[f"c2c_{windows[0]}", f"park_{windows[0]}", f"gk_{windows[0]}", f"rs_{windows[0]}"],
+            ))
+        if verbose:
+            print(f"{'Queued' if plots.defer else 'Saved'} plot: {plot_out}")
+
+    if not options.events:
+        save_run_state(out_dir, state)
+        return pd.DataFrame()
+
+    with stage(profiler, "event_study", ticker):
+        rows_df, summary_df, ranking_df = run_event_comparison(
+            vol_panel=vol_panel,
+            event_file=options.events,
+            event_name=options.event_name,
+            pre=options.pre,
+            post=options.post,
+            metrics=metrics,
+            previous_rows=previous_rows,
+            n_previous=len(previous) if previous_rows is not None else 0,
+        )
 
-    return rows_df, summary_df, ranking_df
+    if aggregate is not None:
+        aggregate.add_ticker(ticker, summary_df, rows_df)
+
+    curves_df = None
+    if options.paths:
+        with stage(profiler, "event_paths", ticker):
+            tensor = event_paths(
+                vol_panel, EventDates.from_csv(options.events), pre=options.pre, post=options.post, metrics=metrics
+            )
+            curves_df = tensor.curve_frame(options.event_name)
+        if options.make_plot:
+            with stage(profiler, "plot", ticker):
+                plots.submit(response_curve_job(
+                    tensor.curves(relative=True),
+                    f"{ticker} {options.event_name} response (t-{options.pre} to t+{options.post - 1})",
+                    out_dir / "event_response.png",
+                ))
+
+    sig_df = None
+    if options.significance > 0:
+        with stage(profiler, "significance", ticker):
+            sig_df = event_significance(
+                vol_panel,
+                EventDates.from_csv(options.events),
+                pre=options.pre,
+                post=options.post,
+                metrics=metrics,
+                event_name=options.event_name,
+                n_placebo=options.significance,
+                n_boot=options.significance,
+                seed=options.seed,
+                workers=options.significance_workers,
+            )
+
+    with stage(profiler, "write_event_reports", ticker):
+        if dataset_dir is not None:
+            rows_out = write_partitioned(rows_df, dataset_dir / "event_rows", ticker, fmt, compression)
+        else:
+            rows_out = write_report(rows_df, out_dir, "event_rows", fmt, compression)
+        summary_out = write_report(summary_df, out_dir, "event_summary", fmt, compression)
+        rank_out = write_report(ranking_df, out_dir, "estimator_ranking", fmt, compression)
+        if sig_df is not None:
+            sig_out = write_report(sig_df, out_dir, "event_significance", fmt, compression)
+        if curves_df is not None:
+            curves_out = write_report(curves_df, out_dir, "event_curves", fmt, compression)
+    save_run_state(out_dir, state)
+
+    if verbose:
+        print(f"Saved event rows: {rows_out}")
+        print(f"Saved event summary: {summary_out}")
+        print(f"Saved estimator ranking: {rank_out}")
+        if sig_df is not None:
+            print(f"Saved event significance: {sig_out}")
+        if curves_df is not None:
+            print(f"Saved event response curves: {curves_out}")
 
+        if not ranking_df.empty:
+            print("\nTop estimator reactions (by avg_pct_change):")
+            print(ranking_df.head(10).to_string(index=False))
 
-def save_plot(vol_panel: pd.DataFrame, ticker: str, out_path: Path, plot_cols: list[str]):
-    # Only plot cols that exist + have non-null values
-    cols = [c for c in plot_cols if c in vol_panel.columns]
-    plot_df = vol_panel[cols].dropna()
+    return summary_df
+
+
+def _universe_worker(
+    ticker: str, df: pd.DataFrame, out_dir: Path, options: RunOptions, profile: dict | None = None
+) -> tuple[str, pd.DataFrame, list[dict], list[PlotJob], UniverseAggregate]:
+    # profilers (and their hooks) stay in the parent; workers ship plain records back
+    profiler = PipelineProfiler(**profile) if profile is not None else None
+    # plots are rendered by the parent's plot queue, not on the numeric workers
+    plots = PlotQueue(defer=True)
+    # event rows stay here; only the fixed-size partial aggregate goes back
+    partial = UniverseAggregate()
+    summary = process_ticker(
+        df, ticker, out_dir, options, verbose=False, profiler=profiler, plot_queue=plots, aggregate=partial
+    )
+    if not summary.empty:
+        summary.insert(0, "ticker", ticker)
+    return ticker, summary, profiler.records if profiler is not None else [], plots.pending, partial
+
+
+def rank_estimators_across_tickers(summaries: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cross-sectional ranking from per-ticker event summaries (one row per ticker x metric).
+
+    Each metric's avg_pct_change is averaged across tickers (equal weight per
+    ticker); see UniverseAggregate for the streaming version run_universe uses.
+    """
+    agg = UniverseAggregate()
+    if not summaries.empty:
+        for ticker, summary in summaries.groupby("ticker", sort=False):
+            agg.add_ticker(ticker, summary)
+    return agg.ranking()
+
+
+def run_correlation(
+    frames: dict[str, pd.DataFrame], args, options: RunOptions, reports: Path, profiler: PipelineProfiler | None = None
+) -> None:
+    """
+    Rolling correlation matrices across the loaded universe (--correlation), plus their event study.
+
+    Writes reports/correlation/<name>.npz (upper-triangle CovPanel per window),
+    the universe-average correlation series and, with --events, the
+    correlation event summary.
+    """
+    with stage(profiler, "correlation"):
+        returns = universe_returns(frames)
+        panels = rolling_cov_panel(
+            returns, windows=list(options.windows), method=args.correlation, periods_per_year=options.periods_per_year
+        )
+        for name, panel in panels.items():
+            panel.save(reports / "correlation" / f"{name}.npz")
+        averages = pd.concat([p.average() for p in panels.values()], axis=1)
+        avg_out = write_report(averages, reports, "correlation_avg", options.output_format, options.compression, index=True)
+    print(f"Saved {len(panels)} correlation panels ({returns.shape[1]} tickers): {reports}/correlation/")
+    print(f"Saved universe-average correlation: {avg_out}")
+
+    if options.events:
+        _, summary = correlation_event_study(
+            panels, EventDates.from_csv(options.events), pre=options.pre, post=options.post, event_name=options.event_name
+        )
+        corr_out = write_report(summary, reports, "correlation_event_summary", options.output_format, options.compression)
+        print(f"Saved correlation event summary: {corr_out}")
+
+
+def run_universe(args, options: RunOptions, reports: Path, profiler: PipelineProfiler | None = None) -> None:
+    tickers = load_universe(args.universe)
+    with stage(profiler, "download"):
+        frames, errors = load_ohlc_batch(
+            tickers,
+            start=args.start,
+            end=args.end,
+            max_workers=args.download_workers,
+            cache_dir=args.cache_dir,
+            offline=args.offline,
+            interval=args.interval,
+            dtype="float32" if args.float32 else "float64",
+        )
+    print(f"Loaded {len(frames)}/{len(tickers)} tickers")
+    if args.quality != "off":
+        frames = run_quality(frames, args, reports, profiler)
+
+    profile = None
+    if profiler is not None:
+        profile = dict(memory=profiler.memory, cprofile_dir=profiler.cprofile_dir)
+
+    summaries = []
+    universe = UniverseAggregate()
+    plot_jobs = {}
+    plots = PlotQueue(workers=args.plot_workers, defer=args.defer_plots)
+    with plots, ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            pool.submit(_universe_worker, t, df, reports / t, options, profile): t
+            for t, df in frames.items()
+        }
+        for fut in as_completed(futures):
+            t = futures[fut]
+            try:
+                _, summary, records, jobs, partial = fut.result()
+            except Exception as exc:
+                errors[t] = f"{type(exc).__name__}: {exc}"
+                continue
+            if profiler is not None:
+                profiler.extend(records)
+            for job in jobs:
+                # the vol chart comes first; response curves are not part of the universe grid
+                plot_jobs.setdefault(t, job)
+                plots.submit(job)
+            universe.merge(partial)
+            if not summary.empty:
+                summaries.append(summary)
+
+        if plot_jobs:
+            plots.submit(universe_plot_job(plot_jobs, reports / "universe_vol_plot.png"))
+            with stage(profiler, "render_plots"):
+                plots.close()
+
+    print(f"Saved per-ticker reports under: {reports}/<TICKER>/")
+    if plot_jobs:
+        print(f"Saved {len(plot_jobs)} ticker plots and universe chart: {reports}/universe_vol_plot.png")
+    if args.partitioned:
+        print(f"Appended vol panels / event rows to datasets: {reports}/vol_panel, {reports}/event_rows")
+
+    if errors:
+        err_out = reports / "universe_errors.csv"
+        pd.DataFrame(sorted(errors.items()), columns=["ticker", "error"]).to_csv(err_out, index=False)
+        print(f"{len(errors)} tickers failed, see: {err_out}")
+
+    if args.correlation and frames:
+        run_correlation(frames, args, options, reports, profiler)
+
+    if args.events:
+        with stage(profiler, "universe_ranking"):
+            summary_df = pd.concat(summaries, ignore_index=True) if summaries else pd.DataFrame()
+            ranking_df = universe.ranking()
 
-    if plot_df.empty:
+            summary_out = write_report(summary_df, reports, "universe_event_summary", args.output_format, args.compression)
+            rank_out = write_report(ranking_df, reports, "estimator_ranking", args.output_format, args.compression)
+        print(f"Saved universe event summary: {summary_out}")
+        print(f"Saved cross-sectional estimator ranking: {rank_out}")
+
+        if not ranking_df.empty:
+            print("\nTop estimator reactions across the universe (by avg_pct_change):")
+            print(ranking_df.head(10).to_string(index=False))
+
+
+def run_pipeline(args, options: RunOptions, reports: Path, profiler: PipelineProfiler | None = None) -> None:
+    """
+    Load, then run the universe, sweep or single-ticker flow chosen by args.
+    """
+    if args.universe:
+        run_universe(args, options, reports, profiler)
         return
 
-    fig = plt.figure()
-    ax = fig.add_subplot(111)
-    plot_df.plot(ax=ax)
-    ax.set_title(f"{ticker} Volatility Estimates (Annualized)")
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Volatility")
-    fig.tight_layout()
-    fig.savefig(out_path, dpi=160)
-    plt.close(fig)
+    with stage(profiler, "load_ohlc", args.ticker):
+        df = load_ohlc_data(
+            args.ticker,
+            start=args.start,
+            end=args.end,
+            cache_dir=args.cache_dir,
+            offline=args.offline,
+            interval=args.interval,
+            dtype="float32" if args.float32 else "float64",
+        )
+    if args.quality != "off":
+        df = run_quality({args.ticker: df}, args, reports, profiler)[args.ticker]
 
+    if args.pre_grid or args.post_grid:
+        with stage(profiler, "sweep", args.ticker):
+            run_sweep(df, args, options, reports)
+        return
+
+    # a single chart renders inline; --defer_plots holds it until the numbers are written
+    plots = PlotQueue(defer=args.defer_plots)
+    process_ticker(df, args.ticker, reports, options, profiler=profiler, plot_queue=plots)
+    if args.make_plot:
+        with stage(profiler, "render_plots", args.ticker):
+            plots.close()
 
-def main():
+
+def main(argv: list[str] | None = None, hooks: list[StageHook] | None = None):
+    """
+    CLI entry point. argv defaults to sys.argv[1:]; hooks (callables taking one
+    stage record) turn profiling on and receive every stage as it finishes.
+    """
     ap = argparse.ArgumentParser(description="Volatility Lab: OHLC volatility + macro event study")
-    ap.add_argument("--ticker", required=True, help="Ticker (e.g., SPY, QQQ, AAPL, BTC-USD)")
+    target = ap.add_mutually_exclusive_group(required=True)
+    target.add_argument("--ticker", help="Ticker (e.g., SPY, QQQ, AAPL, BTC-USD)")
+    target.add_argument("--universe", help="File of tickers (one per line) to process in parallel")
     ap.add_argument("--start", required=True, help="Start date YYYY-MM-DD")
     ap.add_argument("--end", default=None, help="End date YYYY-MM-DD (optional)")
     ap.add_argument("--windows", default="20,60,120", help="Rolling windows, comma-separated")
@@ -100,61 +690,65 @@ def main():
     ap.add_argument("--pre", type=int, default=20, help="Pre-event window length (trading days)")
     ap.add_argument("--post", type=int, default=20, help="Post-event window length (trading days)")
     ap.add_argument("--make_plot", action="store_true", help="Save a plot to reports/")
-    args = ap.parse_args()
-
-    windows = [int(x.strip()) for x in args.windows.split(",") if x.strip()]
+    ap.add_argument("--cache_dir", default=None, help="On-disk OHLC cache directory (default: $VOLLAB_CACHE_DIR)")
+    ap.add_argument("--offline", action="store_true", help="Serve OHLC purely from the cache, no downloads")
+    ap.add_argument("--pre_grid", default=None, help="Sweep mode: pre-event lengths, comma-separated")
+    ap.add_argument("--post_grid", default=None, help="Sweep mode: post-event lengths, comma-separated")
+    ap.add_argument("--interval", default="1d", help="Bar interval: 1d (default) or intraday 1m/5m/15m/1h/...")
+    ap.add_argument("--session_hours", type=float, default=SESSION_HOURS, help="Trading hours per session (intraday annualization)")
+    ap.add_argument("--trading_days", type=float, default=TRADING_DAYS, help="Trading sessions per year")
+    ap.add_argument("--float32", action="store_true", help="Load and cache OHLC as float32")
+    ap.add_argument("--quality", choices=QUALITY_MODES, default="off", help="OHLC validation before the estimators: flag (report only), mask/drop bad bars, repair what can be fixed (default: off)")
+    ap.add_argument("--output_format", choices=OUTPUT_FORMATS, default="csv", help="Report file format")
+    ap.add_argument("--compression", default=None, help="Codec for parquet/feather (e.g. zstd, snappy, lz4, none)")
+    ap.add_argument("--partitioned", action="store_true", help="Universe mode: append panels/rows to ticker/year-partitioned datasets")
+    ap.add_argument("--compact", action="store_true", help="float32 vol panel without the log_return column")
+    ap.add_argument("--chunk_size", type=int, default=None, help="Build the vol panel in chunks of this many bars")
+    ap.add_argument("--extra_estimators", default="", help=f"Extra estimators, comma-separated: {','.join(EXTRA_ESTIMATORS)}")
+    ap.add_argument("--correlation", choices=CORRELATION_METHODS, default=None, help="Universe mode: rolling or EWMA correlation matrices per window")
+    ap.add_argument("--incremental", action="store_true", help="Extend the last run in reports/ instead of recomputing; rebuilds whatever a changed --start/--float32/--quality/--windows/--events/--pre/--post/--event_name affects")
+    ap.add_argument("--event_paths", action="store_true", help="Day-by-day event response curves (event_curves report, plot with --make_plot)")
+    ap.add_argument("--significance", type=int, default=0, help="Placebo sets and bootstrap resamples for event p-values/CIs (0 = off)")
+    ap.add_argument("--seed", type=int, default=0, help="RNG seed for --significance")
+    ap.add_argument("--jobs", type=int, default=None, help="Worker processes for --universe, or for --significance on one ticker")
+    ap.add_argument("--download_workers", type=int, default=8, help="Concurrent downloads for --universe")
+    ap.add_argument("--plot_workers", type=int, default=2, help="Render processes for --universe plots (0 = render in the main process)")
+    ap.add_argument("--defer_plots", action="store_true", help="Render plots only after all numeric work is done")
+    ap.add_argument("--profile", action="store_true", help="Record per-stage wall/CPU time to reports/timing_report.json")
+    ap.add_argument("--profile_memory", action="store_true", help="Also trace per-stage peak memory (tracemalloc; slows the timed stages, implies --profile)")
+    ap.add_argument("--cprofile", action="store_true", help="Also dump cProfile stats per stage to reports/profiles/ (implies --profile)")
+    args = ap.parse_args(argv)
+
+    args.extra_estimators = [e.strip() for e in args.extra_estimators.split(",") if e.strip()]
+    unknown = sorted(set(args.extra_estimators) - set(EXTRA_ESTIMATORS))
+    if unknown:
+        ap.error(f"--extra_estimators: unknown {unknown}, choose from {','.join(EXTRA_ESTIMATORS)}")
+    if args.partitioned and (not args.universe or args.output_format == "csv"):
+        ap.error("--partitioned needs --universe and --output_format parquet or feather")
+
+    if args.correlation and not args.universe:
+        ap.error("--correlation needs --universe")
+
+    if (args.pre_grid or args.post_grid) and not args.events:
+        ap.error("--pre_grid/--post_grid need --events")
 
     reports = ensure_reports_dir()
 
-    df = load_ohlc_data(args.ticker, start=args.start, end=args.end)
-    vol_panel = build_vol_panel(df, windows=windows)
-
-    # Save vol panel
-    vol_out = reports / "vol_panel.csv"
-    vol_panel.to_csv(vol_out)
-    print(f"Saved vol panel: {vol_out}")
-
-    # Optional plot
-    if args.make_plot:
-        plot_out = reports / "vol_plot.png"
-        save_plot(
-            vol_panel,
-            args.ticker,
-            plot_out,
-            plot_cols=[f"c2c_{windows[0]}", f"park_{windows[0]}", f"gk_{windows[0]}", f"rs_{windows[0]}"],
+    profiler = None
+    if args.profile or args.profile_memory or args.cprofile or hooks:
+        profiler = PipelineProfiler(
+            memory=args.profile_memory,
+            cprofile_dir=reports / "profiles" if args.cprofile else None,
+            hooks=hooks,
         )
-        print(f"Saved plot: {plot_out}")
 
-    # Event study if provided
-    if args.events:
-        metrics = []
-        for w in windows:
-            metrics += [f"c2c_{w}", f"park_{w}", f"gk_{w}", f"rs_{w}"]
-
-        rows_df, summary_df, ranking_df = run_event_comparison(
-            vol_panel=vol_panel,
-            event_file=args.events,
-            event_name=args.event_name,
-            pre=args.pre,
-            post=args.post,
-            metrics=metrics,
-        )
-
-        rows_out = reports / "event_rows.csv"
-        summary_out = reports / "event_summary.csv"
-        rank_out = reports / "estimator_ranking.csv"
-
-        rows_df.to_csv(rows_out, index=False)
-        summary_df.to_csv(summary_out, index=False)
-        ranking_df.to_csv(rank_out, index=False)
-
-        print(f"Saved event rows: {rows_out}")
-        print(f"Saved event summary: {summary_out}")
-        print(f"Saved estimator ranking: {rank_out}")
-
-        if not ranking_df.empty:
-            print("\nTop estimator reactions (by avg_pct_change):")
-            print(ranking_df.head(10).to_string(index=False))
+    try:
+        run_pipeline(args, RunOptions.from_args(args, reports), reports, profiler)
+    finally:
+        if profiler is not None:
+            timing_out = profiler.write_json(reports / "timing_report.json")
+            print(f"\nSaved timing report: {timing_out}")
+            print(profiler.totals().to_string(index=False))
 
 
 if __name__ == "__main__":
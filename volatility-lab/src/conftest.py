@@ -0,0 +1,9 @@
+import pandas as pd
+import pytest
+
+from src.synthetic import synthetic_ohlc
+
+
+@pytest.fixture
+def ohlc() -> pd.DataFrame:
+    return synthetic_ohlc()
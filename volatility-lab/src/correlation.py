@@ -0,0 +1,348 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.event_study import _nan_reduce, panel_event_study
+from src.trading_calendar import EventDates, TradingCalendar
+from src.volatility import TRADING_DAYS, compute_log_returns
+
+CORRELATION_METHODS = ("rolling", "ewma")
+
+# window sums are rebuilt exactly from the ring buffer every this many windows,
+# so add/remove rounding cannot build up (amortized O(N^2 / 8) per bar)
+RESYNC_WINDOWS = 8
+
+
+def universe_returns(frames: dict[str, pd.DataFrame], price_col: str = "Adj Close") -> pd.DataFrame:
+    """
+    Log returns of every ticker on the union of their dates (time x tickers), NaN where a ticker has no bar.
+    """
+    cols = {t: compute_log_returns(df[price_col].astype(float)) for t, df in frames.items()}
+    if not cols:
+        return pd.DataFrame()
+    return pd.concat(cols, axis=1, join="outer").sort_index()
+
+
+class RollingCovariance:
+    """
+    Covariance of N return series over the last `window` bars, updated in O(N^2) per bar.
+
+    A ring buffer holds the window; each bar adds its outer product to the
+    running cross-sums and removes the one of the bar leaving the window.
+    Series are shifted by a fixed per-series centre first (e.g. their mean),
+    which keeps the sums small and the subtraction well conditioned; every
+    RESYNC_WINDOWS windows the sums are rebuilt exactly from the buffer.
+
+    Like the vol kernels, a pair is NaN unless both series have a value on
+    every bar of the window. Covariances use ddof=1.
+    """
+
+    __slots__ = ("n", "window", "shift", "_buf", "_valid", "_pos", "_seen", "_count", "_sum", "_cross", "_since_resync")
+
+    def __init__(self, n: int, window: int, shift: np.ndarray | None = None):
+        self.n = int(n)
+        self.window = int(window)
+        self.shift = np.zeros(self.n) if shift is None else np.asarray(shift, dtype=np.float64)
+        # missing values are buffered as 0 and tracked in _valid
+        self._buf = np.zeros((self.window, self.n))
+        self._valid = np.zeros((self.window, self.n), dtype=bool)
+        self._pos = 0
+        self._seen = 0
+        self._count = np.zeros(self.n, dtype=np.int64)
+        self._sum = np.zeros(self.n)
+        self._cross = np.zeros((self.n, self.n))
+        self._since_resync = 0
+
+    def update(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=np.float64) - self.shift
+        valid = ~np.isnan(x)
+        x = np.where(valid, x, 0.0)
+
+        pos = self._pos
+        if self._seen >= self.window:
+            old = self._buf[pos].copy()
+            self._count -= self._valid[pos]
+            self._sum -= old
+            # add x x' and remove old old' as one rank-2 product
+            self._cross += np.stack((x, old), axis=1) @ np.stack((x, -old))
+        else:
+            self._cross += np.outer(x, x)
+        self._buf[pos] = x
+        self._valid[pos] = valid
+        self._count += valid
+        self._sum += x
+
+        self._pos = (pos + 1) % self.window
+        self._seen += 1
+        self._since_resync += 1
+        if self._since_resync >= RESYNC_WINDOWS * self.window:
+            self._sum = self._buf.sum(axis=0)
+            self._cross = self._buf.T @ self._buf
+            self._since_resync = 0
+
+    def cov(self) -> np.ndarray:
+        """
+        Current N x N covariance per bar (not annualized).
+        """
+        w = self.window
+        if w < 2:
+            return np.full((self.n, self.n), np.nan)
+        out = np.multiply.outer(self._sum, self._sum / -w)
+        out += self._cross
+        out /= w - 1
+        full = self._count == w
+        if not full.all():
+            out[~(full[:, None] & full[None, :])] = np.nan
+        return out
+
+
+class EwmaCovariance:
+    """
+    RiskMetrics-style EWMA covariance of N return series (zero mean), O(N^2) per bar.
+
+    span n gives lambda = 1 - 2 / (n + 1), as in ewma_volatility, whose
+    squares are this matrix's diagonal. A pair only updates on bars where
+    both series have a value, starts from its first joint outer product,
+    and is NaN until it has seen n of them.
+    """
+
+    __slots__ = ("n", "span", "lam", "_cov", "_count")
+
+    def __init__(self, n: int, span: int):
+        self.n = int(n)
+        self.span = int(span)
+        self.lam = 1.0 - 2.0 / (self.span + 1.0)
+        self._cov = np.zeros((self.n, self.n))
+        self._count = np.zeros((self.n, self.n), dtype=np.int64)
+
+    def update(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=np.float64)
+        valid = ~np.isnan(x)
+        x = np.where(valid, x, 0.0)
+        both = valid[:, None] & valid[None, :]
+
+        outer = np.outer(x, x)
+        blended = self.lam * self._cov + (1.0 - self.lam) * outer
+        # a pair's first joint bar seeds it (ewm adjust=False); missing bars leave it alone
+        np.copyto(blended, outer, where=self._count == 0)
+        np.copyto(self._cov, blended, where=both)
+        self._count += both
+
+    def cov(self) -> np.ndarray:
+        out = self._cov.copy()
+        out[self._count < self.span] = np.nan
+        return out
+
+
+def cov_to_corr(cov: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sd = np.sqrt(np.diag(cov))
+        corr = cov / sd[:, None]
+        corr /= sd
+    np.fill_diagonal(corr, np.where(np.isnan(sd), np.nan, 1.0))
+    return corr
+
+
+class CovPanel:
+    """
+    One covariance or correlation matrix per bar for a ticker universe.
+
+    values is (time x N x N), or (time x N(N+1)/2) with upper=True: the
+    upper triangle, diagonal included, in np.triu_indices(N) order, which
+    halves the footprint for large N. matrix() and pair() read either layout.
+    """
+
+    __slots__ = ("name", "kind", "tickers", "index", "values", "upper", "_lookup")
+
+    def __init__(self, name: str, kind: str, tickers: list[str], index: pd.DatetimeIndex, values: np.ndarray, upper: bool):
+        self.name = name
+        self.kind = kind
+        self.tickers = list(tickers)
+        self.index = index
+        self.values = values
+        self.upper = upper
+        self._lookup = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.values.nbytes)
+
+    def _flat(self, i: int, j: int) -> int:
+        # column of pair (i, j) in the upper-triangle layout
+        if self._lookup is None:
+            n = len(self.tickers)
+            lookup = np.empty((n, n), dtype=np.int64)
+            rows, cols = np.triu_indices(n)
+            lookup[rows, cols] = lookup[cols, rows] = np.arange(len(rows))
+            self._lookup = lookup
+        return int(self._lookup[i, j])
+
+    def matrix(self, t: int) -> np.ndarray:
+        """
+        Full N x N matrix at bar position t.
+        """
+        if not self.upper:
+            return np.asarray(self.values[t], dtype=np.float64)
+        n = len(self.tickers)
+        out = np.empty((n, n))
+        rows, cols = np.triu_indices(n)
+        out[rows, cols] = out[cols, rows] = self.values[t]
+        return out
+
+    def pair(self, a: str, b: str) -> pd.Series:
+        i, j = self.tickers.index(a), self.tickers.index(b)
+        values = self.values[:, self._flat(i, j)] if self.upper else self.values[:, i, j]
+        return pd.Series(np.asarray(values, dtype=np.float64), index=self.index, name=f"{self.name}:{a}:{b}")
+
+    def offdiag(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """
+        (bars x pairs) copy of the distinct off-diagonal entries of bars [start, stop).
+        """
+        n = len(self.tickers)
+        block = self.values[start:stop]
+        if self.upper:
+            rows, cols = np.triu_indices(n)
+            return block[:, rows != cols]
+        rows, cols = np.triu_indices(n, k=1)
+        return block[:, rows, cols]
+
+    def average(self) -> pd.Series:
+        """
+        Mean pairwise value per bar (NaN pairs skipped), e.g. the average correlation of the universe.
+        """
+        pairs = self.offdiag()
+        ok = ~np.isnan(pairs)
+        n_ok = ok.sum(axis=1)
+        total = np.where(ok, pairs, 0.0).sum(axis=1, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg = np.where(n_ok > 0, total / n_ok, np.nan)
+        return pd.Series(avg, index=self.index, name=f"avg_{self.name}")
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            values=self.values,
+            tickers=np.asarray(self.tickers),
+            index=self.index.to_numpy(dtype="datetime64[ns]"),
+            meta=np.asarray([self.name, self.kind, str(self.upper)]),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CovPanel":
+        with np.load(path) as doc:
+            name, kind, upper = doc["meta"].tolist()
+            return cls(name, kind, doc["tickers"].tolist(), pd.DatetimeIndex(doc["index"]), doc["values"], upper == "True")
+
+
+def rolling_cov_panel(
+    returns: pd.DataFrame,
+    windows: list[int] = [20, 60, 120],
+    method: str = "rolling",
+    corr: bool = True,
+    upper: bool = True,
+    dtype=np.float32,
+    periods_per_year: float = TRADING_DAYS,
+) -> dict[str, CovPanel]:
+    """
+    Rolling (or EWMA) correlation/covariance matrices of a returns frame (time x tickers), per window.
+
+    All windows are advanced together in one pass over the bars, each bar
+    costing O(N^2) per window (see RollingCovariance / EwmaCovariance).
+    Covariances are annualized with periods_per_year like the vol panel.
+
+    Returns {name: CovPanel}, names like corr_20 or ewma_cov_60.
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"method must be one of {CORRELATION_METHODS}, got {method!r}")
+
+    values = returns.to_numpy(dtype=np.float64)
+    n_bars, n = values.shape
+    kind = "corr" if corr else "cov"
+    prefix = "ewma_" if method == "ewma" else ""
+    windows = [int(w) for w in windows]
+
+    if method == "rolling":
+        with np.errstate(invalid="ignore"):
+            centre = np.nan_to_num(np.nanmean(values, axis=0)) if n_bars else np.zeros(n)
+        states = [RollingCovariance(n, w, shift=centre) for w in windows]
+    else:
+        states = [EwmaCovariance(n, w) for w in windows]
+
+    rows, cols = np.triu_indices(n)
+    shape = (n_bars, len(rows)) if upper else (n_bars, n, n)
+    outs = [np.empty(shape, dtype=dtype) for _ in windows]
+
+    for t in range(n_bars):
+        x = values[t]
+        for state, out in zip(states, outs):
+            state.update(x)
+            m = state.cov()
+            m = cov_to_corr(m) if corr else m * periods_per_year
+            out[t] = m[rows, cols] if upper else m
+
+    return {
+        f"{prefix}{kind}_{w}": CovPanel(f"{prefix}{kind}_{w}", kind, list(returns.columns), returns.index, out, upper)
+        for w, out in zip(windows, outs)
+    }
+
+
+def correlation_event_study(
+    panels: dict[str, CovPanel],
+    event_dates: pd.DatetimeIndex | EventDates,
+    pre: int = 20,
+    post: int = 20,
+    event_name: str = "EVENT",
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Event study of the universe-average correlation (or covariance) of each panel.
+
+    Each panel's average() series becomes a metric (avg_corr_20, ...) and
+    runs through panel_event_study, so rows and summary have the same
+    layout as the vol event study.
+    """
+    averages = pd.concat([p.average() for p in panels.values()], axis=1)
+    return panel_event_study(averages, event_dates, pre=pre, post=post, event_name=event_name)
+
+
+def pair_event_shift(
+    panel: CovPanel,
+    event_dates: pd.DatetimeIndex | EventDates,
+    pre: int = 20,
+    post: int = 20,
+) -> pd.DataFrame:
+    """
+    Mean post-minus-pre change of every pair around the events (tickers x tickers).
+
+    Events roll forward to the next bar of the panel. pre covers the `pre`
+    bars before it and post the `post` bars from it on; NaN entries inside
+    a window are skipped, and events whose windows leave the panel are not used.
+    """
+    if not isinstance(event_dates, EventDates):
+        event_dates = EventDates(event_dates)
+    positions = TradingCalendar.for_index(panel.index).locate(event_dates.days)
+    positions = positions[(positions - pre >= 0) & (positions + post <= len(panel))]
+
+    n = len(panel.tickers)
+    rows, cols = np.triu_indices(n, k=1)
+    total = np.zeros(len(rows))
+    count = np.zeros(len(rows), dtype=np.int64)
+    for p in positions:
+        before = _nan_reduce(np.nanmean, panel.offdiag(p - pre, p).astype(np.float64))
+        after = _nan_reduce(np.nanmean, panel.offdiag(p, p + post).astype(np.float64))
+        shift = after - before
+        ok = ~np.isnan(shift)
+        total[ok] += shift[ok]
+        count += ok
+
+    out = np.full((n, n), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg = np.where(count > 0, total / count, np.nan)
+    out[rows, cols] = out[cols, rows] = avg
+    return pd.DataFrame(out, index=panel.tickers, columns=panel.tickers)
@@ -1,32 +1,57 @@
+import json
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
 import pandas as pd
-import yfinance as yf
 
+OHLC_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
 
-def load_ohlc_data(
-    ticker: str,
-    start: str,
-    end: str | None = None,
-) -> pd.DataFrame:
-    """
-    Load daily OHLC data for a given ticker.
+# Set to a directory to turn the on-disk cache on without passing cache_dir everywhere
+CACHE_DIR_ENV = "VOLLAB_CACHE_DIR"
 
-    Returns a DataFrame with:
-      - index: DatetimeIndex (trading days)
-      - columns: Open, High, Low, Close, Adj Close, Volume
+# (ticker, start, end, interval) -> raw OHLC frame, end exclusive like yfinance
+Downloader = Callable[[str, str | None, str | None, str], pd.DataFrame]
+
+# longest span (days) yfinance serves in one request for intraday intervals
+INTRADAY_CHUNK_DAYS = {
+    "1m": 7,
+    "2m": 60,
+    "5m": 60,
+    "15m": 60,
+    "30m": 60,
+    "90m": 60,
+    "60m": 730,
+    "1h": 730,
+}
+
+
+def yahoo_downloader(ticker: str, start: str | None, end: str | None, interval: str = "1d") -> pd.DataFrame:
+    """
+    Default downloader: one yfinance request, unadjusted OHLC plus Adj Close.
     """
+    # imported on first network fetch only; cached/offline runs never pay for it
+    import yfinance as yf
 
-    df = yf.download(
+    return yf.download(
         tickers=ticker,
         start=start,
         end=end,
-        interval="1d",
+        interval=interval,
         auto_adjust=False,
         progress=False,
     )
 
-    if df.empty:
-        raise ValueError(f"No data returned for ticker {ticker}")
 
+def _normalize_ohlc(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flatten yfinance columns, check OHLC is present and keep the standard column set.
+    """
     # yfinance sometimes returns multi-index columns
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = df.columns.get_level_values(0)
@@ -36,8 +61,363 @@ def load_ohlc_data(
         if col not in df.columns:
             raise ValueError(f"Missing required OHLC column: {col}")
 
-    df = df[["Open", "High", "Low", "Close", "Adj Close", "Volume"]]
+    df = df[OHLC_COLUMNS]
     df = df.dropna()
     df.index = pd.to_datetime(df.index)
 
     return df
+
+
+class OHLCCache:
+    """
+    Persistent per-ticker OHLC cache, one directory per (interval, ticker).
+
+    Each column is stored as its own .npy file (the index as int64 nanoseconds)
+    and read back memory-mapped, so serving a date range only touches the rows
+    it needs. meta.json records the date span that has been fetched, which is
+    what decides whether a request can be served without going to the network,
+    the dtype the prices were stored in, and the generation directory that
+    holds the current .npy files.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def path(self, ticker: str, interval: str = "1d") -> Path:
+        safe = re.sub(r"[^A-Za-z0-9._^=-]", "_", ticker.upper())
+        return self.root / interval / safe
+
+    def read_meta(self, ticker: str, interval: str = "1d") -> dict | None:
+        meta_path = self.path(ticker, interval) / "meta.json"
+        if not meta_path.exists():
+            return None
+        return json.loads(meta_path.read_text())
+
+    def read(
+        self,
+        ticker: str,
+        interval: str = "1d",
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> pd.DataFrame | None:
+        """
+        Cached bars in [start, end), or None if the ticker has never been cached.
+        """
+        p = self.path(ticker, interval)
+        meta = self.read_meta(ticker, interval) or {}
+        # entries written before generations keep their files next to meta.json
+        p = p / meta["data"] if "data" in meta else p
+        if not (p / "index.npy").exists():
+            return None
+
+        tz = meta.get("tz")
+        index = np.load(p / "index.npy", mmap_mode="r")
+        lo = 0 if start is None else int(np.searchsorted(index, _to_ns(start, tz), side="left"))
+        hi = len(index) if end is None else int(np.searchsorted(index, _to_ns(end, tz), side="left"))
+
+        data = {col: np.array(np.load(p / f"{col}.npy", mmap_mode="r")[lo:hi]) for col in OHLC_COLUMNS}
+        dates = pd.DatetimeIndex(np.array(index[lo:hi]).view("datetime64[ns]"), name="Date")
+        if tz:
+            dates = dates.tz_localize("UTC").tz_convert(tz)
+        return pd.DataFrame(data, index=dates)
+
+    def write(
+        self,
+        ticker: str,
+        interval: str,
+        df: pd.DataFrame,
+        fetched_start: str,
+        fetched_end: str,
+        dtype: str = "float64",
+    ) -> None:
+        """
+        Replace the cached bars for a ticker in one atomic step.
+
+        The arrays go to a new generation directory, then meta.json naming it is
+        swapped in with a single os.replace, so a concurrent reader sees either
+        the old entry or the new one, never columns of one with the meta of the
+        other. The previous generation is kept for readers that have just read
+        the old meta.json; older ones are removed.
+
+        Intraday (tz-aware) indexes are stored as UTC nanoseconds and the zone is
+        kept in meta.json. dtype="float32" halves the footprint of long histories.
+        """
+        p = self.path(ticker, interval)
+        p.mkdir(parents=True, exist_ok=True)
+        previous = (self.read_meta(ticker, interval) or {}).get("data")
+        generation = f"data-{time.time_ns()}-{os.getpid()}"
+        (p / generation).mkdir()
+
+        dates = pd.DatetimeIndex(df.index)
+        tz = str(dates.tz) if dates.tz is not None else None
+        arrays = {"index": dates.as_unit("ns").asi8}
+        arrays.update({col: df[col].to_numpy(dtype=dtype) for col in OHLC_COLUMNS})
+
+        for name, arr in arrays.items():
+            np.save(p / generation / f"{name}.npy", arr)
+
+        meta = {
+            "ticker": ticker,
+            "interval": interval,
+            "start": fetched_start,
+            "end": fetched_end,
+            "rows": len(df),
+            "tz": tz,
+            "dtype": str(np.dtype(dtype)),
+            "data": generation,
+        }
+        tmp = p / f".meta.json.{generation}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, p / "meta.json")
+
+        for old in p.iterdir():
+            if old.is_dir() and old.name.startswith("data-") and old.name not in (generation, previous):
+                shutil.rmtree(old, ignore_errors=True)
+            elif old.suffix == ".npy":  # pre-generation layout
+                old.unlink(missing_ok=True)
+
+
+def _cache_serves(meta: dict, dtype: str) -> bool:
+    # float32-cached prices are already rounded: they cannot answer a float64 request
+    return np.can_cast(np.dtype(dtype), np.dtype(meta.get("dtype", "float64")), casting="safe")
+
+
+def _resolve_cache(cache_dir: str | Path | None) -> OHLCCache | None:
+    cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV)
+    return OHLCCache(cache_dir) if cache_dir else None
+
+
+def _to_ns(ts, tz: str | None) -> int:
+    ts = pd.Timestamp(ts)
+    if tz and ts.tzinfo is None:
+        ts = ts.tz_localize(tz)
+    return ts.as_unit("ns").value
+
+
+def _date_chunks(start, end, interval: str) -> list[tuple]:
+    """
+    Split [start, end) into spans yfinance accepts for the interval (a single span for daily+ bars).
+    """
+    days = INTRADAY_CHUNK_DAYS.get(interval)
+    if days is None or start is None:
+        return [(start, end)]
+
+    start = pd.Timestamp(start).normalize()
+    end = pd.Timestamp(end).normalize() if end is not None else pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+    step = pd.Timedelta(days=days)
+
+    chunks = []
+    lo = start
+    while lo < end:
+        hi = min(lo + step, end)
+        chunks.append((lo, hi))
+        lo = hi
+    return chunks
+
+
+def _fetch(downloader: Downloader, ticker: str, start, end, interval: str) -> pd.DataFrame | None:
+    frames = []
+    for lo, hi in _date_chunks(start, end, interval):
+        raw = downloader(ticker, _date_str(lo), _date_str(hi), interval)
+        if raw is not None and not raw.empty:
+            frames.append(_normalize_ohlc(raw))
+
+    if not frames:
+        return None
+    df = pd.concat(frames) if len(frames) > 1 else frames[0]
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def _date_str(ts) -> str | None:
+    return None if ts is None else pd.Timestamp(ts).strftime("%Y-%m-%d")
+
+
+def load_ohlc_data(
+    ticker: str,
+    start: str,
+    end: str | None = None,
+    cache_dir: str | Path | None = None,
+    offline: bool = False,
+    downloader: Downloader | None = None,
+    interval: str = "1d",
+    dtype: str = "float64",
+) -> pd.DataFrame:
+    """
+    Load OHLC bars (daily by default) for a given ticker.
+
+    Intraday intervals (1m, 5m, 1h, ...) are fetched in date chunks no longer
+    than yfinance allows per request. dtype="float32" halves memory for long
+    intraday histories (and is what gets stored in the cache).
+
+    With a cache directory (cache_dir or $VOLLAB_CACHE_DIR) bars are kept on
+    disk per ticker and only the missing head/tail of the requested range is
+    downloaded. offline=True serves purely from the cache.
+
+    Returns a DataFrame with:
+      - index: DatetimeIndex (trading days, tz-aware bar times for intraday)
+      - columns: Open, High, Low, Close, Adj Close, Volume
+    """
+    downloader = downloader or yahoo_downloader
+    cache = _resolve_cache(cache_dir)
+
+    if cache is None:
+        if offline:
+            raise ValueError("offline mode needs a cache directory (cache_dir or $VOLLAB_CACHE_DIR)")
+        df = _fetch(downloader, ticker, start, end, interval)
+        if df is None:
+            raise ValueError(f"No data returned for ticker {ticker}")
+        return df.astype(dtype)
+
+    start_ts = pd.Timestamp(start).normalize()
+    # yfinance treats end as exclusive; "no end" means everything through today
+    end_ts = pd.Timestamp(end).normalize() if end else pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+
+    if not offline:
+        _refresh_cache(cache, downloader, ticker, interval, start_ts, end_ts, dtype)
+
+    meta = cache.read_meta(ticker, interval)
+    if meta is not None and not _cache_serves(meta, dtype):
+        raise ValueError(f"Cached bars for {ticker} are {meta['dtype']}, {dtype} requested (refresh the cache online)")
+    df = cache.read(ticker, interval, start=start_ts, end=end_ts)
+    if df is None and offline:
+        raise ValueError(f"No cached data for ticker {ticker} (offline mode)")
+    if df is None or df.empty:
+        raise ValueError(f"No data returned for ticker {ticker}")
+
+    return df.astype(dtype)
+
+
+def _refresh_cache(
+    cache: OHLCCache,
+    downloader: Downloader,
+    ticker: str,
+    interval: str,
+    start_ts: pd.Timestamp,
+    end_ts: pd.Timestamp,
+    dtype: str = "float64",
+) -> None:
+    """
+    Download only the part of [start_ts, end_ts) the cache has not seen yet and merge it in.
+    """
+    meta = cache.read_meta(ticker, interval)
+
+    if meta is None:
+        fetched = _fetch(downloader, ticker, start_ts, end_ts, interval)
+        if fetched is not None:
+            cache.write(ticker, interval, fetched, _date_str(start_ts), _date_str(end_ts), dtype)
+        return
+
+    cached_start = pd.Timestamp(meta["start"])
+    cached_end = pd.Timestamp(meta["end"])
+    if not _cache_serves(meta, dtype):
+        # refetch the whole cached span at the wider dtype instead of upcasting rounded prices
+        lo, hi = min(start_ts, cached_start), max(end_ts, cached_end)
+        fetched = _fetch(downloader, ticker, lo, hi, interval)
+        if fetched is not None:
+            cache.write(ticker, interval, fetched, _date_str(lo), _date_str(hi), dtype)
+        return
+    if start_ts >= cached_start and end_ts <= cached_end:
+        return
+
+    cached = cache.read(ticker, interval)
+    parts = [cached]
+
+    if start_ts < cached_start:
+        parts.append(_fetch(downloader, ticker, start_ts, cached_start, interval))
+
+    if end_ts > cached_end:
+        # re-fetch from the last cached bar so a partial (intraday) bar gets replaced
+        if len(cached):
+            last = cached.index[-1]
+            # cache bookkeeping is in naive calendar dates, intraday bars are tz-aware
+            last = last.tz_localize(None) if last.tzinfo is not None else last
+            tail_start = min(last.normalize(), cached_end)
+        else:
+            tail_start = cached_end
+        parts.append(_fetch(downloader, ticker, tail_start, end_ts, interval))
+
+    merged = pd.concat([p for p in parts if p is not None])
+    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+    cache.write(
+        ticker,
+        interval,
+        merged,
+        _date_str(min(start_ts, cached_start)),
+        _date_str(max(end_ts, cached_end)),
+        # a narrower request does not downgrade what is already cached
+        str(np.promote_types(meta.get("dtype", "float64"), dtype)),
+    )
+
+
+def _load_with_retry(ticker: str, retries: int, backoff: float, **kwargs) -> pd.DataFrame:
+    """
+    load_ohlc_data with exponential backoff between attempts (backoff, 2*backoff, ...).
+    """
+    for attempt in range(retries + 1):
+        try:
+            return load_ohlc_data(ticker, **kwargs)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt))
+
+
+def load_ohlc_batch(
+    tickers: list[str],
+    start: str,
+    end: str | None = None,
+    max_workers: int = 8,
+    retries: int = 2,
+    backoff: float = 1.0,
+    cache_dir: str | Path | None = None,
+    offline: bool = False,
+    downloader: Downloader | None = None,
+    interval: str = "1d",
+    dtype: str = "float64",
+) -> tuple[dict[str, pd.DataFrame], dict[str, str]]:
+    """
+    Load many tickers through a bounded thread pool (downloads are I/O bound).
+
+    Each ticker is retried up to `retries` times with exponential backoff; a
+    ticker that still fails is reported instead of aborting the batch.
+
+    Returns:
+      - frames: {ticker: OHLC DataFrame} for every ticker that loaded, in input order
+      - errors: {ticker: error message} for every ticker that failed
+    """
+    tickers = list(dict.fromkeys(tickers))
+    # a cache miss does not heal itself, only network errors are worth retrying
+    retries = 0 if offline else retries
+    kwargs = dict(
+        start=start,
+        end=end,
+        cache_dir=cache_dir,
+        offline=offline,
+        downloader=downloader,
+        interval=interval,
+        dtype=dtype,
+    )
+
+    frames: dict[str, pd.DataFrame] = {}
+    errors: dict[str, str] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers) or 1))) as pool:
+        futures = {t: pool.submit(_load_with_retry, t, retries, backoff, **kwargs) for t in tickers}
+        for t, fut in futures.items():
+            try:
+                frames[t] = fut.result()
+            except Exception as exc:
+                errors[t] = f"{type(exc).__name__}: {exc}"
+
+    return frames, errors
+
+
+def to_long_panel(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Stack per-ticker OHLC frames into one long DataFrame with a leading 'ticker' column.
+    """
+    if not frames:
+        return pd.DataFrame(columns=["ticker", "Date"] + OHLC_COLUMNS)
+
+    long = pd.concat(frames, names=["ticker", "Date"])
+    return long.reset_index()
@@ -1,12 +1,15 @@
+import warnings
+
+import numpy as np
 import pandas as pd
 
+from src.trading_calendar import EventDates, TradingCalendar, to_days
+from src.volatility import PrefixSums
+
 
 def load_event_dates(csv_path: str) -> pd.DatetimeIndex:
-    df = pd.read_csv(csv_path)
-    if "date" not in df.columns:
-        raise ValueError("CSV must have a 'date' column")
-    dates = pd.to_datetime(df["date"], errors="coerce").dropna()
-    return pd.DatetimeIndex(dates).normalize()
+    # parsed once per file (and per change to it), see EventDates.from_csv
+    return EventDates.from_csv(csv_path).dates
 
 
 def match_event_to_trading_day(trading_index: pd.DatetimeIndex, event_date: pd.Timestamp):
@@ -20,6 +23,45 @@ def match_event_to_trading_day(trading_index: pd.DatetimeIndex, event_date: pd.T
     return pd.Timestamp(trading_index[pos]).normalize()
 
 
+EVENT_ROW_COLUMNS = ["event_date", "trading_date", "pre_vol", "post_vol", "delta", "pct_change"]
+SUMMARY_COLUMNS = ["n_events", "avg_delta", "median_delta", "pct_up", "avg_pct_change", "median_pct_change"]
+
+
+def event_window_means(values: np.ndarray, positions: np.ndarray, pre: int, post: int):
+    """
+    Pre/post window means for many events at once from one prefix-sum array.
+
+    positions are the event bars (already matched) in `values`; for each one:
+      pre  = mean(values[pos-pre : pos])
+      post = mean(values[pos : pos+post])
+
+    Returns (ok, pre_mean, post_mean) where ok marks events whose windows fit
+    inside the series; the means are only returned for those events.
+    """
+    n = len(values)
+    positions = np.asarray(positions, dtype=np.int64)
+    ok = (positions < n) & (positions - pre >= 0) & (positions + post - 1 < n)
+    pos = positions[ok]
+
+    prefix = PrefixSums(values)
+    pre_mean = prefix.range_mean(pos - pre, pos)
+    post_mean = prefix.range_mean(pos, pos + post)
+    return ok, pre_mean, post_mean
+
+
+def _event_rows(event_dates: pd.DatetimeIndex, trading_dates: np.ndarray, pre_vol, post_vol) -> pd.DataFrame:
+    delta, pct = _delta_pct(pre_vol, post_vol)
+
+    return pd.DataFrame({
+        "event_date": event_dates.date,
+        "trading_date": trading_dates,
+        "pre_vol": pre_vol,
+        "post_vol": post_vol,
+        "delta": delta,
+        "pct_change": pct,
+    }, columns=EVENT_ROW_COLUMNS)
+
+
 def pre_post_event_change(vol_series: pd.Series, event_dates: pd.DatetimeIndex, pre: int = 20, post: int = 20):
     """
     For each event, compute:
@@ -28,44 +70,339 @@ def pre_post_event_change(vol_series: pd.Series, event_dates: pd.DatetimeIndex,
       delta    = post_vol - pre_vol
       pct      = delta/pre_vol
 
+    Events are matched against the series' TradingCalendar (one vectorized
+    lookup, cached per calendar) and all window means come from a single
+    prefix-sum array.
+
     Returns a DataFrame with one row per event.
     """
     vol = vol_series.dropna().sort_index()
-    idx = pd.DatetimeIndex(vol.index).normalize()
-
-    rows = []
-    for d in event_dates:
-        t = match_event_to_trading_day(idx, d)
-        if t is None:
-            continue
-
-        t_pos = idx.get_indexer([t])[0]
-        if t_pos < 0:
-            continue
-
-        pre_start = t_pos - pre
-        pre_end = t_pos - 1
-        post_start = t_pos
-        post_end = t_pos + post - 1
-
-        if pre_start < 0 or post_end >= len(idx):
-            continue
-
-        pre_vol = float(vol.iloc[pre_start:pre_end + 1].mean())
-        post_vol = float(vol.iloc[post_start:post_end + 1].mean())
-        delta = post_vol - pre_vol
-        pct = None if pre_vol == 0 else (delta / pre_vol) * 100.0
-
-        rows.append({
-            "event_date": pd.Timestamp(d).date(),
-            "trading_date": pd.Timestamp(t).date(),
-            "pre_vol": pre_vol,
-            "post_vol": post_vol,
-            "delta": delta,
-            "pct_change": pct,
+    calendar = TradingCalendar.for_index(vol.index)
+    events = pd.DatetimeIndex(event_dates)
+
+    # nearest trading date on/after each event, as in match_event_to_trading_day
+    positions = calendar.locate(to_days(events))
+    ok, pre_vol, post_vol = event_window_means(vol.to_numpy(dtype=np.float64), positions, pre, post)
+
+    return _event_rows(events[ok], calendar.session_dates(positions[ok]), pre_vol, post_vol)
+
+
+def _nan_reduce(func, arr: np.ndarray) -> np.ndarray:
+    # all-NaN columns are expected (e.g. every pre_vol was 0); they reduce to NaN quietly
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return func(arr, axis=0)
+
+
+class PanelEvents:
+    """
+    Event dates matched once against a vol panel, ready for any (pre, post).
+
+    Each metric behaves as if its own NaNs had been dropped (pre/post windows
+    count only valid bars), but the per-metric masks are handled as one
+    (bars x metrics) array instead of a loop of dropna(). Window means for
+    every configuration come from the same 2-D prefix-sum build.
+
+    Events are matched once, against the panel's shared TradingCalendar.
+    """
+
+    def __init__(
+        self,
+        vol_panel: pd.DataFrame,
+        event_dates: pd.DatetimeIndex | EventDates,
+        metrics: list[str] | None = None,
+    ):
+        metrics = [m for m in (metrics if metrics is not None else vol_panel.columns) if m in vol_panel.columns]
+        panel = vol_panel[metrics].sort_index()
+        values = panel.to_numpy(dtype=np.float64)
+
+        if not isinstance(event_dates, EventDates):
+            event_dates = EventDates(event_dates)
+
+        self.metrics = metrics
+        self.calendar = TradingCalendar.for_index(panel.index)
+        self.events = event_dates.dates
+        self.values = values
+        self.n = len(values)
+
+        valid = ~np.isnan(values)
+        self.n_valid = valid.sum(axis=0)
+        cum_valid = np.zeros((self.n + 1, len(metrics)), dtype=np.int64)
+        np.cumsum(valid, axis=0, out=cum_valid[1:])
+
+        # one match for every event, shared by every metric
+        positions = self.calendar.locate(event_dates.days)
+        # event position in each metric's dropna() coordinates: (events x metrics)
+        self.cpos = cum_valid[positions]
+
+        # bar position of the c-th valid value of each column (valid bars first, in order)
+        self.valid_pos = np.argsort(~valid, axis=0, kind="stable")
+        # NaNs are zeroed so a range over bars sums exactly the valid values inside it
+        self.prefix = PrefixSums(np.where(valid, values, 0.0))
+
+    def _bar(self, c: np.ndarray) -> np.ndarray:
+        return self.valid_pos[np.clip(c, 0, self.n - 1), np.arange(len(self.metrics))]
+
+    def _window_mean(self, first: np.ndarray, last: np.ndarray, length: int) -> np.ndarray:
+        if length <= 0:
+            return np.full(self.cpos.shape, np.nan)
+        return self.prefix.column_range_sum(self._bar(first), self._bar(last) + 1) / length
+
+    def window_means(self, pre: int, post: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (ok, pre_vol, post_vol), each shaped (events x metrics); values are only meaningful where ok.
+        """
+        cpos = self.cpos
+        ok = (cpos < self.n_valid) & (cpos - pre >= 0) & (cpos + post - 1 < self.n_valid)
+        pre_vol = self._window_mean(cpos - pre, cpos - 1, pre)
+        post_vol = self._window_mean(cpos, cpos + post - 1, post)
+        return ok, pre_vol, post_vol
+
+    def summary(self, pre: int, post: int, event_name: str = "EVENT") -> pd.DataFrame:
+        """
+        summarize_changes for every metric with at least one usable event.
+        """
+        if self.n == 0:
+            return pd.DataFrame(columns=["event_name", "metric", "pre", "post"] + SUMMARY_COLUMNS)
+
+        ok, pre_vol, post_vol = self.window_means(pre, post)
+        delta, pct = _delta_pct(pre_vol, post_vol)
+
+        n_events = ok.sum(axis=0)
+        masked_delta = np.where(ok, delta, np.nan)
+        masked_pct = np.where(ok, pct, np.nan)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_up = (ok & (delta > 0)).sum(axis=0) / n_events * 100.0
+
+        summary = pd.DataFrame({
+            "event_name": event_name,
+            "metric": np.asarray(self.metrics, dtype=object),
+            "pre": pre,
+            "post": post,
+            "n_events": n_events,
+            "avg_delta": _nan_reduce(np.nanmean, masked_delta),
+            "median_delta": _nan_reduce(np.nanmedian, masked_delta),
+            "pct_up": pct_up,
+            "avg_pct_change": _nan_reduce(np.nanmean, masked_pct),
+            "median_pct_change": _nan_reduce(np.nanmedian, masked_pct),
         })
+        return summary[n_events > 0].reset_index(drop=True)
+
+    def rows(self, pre: int, post: int, event_name: str = "EVENT") -> pd.DataFrame:
+        """
+        Long-format event rows, metric-major like the per-metric loop used to produce.
+        """
+        if self.n == 0:
+            return pd.DataFrame(columns=["event_name", "metric"] + EVENT_ROW_COLUMNS)
+
+        ok, pre_vol, post_vol = self.window_means(pre, post)
+        delta, pct = _delta_pct(pre_vol, post_vol)
+
+        metric_i, event_i = np.nonzero(ok.T)
+        trading_pos = self._bar(self.cpos)[event_i, metric_i]
+
+        return pd.DataFrame({
+            "event_name": event_name,
+            "metric": np.asarray(self.metrics, dtype=object)[metric_i],
+            "event_date": self.events[event_i].date,
+            "trading_date": self.calendar.session_dates(trading_pos),
+            "pre_vol": pre_vol[event_i, metric_i],
+            "post_vol": post_vol[event_i, metric_i],
+            "delta": delta[event_i, metric_i],
+            "pct_change": pct[event_i, metric_i],
+        }, columns=["event_name", "metric"] + EVENT_ROW_COLUMNS)
+
+    def paths(self, pre: int, post: int) -> "EventPaths":
+        """
+        Every metric's path from pre bars before to post - 1 bars after each event, in one gather.
+
+        Relative days count each metric's own valid bars, like window_means,
+        so the mean of a path's first `pre` days is that event's pre_vol.
+        """
+        rel_days = np.arange(-pre, post)
+        # (events x days x metrics) positions in each metric's dropna() coordinates
+        c = self.cpos[:, None, :] + rel_days[None, :, None]
+        inside = (c >= 0) & (c < self.n_valid) & (self.cpos < self.n_valid)[:, None, :]
+
+        values = np.full(c.shape, np.nan)
+        if self.n:
+            cols = np.arange(len(self.metrics))
+            gathered = self.values[self.valid_pos[np.clip(c, 0, self.n - 1), cols], cols]
+            np.copyto(values, gathered, where=inside)
+        return EventPaths(self.events, self.metrics, rel_days, values, inside.all(axis=1))
+
+
+EVENT_CURVE_COLUMNS = ["rel_day", "n_events", "mean", "median", "mean_pct_change", "median_pct_change"]
+
+
+class EventPaths:
+    """
+    Event-aligned paths: values[e, k, j] is metric j on relative day rel_days[k] of event e.
+
+    Day 0 is the event's session (the first post-window bar); days outside
+    the metric's history are NaN, and complete[e, j] marks events whose
+    whole path exists.
+    """
+
+    __slots__ = ("events", "metrics", "rel_days", "values", "complete")
+
+    def __init__(self, events: pd.DatetimeIndex, metrics: list[str], rel_days: np.ndarray, values: np.ndarray, complete: np.ndarray):
+        self.events = events
+        self.metrics = metrics
+        self.rel_days = rel_days
+        self.values = values
+        self.complete = complete
+
+    @property
+    def pre(self) -> int:
+        return int(np.count_nonzero(self.rel_days < 0))
+
+    def relative(self) -> np.ndarray:
+        """
+        Paths as % change against each event's pre-window mean (NaN where that mean is missing or 0).
+        """
+        pre = self.values[:, :self.pre, :]
+        base = _nan_reduce(np.nanmean, pre.transpose(1, 0, 2)) if self.pre else np.full(pre.shape[::2], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            base = np.where(base == 0, np.nan, base)
+            return (self.values / base[:, None, :] - 1.0) * 100.0
+
+    def curves(self, stat: str = "mean", relative: bool = False, complete_only: bool = True) -> pd.DataFrame:
+        """
+        Average response curve per metric: rel_day x metrics, the mean or median across events.
+        """
+        reduce = {"mean": np.nanmean, "median": np.nanmedian}[stat]
+        values = self.relative() if relative else self.values
+        if complete_only:
+            values = np.where(self.complete[:, None, :], values, np.nan)
+        curve = _nan_reduce(reduce, values) if len(values) else np.full(values.shape[1:], np.nan)
+        return pd.DataFrame(curve, index=pd.Index(self.rel_days, name="rel_day"), columns=self.metrics)
+
+    def curve_frame(self, event_name: str = "EVENT", complete_only: bool = True) -> pd.DataFrame:
+        """
+        Long-format response curves (one row per metric x rel_day), for reports.
+        """
+        valid = ~np.isnan(self.values)
+        if complete_only:
+            valid &= self.complete[:, None, :]
+        stats = {
+            "n_events": valid.sum(axis=0),
+            "mean": self.curves("mean", complete_only=complete_only).to_numpy(),
+            "median": self.curves("median", complete_only=complete_only).to_numpy(),
+            "mean_pct_change": self.curves("mean", relative=True, complete_only=complete_only).to_numpy(),
+            "median_pct_change": self.curves("median", relative=True, complete_only=complete_only).to_numpy(),
+        }
+        # metric-major, like the event rows: (days x metrics) arrays flattened column by column
+        return pd.DataFrame({
+            "event_name": event_name,
+            "metric": np.repeat(np.asarray(self.metrics, dtype=object), len(self.rel_days)),
+            "rel_day": np.tile(self.rel_days, len(self.metrics)),
+            **{name: arr.ravel(order="F") for name, arr in stats.items()},
+        }, columns=["event_name", "metric"] + EVENT_CURVE_COLUMNS)
+
+
+def event_paths(
+    vol_panel: pd.DataFrame,
+    event_dates: pd.DatetimeIndex | EventDates,
+    pre: int = 20,
+    post: int = 20,
+    metrics: list[str] | None = None,
+) -> EventPaths:
+    """
+    (events x pre+post x metrics) tensor of the panel around each event; see PanelEvents.paths.
+    """
+    return PanelEvents(vol_panel, event_dates, metrics=metrics).paths(pre, post)
+
+
+def _delta_pct(pre_vol: np.ndarray, post_vol: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    delta = post_vol - pre_vol
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(pre_vol == 0, np.nan, delta / pre_vol * 100.0)
+    return delta, pct
+
+
+def panel_event_study(
+    vol_panel: pd.DataFrame,
+    event_dates: pd.DatetimeIndex | EventDates,
+    pre: int = 20,
+    post: int = 20,
+    metrics: list[str] | None = None,
+    event_name: str = "EVENT",
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    pre_post_event_change + summarize_changes for many metrics in one call.
+
+    Returns:
+      - rows:    long format, one row per (metric, event), metric-major
+      - summary: one row per metric with at least one usable event
+    """
+    study = PanelEvents(vol_panel, event_dates, metrics=metrics)
+    return study.rows(pre, post, event_name), study.summary(pre, post, event_name)
+
+
+def _tail_start(panel: pd.DataFrame, metrics: list[str], n_old: int, need: int) -> int:
+    """
+    Latest row such that every metric has `need` valid values in [row, n_old), or 0.
+    """
+    back = max(need, 1)
+    while True:
+        lo = max(n_old - back, 0)
+        if lo == 0 or panel.iloc[lo:n_old][metrics].notna().sum().min() >= need:
+            return lo
+        back *= 2
+
+
+def extend_event_study(
+    vol_panel: pd.DataFrame,
+    old_rows: pd.DataFrame,
+    n_old: int,
+    event_dates: pd.DatetimeIndex | EventDates,
+    pre: int = 20,
+    post: int = 20,
+    metrics: list[str] | None = None,
+    event_name: str = "EVENT",
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    panel_event_study after bars were appended to a panel, reusing the earlier event rows.
+
+    vol_panel is the extended (date-sorted) panel; its first n_old rows are the panel
+    old_rows came from. Appending bars only ever completes post windows, so
+    just the events near or after the old end are recomputed, on a tail of
+    the panel holding pre + post valid bars of every metric before the old
+    end; events that already had rows keep them. Rows come back in
+    panel_event_study order and the summary is rebuilt from all of them.
+    """
+    if not isinstance(event_dates, EventDates):
+        event_dates = EventDates(event_dates)
+    metrics = [m for m in (metrics if metrics is not None else vol_panel.columns) if m in vol_panel.columns]
+    columns = ["event_name", "metric"] + EVENT_ROW_COLUMNS
+
+    lo = _tail_start(vol_panel, metrics, n_old, pre + post)
+    fresh = PanelEvents(vol_panel.iloc[lo:], event_dates, metrics=metrics).rows(pre, post, event_name)
+
+    old = old_rows.reindex(columns=columns)
+    for col in ("event_date", "trading_date"):
+        old[col] = pd.to_datetime(old[col]).dt.date
+    seen = pd.MultiIndex.from_frame(old[["metric", "event_date"]])
+    fresh = fresh[~pd.MultiIndex.from_frame(fresh[["metric", "event_date"]]).isin(seen)]
+
+    rows = pd.concat([old, fresh], ignore_index=True) if len(fresh) else old
+    # metric-major, events in file order, like PanelEvents.rows
+    event_order = {d: i for i, d in reversed(list(enumerate(event_dates.dates.date)))}
+    order = np.lexsort((
+        rows["event_date"].map(event_order).to_numpy(),
+        rows["metric"].map({m: i for i, m in enumerate(metrics)}).to_numpy(),
+    ))
+    rows = rows.iloc[order].reset_index(drop=True)
 
-    return pd.DataFrame(rows)
+    summaries = [
+        summarize_changes(group).assign(event_name=event_name, metric=metric, pre=pre, post=post)
+        for metric, group in rows.groupby("metric", sort=False)
+    ]
+    summary_columns = ["event_name", "metric", "pre", "post"] + SUMMARY_COLUMNS
+    summary = pd.concat(summaries, ignore_index=True)[summary_columns] if summaries else pd.DataFrame(columns=summary_columns)
+    return rows, summary
 
 
 def summarize_changes(changes_df: pd.DataFrame) -> pd.DataFrame:
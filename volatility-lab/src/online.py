@@ -0,0 +1,239 @@
+import math
+from typing import Mapping
+
+import pandas as pd
+
+from src.volatility import TRADING_DAYS
+
+_LOG2 = math.log(2.0)
+_GK_CO = 2.0 * _LOG2 - 1.0
+
+
+class _CompensatedSum:
+    """
+    Running sum with Neumaier compensation, so long add/remove streams do not drift.
+    """
+
+    __slots__ = ("total", "comp")
+
+    def __init__(self):
+        self.total = 0.0
+        self.comp = 0.0
+
+    def add(self, x: float) -> None:
+        s = self.total
+        t = s + x
+        if abs(s) >= abs(x):
+            self.comp += (s - t) + x
+        else:
+            self.comp += (x - t) + s
+        self.total = t
+
+    @property
+    def value(self) -> float:
+        return self.total + self.comp
+
+
+class _OnlineWindowedVol:
+    """
+    Shared ring-buffer state for the online estimators.
+
+    The buffer holds the last max(windows) per-bar terms. Each window keeps its
+    own compensated running sums, updated in O(1) per bar by adding the new
+    term and removing the one that just left that window. Non-finite terms are
+    counted instead of summed and make every window that contains them NaN,
+    like the batch kernels.
+    """
+
+    __slots__ = ("windows", "annualizer", "_size", "_buf", "_pos", "_count", "_bad", "_sums")
+
+    prefix = ""
+
+    def __init__(self, windows: list[int] = [20, 60, 120], periods_per_year: float = TRADING_DAYS):
+        self.windows = [int(w) for w in windows]
+        self.annualizer = math.sqrt(periods_per_year)
+        self._size = max(self.windows)
+        self._buf = [0.0] * self._size
+        self._pos = 0
+        self._count = 0
+        self._bad = [0] * len(self.windows)
+        self._sums = [self._new_sums() for _ in self.windows]
+
+    def _new_sums(self) -> tuple[_CompensatedSum, ...]:
+        return (_CompensatedSum(),)
+
+    def _term(self, bar: Mapping[str, float]) -> float | None:
+        raise NotImplementedError
+
+    def _accumulate(self, sums, x: float, sign: float) -> None:
+        sums[0].add(sign * x)
+
+    def _window_vol(self, sums, w: int) -> float:
+        mean = sums[0].value / w
+        return math.sqrt(max(mean, 0.0)) * self.annualizer
+
+    def _push(self, x: float) -> None:
+        finite = math.isfinite(x)
+        buf, size = self._buf, self._size
+
+        for j, w in enumerate(self.windows):
+            if finite:
+                self._accumulate(self._sums[j], x, 1.0)
+            else:
+                self._bad[j] += 1
+
+            if self._count >= w:
+                old = buf[(self._pos - w) % size]
+                if math.isfinite(old):
+                    self._accumulate(self._sums[j], old, -1.0)
+                else:
+                    self._bad[j] -= 1
+
+        buf[self._pos] = x
+        self._pos = (self._pos + 1) % size
+        self._count += 1
+
+    def update(self, bar: Mapping[str, float]) -> dict[str, float]:
+        """
+        Feed one bar (any mapping with Open/High/Low/Close, e.g. a DataFrame row).
+
+        Returns the current annualized vol for every window.
+        """
+        x = self._term(bar)
+        if x is not None:
+            self._push(x)
+        return self.current()
+
+    def current(self) -> dict[str, float]:
+        out = {}
+        for j, w in enumerate(self.windows):
+            if self._count < w or self._bad[j]:
+                out[f"{self.prefix}_{w}"] = math.nan
+            else:
+                out[f"{self.prefix}_{w}"] = self._window_vol(self._sums[j], w)
+        return out
+
+    def replay(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feed every row of an OHLC frame; one output row per bar (handy for checking against the batch functions).
+        """
+        rows = [self.update(bar) for bar in df.to_dict("records")]
+        return pd.DataFrame(rows, index=df.index)
+
+
+def _log(x: float) -> float:
+    # same edge behaviour as np.log: log(0) = -inf, negative/NaN -> NaN
+    x = float(x)
+    if x > 0.0:
+        return math.log(x)
+    return -math.inf if x == 0.0 else math.nan
+
+
+class OnlineParkinson(_OnlineWindowedVol):
+    __slots__ = ()
+    prefix = "park"
+
+    def _term(self, bar):
+        hl = _log(bar["High"]) - _log(bar["Low"])
+        return hl * hl / (4.0 * _LOG2)
+
+
+class OnlineGarmanKlass(_OnlineWindowedVol):
+    __slots__ = ()
+    prefix = "gk"
+
+    def _term(self, bar):
+        hl = _log(bar["High"]) - _log(bar["Low"])
+        co = _log(bar["Close"]) - _log(bar["Open"])
+        return max(0.5 * hl * hl - _GK_CO * co * co, 0.0)
+
+
+class OnlineRogersSatchell(_OnlineWindowedVol):
+    __slots__ = ()
+    prefix = "rs"
+
+    def _term(self, bar):
+        o, h, l, c = _log(bar["Open"]), _log(bar["High"]), _log(bar["Low"]), _log(bar["Close"])
+        return max((h - o) * (h - c) + (l - o) * (l - c), 0.0)
+
+
+class OnlineCloseToClose(_OnlineWindowedVol):
+    """
+    Rolling sample std (ddof=1) of log returns on price_col.
+
+    Like compute_log_returns, the first bar and any return touching a NaN
+    price produce no observation at all rather than a NaN one.
+    """
+
+    __slots__ = ("price_col", "_prev", "_shift")
+    prefix = "c2c"
+
+    def __init__(
+        self,
+        windows: list[int] = [20, 60, 120],
+        price_col: str = "Adj Close",
+        periods_per_year: float = TRADING_DAYS,
+    ):
+        super().__init__(windows, periods_per_year)
+        self.price_col = price_col
+        self._prev = math.nan
+        self._shift = None
+
+    def _new_sums(self):
+        return (_CompensatedSum(), _CompensatedSum())
+
+    def _term(self, bar):
+        log_price = _log(bar[self.price_col])
+        prev, self._prev = self._prev, log_price
+        r = log_price - prev
+        if math.isnan(r):
+            return None
+        if self._shift is None and math.isfinite(r):
+            # centre on the first return to keep sum(x^2) - sum(x)^2/w well conditioned
+            self._shift = r
+        return r
+
+    def _accumulate(self, sums, x, sign):
+        d = x - self._shift
+        sums[0].add(sign * d)
+        sums[1].add(sign * d * d)
+
+    def _window_vol(self, sums, w):
+        if w < 2:
+            return math.nan
+        s1 = sums[0].value
+        var = (sums[1].value - s1 * s1 / w) / (w - 1)
+        return math.sqrt(max(var, 0.0)) * self.annualizer
+
+
+class OnlineVolPanel:
+    """
+    All four online estimators behind one update(bar), keyed like build_vol_panel columns.
+    """
+
+    __slots__ = ("estimators",)
+
+    def __init__(
+        self,
+        windows: list[int] = [20, 60, 120],
+        price_col: str = "Adj Close",
+        periods_per_year: float = TRADING_DAYS,
+    ):
+        self.estimators = (
+            OnlineCloseToClose(windows, price_col=price_col, periods_per_year=periods_per_year),
+            OnlineParkinson(windows, periods_per_year),
+            OnlineGarmanKlass(windows, periods_per_year),
+            OnlineRogersSatchell(windows, periods_per_year),
+        )
+
+    def update(self, bar: Mapping[str, float]) -> dict[str, float]:
+        out = {}
+        for est in self.estimators:
+            out.update(est.update(bar))
+        return out
+
+    def current(self) -> dict[str, float]:
+        out = {}
+        for est in self.estimators:
+            out.update(est.current())
+        return out
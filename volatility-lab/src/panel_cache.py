@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import pandas as pd
+
+from src.volatility import TRADING_DAYS, extend_vol_panel, fused_vol_panel
+
+# (ticker, start, end) -> OHLC frame; load_ohlc_data (with its cache options bound) fits
+OHLCSource = Callable[[str, str, str | None], pd.DataFrame]
+
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+class PanelEntry:
+    """
+    One ticker's OHLC history and the vol panel computed from it.
+    """
+
+    __slots__ = ("ohlc", "panel", "nbytes")
+
+    def __init__(self, ohlc: pd.DataFrame, panel: pd.DataFrame):
+        self.ohlc = ohlc
+        self.panel = panel
+        self.nbytes = frame_nbytes(ohlc) + frame_nbytes(panel)
+
+
+class PanelCache:
+    """
+    In-memory vol panels per ticker: LRU order, bounded by total bytes.
+
+    get() loads and computes a panel on first use and afterwards serves it
+    from memory. refresh() asks the source only for bars after the last one
+    held and appends their panel rows with extend_vol_panel, so a refresh
+    costs the new bars plus one window of lookback, not the whole history.
+    Once the entries exceed max_bytes the least recently used are dropped
+    (the entry just stored always stays, even if it is bigger on its own).
+
+    Safe to share between request threads; a ticker loaded by two threads
+    at once is computed twice and stored once.
+    """
+
+    __slots__ = (
+        "source", "start", "windows", "periods_per_year", "max_bytes",
+        "nbytes", "hits", "misses", "evictions", "_entries", "_lock",
+    )
+
+    def __init__(
+        self,
+        source: OHLCSource,
+        start: str,
+        windows=(20, 60, 120),
+        periods_per_year: float = TRADING_DAYS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.source = source
+        self.start = start
+        self.windows = [int(w) for w in windows]
+        self.periods_per_year = periods_per_year
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, PanelEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._entries
+
+    def _store(self, ticker: str, entry: PanelEntry) -> None:
+        with self._lock:
+            old = self._entries.pop(ticker, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._entries[ticker] = entry
+            self.nbytes += entry.nbytes
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                _, dropped = self._entries.popitem(last=False)
+                self.nbytes -= dropped.nbytes
+                self.evictions += 1
+
+    def _build(self, ohlc: pd.DataFrame) -> PanelEntry:
+        panel = fused_vol_panel(ohlc, windows=self.windows, periods_per_year=self.periods_per_year)
+        return PanelEntry(ohlc, panel)
+
+    def get(self, ticker: str) -> PanelEntry:
+        ticker = ticker.upper()
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is not None:
+                self._entries.move_to_end(ticker)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = self._build(self.source(ticker, self.start, None))
+        self._store(ticker, entry)
+        return entry
+
+    def refresh(self, ticker: str) -> int:
+        """
+        Append bars newer than the cached ones (loading the ticker if needed); returns how many were added.
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            entry = self._entries.get(ticker)
+        if entry is None:
+            self.get(ticker)
+            return 0
+
+        last = entry.ohlc.index[-1]
+        fresh = self.source(ticker, str(last.date()), None)
+        fresh = fresh[fresh.index > last]
+        if fresh.empty:
+            return 0
+
+        ohlc = pd.concat([entry.ohlc, fresh.astype(entry.ohlc.dtypes)])
+        panel = extend_vol_panel(
+            ohlc, entry.panel, windows=self.windows, periods_per_year=self.periods_per_year
+        )
+        self._store(ticker, PanelEntry(ohlc, panel))
+        return len(fresh)
+
+    def evict(self, ticker: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(ticker.upper(), None)
+            if entry is not None:
+                self.nbytes -= entry.nbytes
+        return entry is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tickers": list(self._entries),
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
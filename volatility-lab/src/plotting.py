@@ -0,0 +1,228 @@
+import math
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_DPI = 160
+
+# universe charts beyond this many tickers become unreadable; the rest are left out
+MAX_UNIVERSE_PANELS = 36
+
+# per-process figure templates, keyed by layout; reused across renders
+_TEMPLATES: dict[tuple, tuple] = {}
+
+
+class PlotJob:
+    """
+    One PNG to render: either a per-ticker line chart or a universe grid.
+
+    Jobs hold only the (small) frames they draw, so they pickle cheaply to
+    a render process and can be queued for later.
+      - frame:  columns to draw as lines (ticker chart, response curves)
+      - panels: ticker -> series, one small panel each (universe chart)
+    Line charts take axis labels and an optional vertical marker at x = vline.
+    """
+
+    __slots__ = ("title", "out_path", "frame", "panels", "dpi", "xlabel", "ylabel", "vline")
+
+    def __init__(
+        self,
+        title: str,
+        out_path: Path,
+        frame: pd.DataFrame | None = None,
+        panels: dict[str, pd.Series] | None = None,
+        dpi: int = DEFAULT_DPI,
+        xlabel: str = "Date",
+        ylabel: str = "Volatility",
+        vline: float | None = None,
+    ):
+        self.title = title
+        self.out_path = Path(out_path)
+        self.frame = frame
+        self.panels = panels
+        self.dpi = dpi
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.vline = vline
+
+
+def ticker_plot_job(
+    vol_panel: pd.DataFrame, ticker: str, out_path: Path, plot_cols: list[str], dpi: int = DEFAULT_DPI
+) -> PlotJob | None:
+    """
+    Job for the per-ticker chart, or None when there is nothing to draw.
+    """
+    # Only plot cols that exist + have non-null values
+    cols = [c for c in plot_cols if c in vol_panel.columns]
+    plot_df = vol_panel[cols].dropna()
+    if plot_df.empty:
+        return None
+    return PlotJob(f"{ticker} Volatility Estimates (Annualized)", out_path, frame=plot_df, dpi=dpi)
+
+
+def universe_plot_job(
+    ticker_jobs: dict[str, PlotJob],
+    out_path: Path,
+    column: str | None = None,
+    max_panels: int = MAX_UNIVERSE_PANELS,
+    dpi: int = DEFAULT_DPI,
+) -> PlotJob | None:
+    """
+    One multi-panel chart for a universe, built from the per-ticker jobs.
+
+    Each ticker gets a small panel with `column` (default: its first plotted
+    column); tickers are taken in name order up to max_panels.
+    """
+    panels = {}
+    for ticker in sorted(ticker_jobs)[:max_panels]:
+        frame = ticker_jobs[ticker].frame
+        col = column if column is not None else frame.columns[0]
+        if col in frame.columns:
+            panels[ticker] = frame[col]
+    if not panels:
+        return None
+    label = column if column is not None else next(iter(panels.values())).name
+    title = f"Universe Volatility ({label}, {len(panels)} of {len(ticker_jobs)} tickers)"
+    return PlotJob(title, out_path, panels=panels, dpi=dpi)
+
+
+def response_curve_job(
+    curves: pd.DataFrame, title: str, out_path: Path, relative: bool = True, dpi: int = DEFAULT_DPI
+) -> PlotJob | None:
+    """
+    Job for event-response curves (rel_day x metrics, from EventPaths.curves), or None if all NaN.
+    """
+    curves = curves.dropna(axis=1, how="all")
+    if curves.empty:
+        return None
+    ylabel = "% vs pre-event mean" if relative else "Volatility"
+    return PlotJob(title, out_path, frame=curves, dpi=dpi, xlabel="Trading days from event", ylabel=ylabel, vline=0)
+
+
+def _template(nrows: int, ncols: int, figsize: tuple[float, float]):
+    """
+    Cached (figure, axes, canvas) for a layout, built on the Agg canvas without pyplot.
+    """
+    key = (nrows, ncols, figsize)
+    tpl = _TEMPLATES.get(key)
+    if tpl is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=figsize)
+        canvas = FigureCanvasAgg(fig)
+        axes = fig.subplots(nrows, ncols, squeeze=False).ravel()
+        tpl = _TEMPLATES[key] = (fig, axes, canvas)
+    return tpl
+
+
+def _render_lines(job: PlotJob) -> None:
+    fig, (ax,), _ = _template(1, 1, (6.4, 4.8))
+    ax.clear()
+    for col in job.frame.columns:
+        ax.plot(job.frame.index, job.frame[col].to_numpy(), label=col)
+    if job.vline is not None:
+        ax.axvline(job.vline, color="grey", linestyle="--", linewidth=0.8)
+    ax.legend()
+    ax.set_title(job.title)
+    ax.set_xlabel(job.xlabel)
+    ax.set_ylabel(job.ylabel)
+    if isinstance(job.frame.index, pd.DatetimeIndex):
+        fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(job.out_path, dpi=job.dpi)
+
+
+def _render_grid(job: PlotJob) -> None:
+    n = len(job.panels)
+    ncols = min(n, 6)
+    nrows = math.ceil(n / ncols)
+    fig, axes, _ = _template(nrows, ncols, (2.6 * ncols, 1.9 * nrows + 0.6))
+
+    for ax in axes:
+        ax.clear()
+        ax.set_visible(False)
+    for ax, (ticker, series) in zip(axes, job.panels.items()):
+        ax.set_visible(True)
+        ax.plot(series.index, series.to_numpy(), linewidth=0.8)
+        ax.set_title(ticker, fontsize=8)
+        ax.tick_params(labelsize=6)
+    fig.suptitle(job.title, fontsize=10)
+    fig.tight_layout()
+    fig.savefig(job.out_path, dpi=job.dpi)
+
+
+def render_plot(job: PlotJob) -> Path:
+    """
+    Draw and save one job with the object-oriented Agg API; returns its path.
+    """
+    job.out_path.parent.mkdir(parents=True, exist_ok=True)
+    if job.panels is not None:
+        _render_grid(job)
+    else:
+        _render_lines(job)
+    return job.out_path
+
+
+class PlotQueue:
+    """
+    Plot rendering kept off the numeric critical path.
+
+    workers=0 renders in this process; workers>0 hands jobs to a process pool
+    as they are submitted, so rendering overlaps the remaining numeric work.
+    defer=True holds every job until flush(), e.g. to render only after all
+    tickers are done. flush() waits for everything and returns the paths.
+    """
+
+    def __init__(self, workers: int = 0, defer: bool = False):
+        self.workers = workers
+        self.defer = defer
+        self.pending: list[PlotJob] = []
+        self._futures: list[Future] = []
+        self._done: list[Path] = []
+        self._pool = None
+
+    def submit(self, job: PlotJob | None) -> None:
+        if job is None:
+            return
+        if self.defer:
+            self.pending.append(job)
+        else:
+            self._dispatch(job)
+
+    def _dispatch(self, job: PlotJob) -> None:
+        if self.workers <= 0:
+            self._done.append(render_plot(job))
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._futures.append(self._pool.submit(render_plot, job))
+
+    def flush(self) -> list[Path]:
+        jobs, self.pending = self.pending, []
+        for job in jobs:
+            self._dispatch(job)
+
+        futures, self._futures = self._futures, []
+        self._done += [f.result() for f in futures]
+        done, self._done = self._done, []
+        return done
+
+    def close(self) -> list[Path]:
+        try:
+            return self.flush()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def __enter__(self) -> "PlotQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if exc[0] is None:
+            self.close()
+        elif self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
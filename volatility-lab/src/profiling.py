@@ -0,0 +1,164 @@
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pandas as pd
+
+STAGE_COLUMNS = ["stage", "ticker", "wall_s", "cpu_s", "peak_mb", "depth", "start_s", "pid"]
+
+StageHook = Callable[[dict], None]
+
+
+class PipelineProfiler:
+    """
+    Per-stage wall time, CPU time and (optionally) peak traced memory for a pipeline run.
+
+    Wrap each stage in `with profiler.stage("name", ticker)`. Every finished
+    stage becomes one record (see STAGE_COLUMNS) and is passed to each hook
+    registered with add_hook, so callers can stream timings into their own
+    monitoring instead of waiting for the JSON report.
+
+    memory=True also traces allocations (tracemalloc) for each stage's peak;
+    tracing slows allocation-heavy code a lot, so wall/CPU times from such a
+    run are inflated and it is off by default (peak_mb is then None).
+    Stages may nest; a parent's peak memory includes its children's. With
+    cprofile_dir, each top-level stage is also run under cProfile and dumped
+    as <ticker>_<stage>_<n>.prof, n counting that stage's runs for the ticker
+    from 1 (readable with pstats or snakeviz).
+    """
+
+    def __init__(self, memory: bool = False, cprofile_dir: str | Path | None = None, hooks: list[StageHook] | None = None):
+        self.memory = memory
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir is not None else None
+        self.hooks = list(hooks or [])
+        self.records: list[dict] = []
+        self._t0 = time.perf_counter()
+        # running absolute traced peak of every open stage, innermost last
+        self._open_peaks: list[int] = []
+        self._owns_tracemalloc = False
+        # cProfile dumps so far per (ticker, stage), so repeated stages get their own file
+        self._dumps: dict[tuple[str, str], int] = {}
+
+    def add_hook(self, hook: StageHook) -> None:
+        self.hooks.append(hook)
+
+    def _emit(self, record: dict) -> None:
+        self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+
+    def extend(self, records: list[dict]) -> None:
+        """
+        Merge records produced elsewhere (e.g. by a worker process's profiler), firing hooks.
+        """
+        for record in records:
+            self._emit(record)
+
+    @contextmanager
+    def stage(self, name: str, ticker: str | None = None) -> Iterator[None]:
+        depth = len(self._open_peaks)
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open_peaks:
+                self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._open_peaks.append(current)
+        else:
+            current = 0
+            self._open_peaks.append(0)
+
+        prof = None
+        if self.cprofile_dir is not None and depth == 0:
+            prof = cProfile.Profile()
+
+        start = time.perf_counter()
+        cpu = time.process_time()
+        if prof is not None:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if prof is not None:
+                prof.disable()
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu
+
+            stage_peak = self._open_peaks.pop()
+            if self.memory:
+                stage_peak = max(stage_peak, tracemalloc.get_traced_memory()[1])
+                if self._open_peaks:
+                    # the parent saw everything this stage allocated
+                    self._open_peaks[-1] = max(self._open_peaks[-1], stage_peak)
+                elif self._owns_tracemalloc:
+                    tracemalloc.stop()
+                    self._owns_tracemalloc = False
+
+            if prof is not None:
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                key = (ticker or "run", name)
+                self._dumps[key] = self._dumps.get(key, 0) + 1
+                prof.dump_stats(self.cprofile_dir / f"{key[0]}_{name}_{self._dumps[key]}.prof")
+
+            self._emit({
+                "stage": name,
+                "ticker": ticker,
+                "wall_s": wall,
+                "cpu_s": cpu,
+                "peak_mb": (stage_peak - current) / 2**20 if self.memory else None,
+                "depth": depth,
+                "start_s": start - self._t0,
+                "pid": os.getpid(),
+            })
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.records, columns=STAGE_COLUMNS)
+
+    def totals(self) -> pd.DataFrame:
+        """
+        Wall/CPU time summed over tickers and the largest peak, per stage, slowest first.
+        """
+        df = self.to_frame()
+        if df.empty:
+            return pd.DataFrame(columns=["stage", "calls", "wall_s", "cpu_s", "peak_mb"])
+        out = (
+            df.groupby("stage", sort=False)
+            .agg(calls=("stage", "size"), wall_s=("wall_s", "sum"), cpu_s=("cpu_s", "sum"), peak_mb=("peak_mb", "max"))
+            .reset_index()
+        )
+        return out.sort_values(by="wall_s", ascending=False, ignore_index=True)
+
+    def write_json(self, path: str | Path) -> Path:
+        """
+        Machine-readable timing report: run metadata, every stage record and per-stage totals.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        doc = {
+            "meta": {
+                "argv": sys.argv,
+                "written_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "elapsed_s": time.perf_counter() - self._t0,
+                "memory_traced": self.memory,
+            },
+            "stages": self.records,
+            "totals": json.loads(self.totals().to_json(orient="records")),
+        }
+        path.write_text(json.dumps(doc, indent=2) + "\n")
+        return path
+
+
+def stage(profiler: PipelineProfiler | None, name: str, ticker: str | None = None):
+    """
+    profiler.stage(name, ticker), or a no-op context when profiling is off.
+    """
+    return nullcontext() if profiler is None else profiler.stage(name, ticker)
@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+
+# one bit per check, in this order (bit i = QUALITY_CHECKS[i])
+QUALITY_CHECKS = ("nonfinite", "nonpositive", "high_low", "out_of_range", "stale", "split", "jump", "spike")
+
+# off skips the pass; flag only reports; mask / drop / repair also change the bars
+QUALITY_MODES = ("off", "flag", "mask", "drop", "repair")
+
+# |log| change of Close / Adj Close across one bar that reads as a split, not a dividend
+SPLIT_THRESHOLD = float(np.log(1.2))
+
+# |log return| between bars, or a wick beyond the bar body, that is reported as suspect
+JUMP_THRESHOLD = 0.4
+
+_BIT = {name: np.uint8(1 << i) for i, name in enumerate(QUALITY_CHECKS)}
+
+# bars whose variance terms are wrong (or infinite): mask/drop act on these
+BROKEN = _BIT["nonfinite"] | _BIT["nonpositive"] | _BIT["high_low"] | _BIT["out_of_range"] | _BIT["stale"]
+
+# flag value -> "high_low|stale" style label, for every possible byte
+_LABELS = np.array(["|".join(n for i, n in enumerate(QUALITY_CHECKS) if v >> i & 1) for v in range(256)], dtype=object)
+
+
+def quality_flags(
+    df: pd.DataFrame,
+    price_col: str = "Adj Close",
+    split_threshold: float = SPLIT_THRESHOLD,
+    jump_threshold: float = JUMP_THRESHOLD,
+) -> np.ndarray:
+    """
+    Per-bar bitmask (uint8, bit i = QUALITY_CHECKS[i]) from one vectorized pass over OHLC:
+      - nonfinite:    NaN/inf in Open, High, Low, Close or price_col
+      - nonpositive:  a price <= 0 (its log is -inf or NaN)
+      - high_low:     High < Low
+      - out_of_range: Open or Close outside the bar's [Low, High]
+      - stale:        Open, High, Low, Close (and Volume) repeat the previous bar exactly
+      - split:        Close and price_col move apart by more than split_threshold in log
+                      terms, i.e. an unadjusted split in Close
+      - jump:         |log return| of price_col above jump_threshold
+      - spike:        a wick more than jump_threshold (log) beyond the bar body
+    split, jump and spike are only looked for between (and on) bars that are not broken.
+    """
+    if price_col not in df.columns:
+        raise ValueError(f"{price_col} not found in DataFrame columns: {df.columns.tolist()}")
+
+    # column-major, so every per-price comparison below runs over contiguous memory
+    ohlc = np.asfortranarray(df[["Open", "High", "Low", "Close"]].to_numpy(dtype=np.float64))
+    price = df[price_col].to_numpy(dtype=np.float64)
+    n = len(ohlc)
+    o, h, l, c = ohlc.T
+
+    flags = np.zeros(n, dtype=np.uint8)
+    if n == 0:
+        return flags
+
+    def mark(name: str, mask: np.ndarray, rows=slice(None)) -> None:
+        flags[rows] |= mask.view(np.uint8) * _BIT[name]
+
+    mark("nonfinite", ~(np.isfinite(ohlc).all(axis=1) & np.isfinite(price)))
+    mark("nonpositive", (ohlc <= 0.0).any(axis=1) | (price <= 0.0))
+    mark("high_low", h < l)
+
+    top = np.fmax(h, l)
+    bottom = np.fmin(h, l)
+    mark("out_of_range", (o > top) | (o < bottom) | (c > top) | (c < bottom))
+
+    if n > 1:
+        same = (ohlc[1:] == ohlc[:-1]).all(axis=1)
+        if "Volume" in df.columns:
+            volume = df["Volume"].to_numpy(dtype=np.float64)
+            same &= volume[1:] == volume[:-1]
+        mark("stale", same, slice(1, None))
+
+    ok = (flags & BROKEN) == 0
+    # log thresholds compared as price ratios, so no log is taken
+    jump_ratio = np.exp(jump_threshold)
+    split_ratio = np.exp(split_threshold)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wick = np.fmax(h / np.fmax(o, c), np.fmin(o, c) / l)
+        mark("spike", ok & (wick > jump_ratio))
+        if n > 1:
+            pair_ok = ok[1:] & ok[:-1]
+            move = price[1:] / price[:-1]
+            gap = (c[1:] / c[:-1]) / move
+            mark("split", pair_ok & ((gap > split_ratio) | (gap * split_ratio < 1.0)), slice(1, None))
+            mark("jump", pair_ok & ((move > jump_ratio) | (move * jump_ratio < 1.0)), slice(1, None))
+
+    return flags
+
+
+class QualityReport:
+    """
+    Outcome of validate_ohlc for one ticker: the flags of every input bar and what was done about them.
+    """
+
+    __slots__ = ("index", "flags", "mode", "n_repaired", "n_removed")
+
+    def __init__(self, index: pd.DatetimeIndex, flags: np.ndarray, mode: str, n_repaired: int = 0, n_removed: int = 0):
+        self.index = index
+        self.flags = flags
+        self.mode = mode
+        self.n_repaired = n_repaired
+        self.n_removed = n_removed
+
+    @property
+    def n_flagged(self) -> int:
+        return int(np.count_nonzero(self.flags))
+
+    def counts(self) -> dict[str, int]:
+        # one popcount per bit over all bars at once
+        bits = np.unpackbits(self.flags[:, None], axis=1, bitorder="little")
+        return dict(zip(QUALITY_CHECKS, bits.sum(axis=0, dtype=np.int64).tolist()))
+
+    def summary(self) -> dict:
+        """
+        One row: bars, flagged bars, a count per check, repaired/removed bars and the first/last flagged bar.
+        """
+        flagged = np.flatnonzero(self.flags)
+        row = {"bars": len(self.flags), "flagged": len(flagged)}
+        row.update(self.counts())
+        row.update({
+            "mode": self.mode,
+            "repaired": self.n_repaired,
+            "removed": self.n_removed,
+            "first_flagged": self.index[flagged[0]] if len(flagged) else pd.NaT,
+            "last_flagged": self.index[flagged[-1]] if len(flagged) else pd.NaT,
+        })
+        return row
+
+    def bars(self) -> pd.DataFrame:
+        """
+        The flagged bars only: Date index and a "flags" column such as "high_low|out_of_range".
+        """
+        flagged = np.flatnonzero(self.flags)
+        return pd.DataFrame({"flags": _LABELS[self.flags[flagged]]}, index=self.index[flagged])
+
+
+def validate_ohlc(
+    df: pd.DataFrame,
+    mode: str = "flag",
+    price_col: str = "Adj Close",
+    split_threshold: float = SPLIT_THRESHOLD,
+    jump_threshold: float = JUMP_THRESHOLD,
+) -> tuple[pd.DataFrame, QualityReport]:
+    """
+    Flag bad bars (quality_flags) and optionally fix them before any estimator sees them.
+
+    Modes:
+      - flag:   report only; df is returned as is
+      - mask:   broken bars (BROKEN checks) become NaN, so windows over them are NaN
+      - drop:   broken bars are removed, like the loader's dropna()
+      - repair: High/Low are reset to the max/min of the bar's four prices,
+                bars before each split are scaled to the post-split price level
+                (Volume inversely), and bars that cannot be fixed (nonfinite,
+                nonpositive, stale) are removed
+    jump and spike bars are only reported: the pass cannot tell a bad tick from a real move.
+
+    Returns the (possibly new) frame and a QualityReport over the input bars.
+    """
+    if mode not in QUALITY_MODES or mode == "off":
+        raise ValueError(f"Unknown quality mode {mode!r}; choose from {QUALITY_MODES[1:]}")
+
+    flags = quality_flags(df, price_col=price_col, split_threshold=split_threshold, jump_threshold=jump_threshold)
+    broken = (flags & BROKEN) != 0
+
+    if mode == "flag":
+        return df, QualityReport(df.index, flags, mode)
+
+    if mode == "mask":
+        out = df.copy()
+        cols = list(dict.fromkeys(["Open", "High", "Low", "Close", price_col]))
+        out.loc[broken, cols] = np.nan
+        return out, QualityReport(df.index, flags, mode, n_removed=int(broken.sum()))
+
+    if mode == "drop":
+        return df[~broken], QualityReport(df.index, flags, mode, n_removed=int(broken.sum()))
+
+    out = df.copy()
+    ohlc = np.array(out[["Open", "High", "Low", "Close"]], dtype=np.float64)
+    unfixable = (flags & (_BIT["nonfinite"] | _BIT["nonpositive"] | _BIT["stale"])) != 0
+    fixable = ((flags & (_BIT["high_low"] | _BIT["out_of_range"])) != 0) & ~unfixable
+
+    bad_rows = ohlc[fixable]
+    ohlc[fixable, 1] = bad_rows.max(axis=1)
+    ohlc[fixable, 2] = bad_rows.min(axis=1)
+    changed = fixable.copy()
+
+    split = np.flatnonzero(flags & _BIT["split"])
+    if len(split):
+        close = ohlc[:, 3]
+        price = out[price_col].to_numpy(dtype=np.float64)
+        # log split ratio at each split bar, then the sum over every later split per bar
+        step = np.zeros(len(out))
+        step[split] = np.log(close[split] / close[split - 1]) - np.log(price[split] / price[split - 1])
+        later = np.cumsum(step[::-1])[::-1] - step
+        scale = np.exp(later)
+        ohlc *= scale[:, None]
+        changed |= later != 0.0
+        if "Volume" in out.columns:
+            out["Volume"] = (out["Volume"].to_numpy(dtype=np.float64) / scale).astype(out["Volume"].dtype)
+
+    for j, col in enumerate(["Open", "High", "Low", "Close"]):
+        out[col] = ohlc[:, j].astype(out[col].dtype)
+
+    n_repaired = int(np.count_nonzero(changed & ~unfixable))
+    return out[~unfixable], QualityReport(df.index, flags, mode, n_repaired=n_repaired, n_removed=int(unfixable.sum()))
+
+
+def quality_summary(reports: dict[str, QualityReport]) -> pd.DataFrame:
+    """
+    One summary row per ticker, in input order.
+    """
+    rows = [{"ticker": t, **rep.summary()} for t, rep in reports.items()]
+    cols = ["ticker", "bars", "flagged", *QUALITY_CHECKS, "mode", "repaired", "removed", "first_flagged", "last_flagged"]
+    return pd.DataFrame(rows, columns=cols)
@@ -0,0 +1,162 @@
+from pathlib import Path
+
+import pandas as pd
+
+OUTPUT_FORMATS = ("csv", "parquet", "feather")
+
+_SUFFIX = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+# default codec per format; "none" turns compression off
+DEFAULT_COMPRESSION = {"csv": None, "parquet": "zstd", "feather": "lz4"}
+
+
+def _compression(fmt: str, compression: str | None):
+    if compression is None:
+        return DEFAULT_COMPRESSION[fmt]
+    if compression == "none":
+        return "uncompressed" if fmt == "feather" else None
+    return compression
+
+
+def write_report(
+    df: pd.DataFrame,
+    out_dir: Path,
+    name: str,
+    fmt: str = "csv",
+    compression: str | None = None,
+    index: bool = False,
+) -> Path:
+    """
+    Write one report table as <out_dir>/<name>.<csv|parquet|feather> and return its path.
+
+    Parquet and Feather (Arrow IPC) keep float columns binary, so re-reading
+    a panel skips text parsing entirely.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}, expected one of {OUTPUT_FORMATS}")
+
+    path = report_path(out_dir, name, fmt)
+    codec = _compression(fmt, compression)
+
+    if fmt == "csv":
+        df.to_csv(path, index=index, compression=codec)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=index, compression=codec)
+    else:
+        # feather needs a default RangeIndex; a meaningful index becomes a column
+        out = df.reset_index() if index else df.reset_index(drop=True)
+        out.to_feather(path, compression=codec)
+
+    return path
+
+
+def report_path(out_dir: Path, name: str, fmt: str = "csv") -> Path:
+    return Path(out_dir) / f"{name}{_SUFFIX[fmt]}"
+
+
+def append_report(
+    df: pd.DataFrame,
+    out_dir: Path,
+    name: str,
+    fmt: str = "csv",
+    compression: str | None = None,
+    index: bool = False,
+) -> Path:
+    """
+    Add rows to the end of a report written by write_report (creating it if missing).
+
+    CSV (uncompressed) appends in place, so the cost is the new rows only;
+    binary formats and compressed CSV are read back and rewritten.
+    """
+    path = report_path(out_dir, name, fmt)
+    if not path.exists():
+        return write_report(df, out_dir, name, fmt, compression, index)
+    if fmt == "csv" and _compression(fmt, compression) is None:
+        df.to_csv(path, mode="a", header=False, index=index)
+        return path
+
+    old = read_report(path, index_col=df.index.name if index else None)
+    return write_report(pd.concat([old, df]), out_dir, name, fmt, compression, index)
+
+
+def write_partitioned(
+    df: pd.DataFrame,
+    root: Path,
+    ticker: str,
+    fmt: str = "parquet",
+    compression: str | None = None,
+    date_col: str | None = None,
+) -> Path:
+    """
+    Add one ticker's rows to a hive-partitioned dataset under root.
+
+    Rows land in root/ticker=<T>/[year=<Y>/], so many tickers (and parallel
+    workers) append side by side; re-running a ticker replaces only its own
+    partitions.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if fmt not in ("parquet", "feather"):
+        raise ValueError("Partitioned datasets need --output_format parquet or feather")
+
+    out = df.reset_index() if date_col and date_col not in df.columns else df.reset_index(drop=True)
+    out.insert(0, "ticker", ticker)
+    partition_cols = ["ticker"]
+    if date_col:
+        out["year"] = pd.DatetimeIndex(pd.to_datetime(out[date_col])).year.astype("int32")
+        partition_cols.append("year")
+
+    codec = _compression(fmt, compression)
+    if fmt == "parquet":
+        file_options = ds.ParquetFileFormat().make_write_options(compression=codec or "none")
+    else:
+        file_options = ds.IpcFileFormat().make_write_options(
+            compression=None if codec == "uncompressed" else codec
+        )
+
+    root = Path(root)
+    ds.write_dataset(
+        pa.Table.from_pandas(out, preserve_index=False),
+        root,
+        format="parquet" if fmt == "parquet" else "ipc",
+        partitioning=partition_cols,
+        partitioning_flavor="hive",
+        basename_template=f"part-{{i}}{_SUFFIX[fmt]}",
+        existing_data_behavior="delete_matching",
+        file_options=file_options,
+    )
+    return root
+
+
+def read_report(path: str | Path, index_col: str | None = None, tickers: list[str] | None = None) -> pd.DataFrame:
+    """
+    Read a report written by write_report / write_partitioned (format from the suffix).
+
+    A directory is read as a partitioned dataset; `tickers` limits it to those
+    partitions. index_col restores an index (e.g. "Date" for a vol panel).
+    """
+    path = Path(path)
+
+    if path.is_dir():
+        import pyarrow.dataset as ds
+
+        fmt = "ipc" if any(path.rglob("*.feather")) else "parquet"
+        dataset = ds.dataset(path, format=fmt, partitioning="hive")
+        flt = ds.field("ticker").isin(tickers) if tickers else None
+        df = dataset.to_table(filter=flt).to_pandas()
+        df["ticker"] = df["ticker"].astype(str)
+        df = df.drop(columns=[c for c in ("year",) if c in df.columns])
+    elif path.suffix == ".parquet":
+        df = pd.read_parquet(path)
+    elif path.suffix == ".feather":
+        df = pd.read_feather(path)
+    else:
+        # round_trip parsing gives back exactly the floats that were written
+        df = pd.read_csv(path, float_precision="round_trip")
+        if index_col is not None and index_col in df.columns:
+            df[index_col] = pd.to_datetime(df[index_col])
+
+    if index_col is not None and index_col in df.columns:
+        df = df.set_index(index_col)
+    return df
@@ -0,0 +1,179 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException
+
+from src.data_loader import load_ohlc_data
+from src.event_study import panel_event_study
+from src.panel_cache import DEFAULT_MAX_BYTES, PanelCache, PanelEntry
+from src.trading_calendar import EventDates
+from src.volatility import SESSION_HOURS, TRADING_DAYS, parse_int_list, periods_per_year_from_args
+
+
+def _split(value: str | None) -> list[str]:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+def _jsonable(values: np.ndarray) -> list:
+    # JSON has no NaN: missing values go out as null
+    values = np.asarray(values, dtype=np.float64)
+    out = values.astype(object)
+    out[np.isnan(values)] = None
+    return out.tolist()
+
+
+def _columns(panel: pd.DataFrame, columns: str | None) -> list[str]:
+    cols = _split(columns) or list(panel.columns)
+    unknown = [c for c in cols if c not in panel.columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns {unknown}; available: {list(panel.columns)}")
+    return cols
+
+
+def _event_file(events_dir: Path | None, name: str) -> Path:
+    # clients only name files under events_dir; anything resolving outside it is refused
+    if events_dir is None:
+        raise HTTPException(status_code=400, detail="event_file is disabled (start the service with --events_dir)")
+    root = events_dir.resolve()
+    path = (root / name).resolve()
+    if not path.is_relative_to(root):
+        raise HTTPException(status_code=400, detail=f"event_file must be a path inside the events directory: {name!r}")
+    return path
+
+
+def create_app(cache: PanelCache, events_dir: str | Path | None = None) -> FastAPI:
+    """
+    HTTP front end over a PanelCache. event_file names a CSV relative to
+    events_dir; without events_dir only inline dates are accepted. Endpoints:
+      GET  /health                 liveness
+      GET  /cache                  cache contents and hit/miss/eviction counters
+      GET  /panel/{ticker}         panel slice (columns, start, end, tail)
+      GET  /latest/{ticker}        last row of the panel (columns)
+      POST /refresh/{ticker}       append bars newer than the cached ones
+      GET  /events/{ticker}        event study summary (dates or event_file, pre, post, metrics)
+    """
+    app = FastAPI(title="Volatility Lab")
+    events_dir = Path(events_dir) if events_dir is not None else None
+
+    def entry(ticker: str) -> PanelEntry:
+        try:
+            return cache.get(ticker)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/cache")
+    def cache_stats():
+        return cache.stats()
+
+    @app.get("/panel/{ticker}")
+    def panel_slice(
+        ticker: str, columns: str | None = None, start: str | None = None, end: str | None = None, tail: int | None = None
+    ):
+        panel = entry(ticker).panel
+        cols = _columns(panel, columns)
+        if start or end:
+            panel = panel.loc[start:end]
+        if tail is not None:
+            panel = panel.iloc[-tail:] if tail > 0 else panel.iloc[:0]
+        return {
+            "ticker": ticker.upper(),
+            "columns": cols,
+            "index": [t.isoformat() for t in panel.index],
+            "data": _jsonable(panel[cols].to_numpy()),
+        }
+
+    @app.get("/latest/{ticker}")
+    def latest(ticker: str, columns: str | None = None):
+        panel = entry(ticker).panel
+        cols = _columns(panel, columns)
+        if panel.empty:
+            raise HTTPException(status_code=404, detail=f"No panel rows for {ticker.upper()}")
+        return {
+            "ticker": ticker.upper(),
+            "time": panel.index[-1].isoformat(),
+            "values": dict(zip(cols, _jsonable(panel[cols].to_numpy()[-1]))),
+        }
+
+    @app.post("/refresh/{ticker}")
+    def refresh(ticker: str):
+        try:
+            added = cache.refresh(ticker)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        panel = cache.get(ticker).panel
+        return {
+            "ticker": ticker.upper(),
+            "new_bars": added,
+            "last": panel.index[-1].isoformat() if len(panel) else None,
+        }
+
+    @app.get("/events/{ticker}")
+    def events(
+        ticker: str,
+        dates: str | None = None,
+        event_file: str | None = None,
+        event_name: str = "EVENT",
+        pre: int = 20,
+        post: int = 20,
+        metrics: str | None = None,
+    ):
+        if bool(dates) == bool(event_file):
+            raise HTTPException(status_code=400, detail="Pass exactly one of dates (comma-separated) or event_file")
+        path = _event_file(events_dir, event_file) if event_file else None
+        try:
+            ev = EventDates.from_csv(path) if path is not None else EventDates(pd.to_datetime(_split(dates)).normalize())
+        except (OSError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        panel = entry(ticker).panel
+        cols = _columns(panel, metrics) if metrics else [c for c in panel.columns if c != "log_return"]
+        _, summary = panel_event_study(panel, ev, pre=pre, post=post, metrics=cols, event_name=event_name)
+        return {
+            "ticker": ticker.upper(),
+            "summary": [
+                {k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in rec.items()}
+                for rec in summary.to_dict(orient="records")
+            ],
+        }
+
+    return app
+
+
+def main(argv: list[str] | None = None):
+    ap = argparse.ArgumentParser(description="Volatility Lab query service (vol panels kept in memory)")
+    ap.add_argument("--host", default="127.0.0.1", help="Bind address")
+    ap.add_argument("--port", type=int, default=8000, help="Port")
+    ap.add_argument("--start", required=True, help="History start YYYY-MM-DD for every ticker")
+    ap.add_argument("--windows", default="20,60,120", help="Rolling windows, comma-separated")
+    ap.add_argument("--interval", default="1d", help="Bar interval: 1d (default) or intraday 1m/5m/15m/1h/...")
+    ap.add_argument("--session_hours", type=float, default=SESSION_HOURS, help="Trading hours per session (intraday annualization)")
+    ap.add_argument("--trading_days", type=float, default=TRADING_DAYS, help="Trading sessions per year")
+    ap.add_argument("--cache_dir", default=None, help="On-disk OHLC cache directory (default: $VOLLAB_CACHE_DIR)")
+    ap.add_argument("--offline", action="store_true", help="Serve OHLC purely from the on-disk cache")
+    ap.add_argument("--events_dir", default=None, help="Directory event_file names are resolved in (default: event_file disabled)")
+    ap.add_argument("--max_mb", type=float, default=DEFAULT_MAX_BYTES / 2**20, help="Memory budget for cached panels (MiB)")
+    args = ap.parse_args(argv)
+
+    # uvicorn is only needed to serve, not to build or test the app
+    import uvicorn
+
+    cache = PanelCache(
+        lambda ticker, start, end: load_ohlc_data(
+            ticker, start=start, end=end, cache_dir=args.cache_dir, offline=args.offline, interval=args.interval
+        ),
+        start=args.start,
+        windows=parse_int_list(args.windows),
+        periods_per_year=periods_per_year_from_args(args),
+        max_bytes=int(args.max_mb * 2**20),
+    )
+    uvicorn.run(create_app(cache, events_dir=args.events_dir), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.event_study import PanelEvents, _delta_pct, _nan_reduce
+from src.trading_calendar import EventDates
+from src.volatility import PrefixSums
+
+SIGNIFICANCE_COLUMNS = [
+    "event_name", "metric", "pre", "post", "n_events", "avg_pct_change",
+    "placebo_mean", "placebo_std", "p_value", "boot_se", "ci_low", "ci_high",
+]
+
+# placebo (set x event) cells per task, bounding batch memory; the batching
+# depends only on this and the event count, never on the worker count
+PLACEBO_BATCH_CELLS = 1_000_000
+
+
+def batch_avg_pct_change(prefix: PrefixSums, positions: np.ndarray, pre: int, post: int) -> np.ndarray:
+    """
+    avg_pct_change of many event sets at once.
+
+    positions is (sets x events) in the series' own (valid-bar) coordinates,
+    every window already inside the series. Each window mean is one
+    prefix-sum difference, so the whole batch is a handful of array ops.
+    """
+    pre_vol = prefix.range_sum(positions - pre, positions) / pre
+    post_vol = prefix.range_sum(positions, positions + post) / post
+    _, pct = _delta_pct(pre_vol, post_vol)
+    return _nan_reduce(np.nanmean, pct.T)
+
+
+def _placebo_batch(prefix: PrefixSums, n_events: int, pre: int, post: int, n_sets: int, seed) -> np.ndarray:
+    """
+    avg_pct_change of n_sets placebo event sets placed uniformly where both windows fit.
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(pre, len(prefix) - post + 1, size=(n_sets, n_events))
+    return batch_avg_pct_change(prefix, positions, pre, post)
+
+
+def _bootstrap(pct: np.ndarray, n_boot: int, seed) -> np.ndarray:
+    """
+    avg_pct_change over n_boot resamples (with replacement) of the observed events.
+    """
+    rng = np.random.default_rng(seed)
+    batch = max(1, PLACEBO_BATCH_CELLS // len(pct))
+    out = np.empty(n_boot, dtype=np.float64)
+    for s in range(0, n_boot, batch):
+        draws = pct[rng.integers(0, len(pct), size=(min(batch, n_boot - s), len(pct)))]
+        out[s:s + len(draws)] = _nan_reduce(np.nanmean, draws.T)
+    return out
+
+
+def _two_sided_p(observed: float, null: np.ndarray) -> float:
+    null = null[~np.isnan(null)]
+    if np.isnan(observed) or len(null) == 0:
+        return np.nan
+    # +1 on both sides so p is never exactly 0 with a finite number of placebos
+    upper = (np.count_nonzero(null >= observed) + 1) / (len(null) + 1)
+    lower = (np.count_nonzero(null <= observed) + 1) / (len(null) + 1)
+    return min(1.0, 2.0 * min(upper, lower))
+
+
+def event_significance(
+    vol_panel: pd.DataFrame,
+    event_dates: pd.DatetimeIndex | EventDates,
+    pre: int = 20,
+    post: int = 20,
+    metrics: list[str] | None = None,
+    event_name: str = "EVENT",
+    n_placebo: int = 10_000,
+    n_boot: int = 10_000,
+    ci: float = 0.95,
+    seed: int = 0,
+    workers: int = 0,
+) -> pd.DataFrame:
+    """
+    Is each metric's avg_pct_change around real events different from chance?
+
+    For every metric (with its NaNs dropped, as in the event study):
+      - placebo test: n_placebo sets of randomly placed event dates, each the
+        size of the real usable event set, give a null distribution of
+        avg_pct_change; p_value is two-sided against it
+      - bootstrap: n_boot resamples of the real events give boot_se and a
+        percentile confidence interval [ci_low, ci_high] at level ci
+
+    Placebos are drawn in fixed batches from one SeedSequence, so results are
+    reproducible for a seed whatever `workers` is; workers > 0 spreads the
+    batches over a process pool.
+
+    Returns one row per metric with at least one usable event (SIGNIFICANCE_COLUMNS).
+    """
+    study = PanelEvents(vol_panel, event_dates, metrics=metrics)
+    if study.n == 0:
+        return pd.DataFrame(columns=SIGNIFICANCE_COLUMNS)
+
+    ok, pre_vol, post_vol = study.window_means(pre, post)
+    _, pct = _delta_pct(pre_vol, post_vol)
+    values = vol_panel[study.metrics].sort_index().to_numpy(dtype=np.float64)
+
+    root = np.random.SeedSequence(seed)
+    metric_seeds = root.spawn(len(study.metrics))
+
+    tasks = []
+    per_metric = []
+    for j, metric in enumerate(study.metrics):
+        n_events = int(ok[:, j].sum())
+        if n_events == 0:
+            continue
+        # the metric's own valid bars, in the coordinates the event windows count in
+        prefix = PrefixSums(values[:, j][~np.isnan(values[:, j])])
+        placebo_seed, boot_seed = metric_seeds[j].spawn(2)
+
+        batch = max(1, PLACEBO_BATCH_CELLS // n_events)
+        sizes = [min(batch, n_placebo - s) for s in range(0, n_placebo, batch)]
+        batch_seeds = placebo_seed.spawn(len(sizes))
+        first_task = len(tasks)
+        tasks += [(prefix, n_events, pre, post, size, bs) for size, bs in zip(sizes, batch_seeds)]
+        per_metric.append((metric, pct[ok[:, j], j], boot_seed, first_task, len(tasks)))
+
+    if workers > 0 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_placebo_batch, *zip(*tasks)))
+    else:
+        results = [_placebo_batch(*task) for task in tasks]
+
+    alpha = (1.0 - ci) / 2.0
+    rows = []
+    for metric, real_pct, boot_seed, lo, hi in per_metric:
+        observed = float(_nan_reduce(np.nanmean, real_pct))
+        null = np.concatenate(results[lo:hi]) if hi > lo else np.empty(0)
+        boot = _bootstrap(real_pct, n_boot, boot_seed) if n_boot > 0 else np.empty(0)
+        boot = boot[~np.isnan(boot)]
+
+        rows.append({
+            "event_name": event_name,
+            "metric": metric,
+            "pre": pre,
+            "post": post,
+            "n_events": len(real_pct),
+            "avg_pct_change": observed,
+            "placebo_mean": float(np.nanmean(null)) if len(null) else np.nan,
+            "placebo_std": float(np.nanstd(null, ddof=1)) if len(null) > 1 else np.nan,
+            "p_value": _two_sided_p(observed, null),
+            "boot_se": float(boot.std(ddof=1)) if len(boot) > 1 else np.nan,
+            "ci_low": float(np.quantile(boot, alpha)) if len(boot) else np.nan,
+            "ci_high": float(np.quantile(boot, 1.0 - alpha)) if len(boot) else np.nan,
+        })
+
+    return pd.DataFrame(rows, columns=SIGNIFICANCE_COLUMNS)
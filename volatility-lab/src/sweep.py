@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.event_study import PanelEvents
+from src.volatility import ESTIMATORS, TRADING_DAYS, fused_vol_panel
+
+
+def sweep_event_study(
+    df: pd.DataFrame,
+    event_dates: pd.DatetimeIndex,
+    pres: list[int],
+    posts: list[int],
+    windows: list[int],
+    event_name: str = "EVENT",
+    price_col: str = "Adj Close",
+    periods_per_year: float = TRADING_DAYS,
+) -> pd.DataFrame:
+    """
+    Event-study summaries for every (pre, post, window) configuration in one run.
+
+    The OHLC frame is turned into per-bar variances once and every window is
+    rolled from the same prefix sums (fused_vol_panel). Events are matched
+    once (PanelEvents) and every (pre, post) pair reads its window means from
+    one shared panel-level prefix-sum build.
+
+    Returns a tidy DataFrame, one row per (pre, post, estimator, window):
+      event_name, estimator, window, metric, pre, post, <summarize_changes columns>, rank
+    where rank orders estimators by avg_pct_change within each (pre, post, window).
+    """
+    windows = sorted({int(w) for w in windows})
+    panel = fused_vol_panel(df, windows=windows, price_col=price_col, periods_per_year=periods_per_year)
+    metrics = [f"{name}_{w}" for name in ESTIMATORS for w in windows]
+    study = PanelEvents(panel, event_dates, metrics=metrics)
+
+    summaries = [
+        study.summary(int(pre), int(post), event_name)
+        for pre in pres
+        for post in posts
+    ]
+    results = pd.concat(summaries, ignore_index=True)
+    if results.empty:
+        return results
+
+    parts = results["metric"].str.rsplit("_", n=1)
+    results.insert(1, "estimator", parts.str[0])
+    results.insert(2, "window", parts.str[1].astype(np.int64))
+
+    results["rank"] = (
+        results.groupby(["pre", "post", "window"])["avg_pct_change"]
+        .rank(ascending=False, method="min")
+        .astype("Int64")
+    )
+    return results.sort_values(["pre", "post", "window", "rank"], ignore_index=True)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+# bdate_range runs past pandas' timestamp range beyond roughly 60k business days
+_MAX_DAILY_BARS = 60_000
+
+
+def synthetic_ohlc(n_bars: int = 600, seed: int = 7, freq: str | None = None) -> pd.DataFrame:
+    """
+    Deterministic GBM-style OHLC frame shaped like load_ohlc_data output.
+
+    freq defaults to business days, or to minutes for histories too long to
+    fit a daily calendar (the estimators only care about bar order).
+    """
+    rng = np.random.default_rng(seed)
+    if freq is None:
+        freq = "B" if n_bars <= _MAX_DAILY_BARS else "min"
+    # plain DatetimeIndex without a freq, like the frames yfinance hands back
+    idx = pd.DatetimeIndex(pd.date_range("2015-01-02", periods=n_bars, freq=freq).to_numpy(), name="Date")
+
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n_bars)))
+    open_ = close * np.exp(rng.normal(0.0, 0.004, n_bars))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0.0, 0.006, n_bars)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0.0, 0.006, n_bars)))
+
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Adj Close": close * 0.98,
+            "Volume": rng.integers(1_000_000, 5_000_000, n_bars).astype(float),
+        },
+        index=idx,
+    )
+
+
+def synthetic_event_dates(index: pd.DatetimeIndex, every: int = 50, seed: int = 11) -> pd.DatetimeIndex:
+    """
+    Roughly one event per `every` bars of index, jittered so spacing is uneven.
+    """
+    rng = np.random.default_rng(seed)
+    pos = np.arange(every, len(index) - every, every)
+    pos = pos + rng.integers(-(every // 4), every // 4 + 1, len(pos))
+    return pd.DatetimeIndex(index[pos], name="event_date").normalize()
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from src.aggregate import RunningStats, TDigest, UniverseAggregate
+from src.cli import build_vol_panel, event_metrics
+from src.event_study import panel_event_study
+from src.synthetic import synthetic_event_dates, synthetic_ohlc
+
+
+def test_running_stats_merge_matches_numpy():
+    rng = np.random.default_rng(0)
+    parts = [rng.normal(3.0, 2.0, n) for n in (10, 500, 1)]
+    parts[1][::7] = np.nan
+
+    merged = RunningStats()
+    for p in parts:
+        s = RunningStats()
+        s.add(p)
+        merged.merge(s)
+
+    values = np.concatenate(parts)
+    values = values[~np.isnan(values)]
+    assert merged.count == len(values)
+    assert np.isclose(merged.mean, values.mean())
+    assert np.isclose(merged.std, values.std(ddof=1))
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+
+def test_tdigest_is_exact_when_small_and_accurate_when_merged():
+    small = TDigest()
+    small.add([5.0, 1.0, 3.0, 2.0])
+    assert small.quantile(0.5) == np.median([5.0, 1.0, 3.0, 2.0])
+
+    rng = np.random.default_rng(1)
+    values = rng.standard_t(df=4, size=200_000)
+    merged = TDigest()
+    for chunk in np.array_split(values, 40):
+        part = TDigest()
+        part.add(chunk)
+        merged.merge(part)
+
+    assert len(merged.means) <= 10 * merged.compression
+    assert merged.count == len(values)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        # rank error, the guarantee a t-digest gives
+        rank = np.mean(values <= merged.quantile(q))
+        assert abs(rank - q) < 0.01
+
+
+def _ticker_results(n_tickers=5):
+    out = {}
+    for i in range(n_tickers):
+        df = synthetic_ohlc(700, seed=i)
+        panel = build_vol_panel(df, windows=[20, 60])
+        events = synthetic_event_dates(df.index, every=45, seed=i)
+        rows, summary = panel_event_study(panel, events, metrics=event_metrics([20, 60]), event_name="CPI")
+        out[f"T{i}"] = (summary, rows)
+    return out
+
+
+def test_partial_aggregates_merge_to_the_full_ranking():
+    results = _ticker_results()
+
+    full = UniverseAggregate()
+    for t, (summary, rows) in results.items():
+        full.add_ticker(t, summary, rows)
+
+    # as parallel workers would: one partial per ticker, merged in arbitrary order
+    merged = UniverseAggregate()
+    for t in reversed(list(results)):
+        part = UniverseAggregate()
+        part.add_ticker(t, *results[t])
+        merged.merge(part)
+
+    a = full.ranking().set_index("metric").sort_index()
+    b = merged.ranking().set_index("metric").sort_index()
+    pd.testing.assert_frame_equal(a, b, check_exact=False, rtol=1e-12)
+
+    summaries = pd.concat([s.assign(ticker=t) for t, (s, _) in results.items()])
+    ref = summaries.groupby("metric").agg(
+        n_tickers=("ticker", "nunique"),
+        n_events=("n_events", "sum"),
+        avg_pct_change=("avg_pct_change", "mean"),
+        median_pct_change=("avg_pct_change", "median"),
+        std_pct_change=("avg_pct_change", "std"),
+    )
+    pd.testing.assert_frame_equal(a[ref.columns], ref, check_exact=False, rtol=1e-9, check_dtype=False)
+
+    rows = pd.concat([r for _, r in results.values()])
+    pooled = rows.groupby("metric")["pct_change"]
+    np.testing.assert_allclose(a["event_avg_pct_change"], pooled.mean().sort_index(), rtol=1e-9)
+    # a few hundred events per metric fit the digest buffer, so the median is exact
+    np.testing.assert_allclose(a["event_median_pct_change"], pooled.median().sort_index(), rtol=1e-9)
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from src.bench import CASES, DEFAULT_BASELINE, add_to_baseline, compare_to_baseline, load_results, run_benchmarks, save_results
+
+
+def test_every_case_runs_offline_and_reports_throughput():
+    results = run_benchmarks(sizes=[400], repeat=1)
+
+    assert list(results["case"]) == list(CASES)
+    assert (results["seconds"] > 0).all()
+    assert (results["bars_per_sec"] > 0).all()
+    assert (results["peak_mb"] >= 0).all()
+
+    per_event = results[results["n_events"] > 0]
+    assert set(per_event["case"]) == {"pre_post_event_change", "event_paths", "run_event_comparison"}
+    assert (per_event["events_per_sec"] > 0).all()
+
+
+def test_results_round_trip_and_flag_regressions(tmp_path):
+    base = pd.DataFrame({
+        "case": ["fused_vol_panel", "prefix_sums", "annualize_vol"],
+        "n_bars": [1000, 1000, 1000],
+        "n_events": 0,
+        "seconds": [0.010, 0.010, 0.0001],
+        "bars_per_sec": [1e5, 1e5, 1e7],
+        "events_per_sec": float("nan"),
+        "peak_mb": [2.0, 1.0, 0.1],
+    })
+    path = save_results(base, tmp_path / "baseline.json")
+    base = load_results(path)
+
+    current = base.copy()
+    current["seconds"] = [0.025, 0.011, 0.001]  # 2.5x, 1.1x, and 10x on a sub-ms case
+
+    cmp = compare_to_baseline(current, base, tolerance=1.5)
+    assert cmp.set_index("case")["regression"].to_dict() == {
+        "fused_vol_panel": True,
+        "prefix_sums": False,
+        "annualize_vol": False,
+    }
+
+    # new cases are appended; existing reference timings stay put
+    grown = add_to_baseline(base, pd.concat([current, current.assign(case="new_case")]))
+    assert list(grown["case"]) == ["fused_vol_panel", "prefix_sums", "annualize_vol"] + ["new_case"] * 3
+    assert list(grown["seconds"].iloc[:3]) == list(base["seconds"])
+
+
+def test_stored_baseline_covers_every_case():
+    assert set(load_results(DEFAULT_BASELINE)["case"]) == set(CASES)
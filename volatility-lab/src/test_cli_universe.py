@@ -0,0 +1,59 @@
+import sys
+
+import pandas as pd
+
+from src import cli
+from src.synthetic import synthetic_ohlc
+from src.data_loader import OHLCCache
+
+
+def _seed_cache(root, tickers):
+    cache = OHLCCache(root)
+    for i, t in enumerate(tickers):
+        df = synthetic_ohlc(n_bars=500, seed=i)
+        cache.write(t, "1d", df, "2015-01-01", "2017-01-01")
+
+
+def _write_events(path):
+    dates = pd.date_range("2015-09-10", "2016-09-10", freq="MS") + pd.Timedelta(days=11)
+    pd.DataFrame({"date": dates.strftime("%Y-%m-%d")}).to_csv(path, index=False)
+
+
+def test_load_universe_skips_headers_comments_and_duplicates(tmp_path):
+    p = tmp_path / "universe.txt"
+    p.write_text("ticker\nspy\n\n# comment\nQQQ, extra\nSPY\n")
+    assert cli.load_universe(str(p)) == ["SPY", "QQQ"]
+
+
+def test_universe_mode_writes_per_ticker_and_cross_sectional_reports(tmp_path, monkeypatch):
+    tickers = ["AAA", "BBB", "CCC"]
+    _seed_cache(tmp_path / "cache", tickers)
+    (tmp_path / "universe.txt").write_text("\n".join(tickers + ["MISSING"]) + "\n")
+    _write_events(tmp_path / "events.csv")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", [
+        "cli", "--universe", "universe.txt", "--start", "2015-01-01", "--end", "2017-01-01",
+        "--events", "events.csv", "--event_name", "CPI", "--windows", "20,60",
+        "--cache_dir", "cache", "--offline", "--jobs", "2",
+    ])
+    cli.main()
+
+    reports = tmp_path / "reports"
+    for t in tickers:
+        assert (reports / t / "vol_panel.csv").exists()
+        assert (reports / t / "event_summary.csv").exists()
+
+    ranking = pd.read_csv(reports / "estimator_ranking.csv")
+    assert set(ranking["metric"]) == set(cli.event_metrics([20, 60]))
+    assert (ranking["n_tickers"] == 3).all()
+    assert ranking["avg_pct_change"].is_monotonic_decreasing
+
+    # the cross-sectional mean is the equal-weight mean of per-ticker summaries
+    per_ticker = pd.concat(pd.read_csv(reports / t / "event_summary.csv") for t in tickers)
+    expected = per_ticker.groupby("metric")["avg_pct_change"].mean()
+    got = ranking.set_index("metric")["avg_pct_change"]
+    pd.testing.assert_series_equal(got.sort_index(), expected.sort_index(), check_names=False)
+
+    errors = pd.read_csv(reports / "universe_errors.csv")
+    assert list(errors["ticker"]) == ["MISSING"]
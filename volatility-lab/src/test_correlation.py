@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from src import cli
+from src.correlation import CovPanel, correlation_event_study, pair_event_shift, rolling_cov_panel, universe_returns
+from src.data_loader import OHLCCache
+from src.synthetic import synthetic_ohlc
+from src.volatility import ewma_volatility
+
+TICKERS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+def _frames() -> dict[str, pd.DataFrame]:
+    frames = {t: synthetic_ohlc(700, seed=i) for i, t in enumerate(TICKERS)}
+    frames["DDD"] = frames["DDD"].iloc[80:]  # listed later: NaN returns at the start
+    return frames
+
+
+def test_incremental_matrices_match_pandas_rolling():
+    returns = universe_returns(_frames())
+    full = rolling_cov_panel(returns, windows=[20], corr=False, upper=False, dtype=np.float64, periods_per_year=1.0)["cov_20"]
+    upper = rolling_cov_panel(returns, windows=[20], upper=True, dtype=np.float64)["corr_20"]
+
+    ref_cov = returns.rolling(20).cov()
+    ref_corr = returns.rolling(20).corr()
+    for t in [19, 50, 90, 101, 400, len(returns) - 1]:
+        day = returns.index[t]
+        np.testing.assert_allclose(full.matrix(t), ref_cov.loc[day].to_numpy(), rtol=1e-9, atol=1e-16)
+        np.testing.assert_allclose(upper.matrix(t), ref_corr.loc[day].to_numpy(), rtol=1e-9, atol=1e-12)
+
+    pd.testing.assert_series_equal(
+        upper.pair("AAA", "CCC"), ref_corr.xs("AAA", level=1)["CCC"], check_names=False, rtol=1e-9, atol=1e-12
+    )
+    assert upper.values.shape == (len(returns), 10)
+
+
+def test_long_runs_stay_accurate_and_ewma_diagonal_matches_ewma_volatility():
+    rng = np.random.default_rng(5)
+    returns = pd.DataFrame(
+        0.05 + rng.standard_normal((3000, 3)) * 1e-3, index=pd.bdate_range("2000-01-03", periods=3000), columns=list("xyz")
+    )
+    cov = rolling_cov_panel(returns, windows=[7], corr=False, dtype=np.float64, periods_per_year=1.0)["cov_7"]
+    np.testing.assert_allclose(cov.matrix(2999), returns.iloc[-7:].cov().to_numpy(), rtol=1e-7)
+
+    df = synthetic_ohlc(400)
+    ewma = rolling_cov_panel(universe_returns({"AAA": df}), windows=[20], method="ewma", corr=False, dtype=np.float64)
+    np.testing.assert_allclose(
+        np.sqrt(ewma["ewma_cov_20"].values[:, 0]), ewma_volatility(df, windows=[20])["ewma_20"], rtol=1e-10
+    )
+
+
+def test_event_hooks_and_round_trip(tmp_path):
+    returns = universe_returns(_frames())
+    panel = rolling_cov_panel(returns, windows=[20])["corr_20"]
+    events = returns.index[150::100]
+
+    rows, summary = correlation_event_study({"corr_20": panel}, events, pre=10, post=10)
+    assert list(summary["metric"]) == ["avg_corr_20"]
+    assert summary["n_events"].iloc[0] == len(events)
+
+    shift = pair_event_shift(panel, events, pre=10, post=10)
+    assert list(shift.index) == TICKERS
+    np.testing.assert_allclose(shift.to_numpy(), shift.to_numpy().T)
+    assert np.isnan(np.diag(shift)).all()
+
+    loaded = CovPanel.load(panel.save(tmp_path / "corr_20.npz"))
+    assert loaded.name == "corr_20" and loaded.upper and loaded.tickers == TICKERS
+    np.testing.assert_array_equal(loaded.values, panel.values)
+
+
+def test_universe_mode_writes_correlation_reports(tmp_path, monkeypatch):
+    cache = OHLCCache(tmp_path / "cache")
+    for t, df in _frames().items():
+        cache.write(t, "1d", df, "2015-01-01", "2018-01-01")
+    (tmp_path / "universe.txt").write_text("\n".join(TICKERS) + "\n")
+    dates = synthetic_ohlc(700).index[200::120]
+    pd.DataFrame({"date": dates.strftime("%Y-%m-%d")}).to_csv(tmp_path / "events.csv", index=False)
+
+    monkeypatch.chdir(tmp_path)
+    cli.main([
+        "--universe", "universe.txt", "--start", "2015-01-01", "--end", "2018-01-01", "--windows", "20,60",
+        "--cache_dir", "cache", "--offline", "--events", "events.csv", "--correlation", "ewma", "--jobs", "1",
+    ])
+
+    reports = tmp_path / "reports"
+    assert sorted(p.name for p in (reports / "correlation").iterdir()) == ["ewma_corr_20.npz", "ewma_corr_60.npz"]
+    summary = pd.read_csv(reports / "correlation_event_summary.csv")
+    assert set(summary["metric"]) == {"avg_ewma_corr_20", "avg_ewma_corr_60"}
@@ -0,0 +1,210 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.synthetic import synthetic_ohlc
+from src.data_loader import OHLCCache, load_ohlc_batch, load_ohlc_data, to_long_panel
+
+
+class FakeDownloader:
+    """
+    Serves slices of a fixed synthetic history and records every request.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.calls = []
+
+    def __call__(self, ticker, start, end, interval):
+        self.calls.append((ticker, start, end, interval))
+        out = self.df
+        if start is not None:
+            out = out[out.index >= pd.Timestamp(start)]
+        if end is not None:
+            out = out[out.index < pd.Timestamp(end)]
+        return out.copy()
+
+
+@pytest.fixture
+def history():
+    return synthetic_ohlc(n_bars=400)
+
+
+def test_without_cache_every_call_downloads(history):
+    fake = FakeDownloader(history)
+    load_ohlc_data("SPY", start="2015-03-02", end="2015-06-01", downloader=fake)
+    load_ohlc_data("SPY", start="2015-03-02", end="2015-06-01", downloader=fake)
+    assert len(fake.calls) == 2
+
+
+def test_repeat_request_is_served_from_cache(tmp_path, history):
+    fake = FakeDownloader(history)
+    first = load_ohlc_data("SPY", start="2015-03-02", end="2015-06-01", cache_dir=tmp_path, downloader=fake)
+    second = load_ohlc_data("SPY", start="2015-03-02", end="2015-06-01", cache_dir=tmp_path, downloader=fake)
+
+    assert len(fake.calls) == 1
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+    assert first.index.min() >= pd.Timestamp("2015-03-02")
+    assert first.index.max() < pd.Timestamp("2015-06-01")
+
+
+def test_only_missing_tail_is_fetched(tmp_path, history):
+    fake = FakeDownloader(history)
+    load_ohlc_data("SPY", start="2015-01-02", end="2015-06-01", cache_dir=tmp_path, downloader=fake)
+    df = load_ohlc_data("SPY", start="2015-01-02", end="2015-09-01", cache_dir=tmp_path, downloader=fake)
+
+    assert len(fake.calls) == 2
+    # tail request starts at the last cached bar, not at the original start
+    tail_start = pd.Timestamp(fake.calls[1][1])
+    assert tail_start >= pd.Timestamp("2015-05-29")
+
+    expected = history[(history.index >= "2015-01-02") & (history.index < "2015-09-01")]
+    assert df.index.equals(expected.index)
+    pd.testing.assert_frame_equal(df.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_offline_mode_never_downloads(tmp_path, history):
+    fake = FakeDownloader(history)
+    load_ohlc_data("QQQ", start="2015-01-02", end="2015-12-01", cache_dir=tmp_path, downloader=fake)
+
+    def no_network(*args):
+        raise AssertionError("offline mode must not download")
+
+    df = load_ohlc_data("QQQ", start="2015-02-02", end="2015-03-02", cache_dir=tmp_path, offline=True, downloader=no_network)
+    assert not df.empty
+
+    with pytest.raises(ValueError, match="offline"):
+        load_ohlc_data("IWM", start="2015-02-02", cache_dir=tmp_path, offline=True, downloader=no_network)
+
+
+def test_cache_is_keyed_by_ticker_and_interval(tmp_path, history):
+    cache = OHLCCache(tmp_path)
+    cache.write("SPY", "1d", history, "2015-01-02", "2016-07-01")
+
+    assert cache.read("SPY", "1h") is None
+    assert cache.read("QQQ", "1d") is None
+    assert len(cache.read("SPY", "1d")) == len(history)
+
+
+def test_write_swaps_in_a_whole_generation(tmp_path, history):
+    cache = OHLCCache(tmp_path)
+    generations = []
+    for n in [100, 200, 300]:
+        cache.write("SPY", "1d", history.iloc[:n], "2015-01-02", "2016-07-01")
+        generations.append(cache.read_meta("SPY")["data"])
+        assert len(cache.read("SPY")) == n
+
+    # meta.json names the current generation; the previous one stays for in-flight readers
+    kept = sorted(d.name for d in cache.path("SPY").iterdir() if d.is_dir())
+    assert kept == sorted(generations[1:])
+
+
+def test_float32_cache_does_not_serve_float64(tmp_path, history):
+    fake = FakeDownloader(history)
+    load_ohlc_data("SPY", start="2015-01-02", end="2015-06-01", cache_dir=tmp_path, downloader=fake, dtype="float32")
+
+    with pytest.raises(ValueError, match="float32"):
+        load_ohlc_data("SPY", start="2015-01-02", end="2015-06-01", cache_dir=tmp_path, offline=True)
+
+    df = load_ohlc_data("SPY", start="2015-01-02", end="2015-06-01", cache_dir=tmp_path, downloader=fake)
+    assert len(fake.calls) == 2
+    expected = history[(history.index >= "2015-01-02") & (history.index < "2015-06-01")]
+    pd.testing.assert_frame_equal(df.reset_index(drop=True), expected.reset_index(drop=True))
+
+    # a float32 request is served by the float64 entry, and extending it keeps float64
+    load_ohlc_data("SPY", start="2015-01-02", end="2015-09-01", cache_dir=tmp_path, downloader=fake, dtype="float32")
+    assert OHLCCache(tmp_path).read_meta("SPY")["dtype"] == "float64"
+
+
+def test_batch_loader_reports_failures_without_aborting(history):
+    fake = FakeDownloader(history)
+
+    def downloader(ticker, start, end, interval):
+        if ticker == "BAD":
+            raise ConnectionError("boom")
+        return fake(ticker, start, end, interval)
+
+    frames, errors = load_ohlc_batch(
+        ["SPY", "BAD", "QQQ", "SPY"], start="2015-01-02", max_workers=2, retries=1, backoff=0.0, downloader=downloader
+    )
+
+    assert list(frames) == ["SPY", "QQQ"]
+    assert list(errors) == ["BAD"]
+    assert "ConnectionError" in errors["BAD"]
+
+    long = to_long_panel(frames)
+    assert set(long["ticker"]) == {"SPY", "QQQ"}
+    assert len(long) == 2 * len(history)
+
+
+def test_batch_loader_retries_and_bounds_concurrency(history):
+    fake = FakeDownloader(history)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "failed_once": set()}
+
+    def downloader(ticker, start, end, interval):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            time.sleep(0.01)
+            if ticker not in state["failed_once"]:
+                state["failed_once"].add(ticker)
+                raise TimeoutError("transient")
+            return fake(ticker, start, end, interval)
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    tickers = [f"T{i}" for i in range(12)]
+    frames, errors = load_ohlc_batch(tickers, start="2015-01-02", max_workers=3, retries=2, backoff=0.0, downloader=downloader)
+
+    assert not errors
+    assert len(frames) == 12
+    assert state["peak"] <= 3
+
+
+def _intraday_history(days: int = 40) -> pd.DataFrame:
+    sessions = pd.bdate_range("2024-03-01", periods=days)
+    stamps = [
+        pd.Timestamp(d) + pd.Timedelta(hours=9, minutes=30) + pd.Timedelta(minutes=5 * k)
+        for d in sessions
+        for k in range(78)
+    ]
+    idx = pd.DatetimeIndex(stamps).tz_localize("America/New_York")
+    base = synthetic_ohlc(n_bars=len(idx), seed=5)
+    return base.set_axis(idx.rename("Datetime"), axis=0)
+
+
+def test_intraday_fetch_is_chunked_and_cached_with_timezone(tmp_path):
+    history = _intraday_history()
+    fake = FakeDownloader(history)
+
+    def downloader(ticker, start, end, interval):
+        assert interval == "1m"
+        # yfinance rejects 1m requests spanning more than 7 days
+        assert pd.Timestamp(end) - pd.Timestamp(start) <= pd.Timedelta(days=7)
+        lo = pd.Timestamp(start).tz_localize("America/New_York")
+        hi = pd.Timestamp(end).tz_localize("America/New_York")
+        fake.calls.append((ticker, start, end, interval))
+        return history[(history.index >= lo) & (history.index < hi)].copy()
+
+    df = load_ohlc_data(
+        "SPY", start="2024-03-01", end="2024-04-01", interval="1m",
+        cache_dir=tmp_path, downloader=downloader, dtype="float32",
+    )
+    assert len(fake.calls) == 5
+    assert str(df.index.tz) == "America/New_York"
+    assert (df.dtypes == "float32").all()
+
+    expected = history[(history.index >= "2024-03-01") & (history.index < "2024-04-01")]
+    assert df.index.equals(expected.index.rename("Date"))
+
+    cached = load_ohlc_data(
+        "SPY", start="2024-03-11", end="2024-03-12", interval="1m",
+        cache_dir=tmp_path, offline=True, dtype="float32",
+    )
+    assert len(cached) == 78
+    assert cached.index[0] == pd.Timestamp("2024-03-11 09:30", tz="America/New_York")
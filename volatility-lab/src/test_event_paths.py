@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from src import cli
+from src.cli import build_vol_panel
+from src.event_study import PanelEvents, event_paths
+from src.synthetic import synthetic_event_dates
+
+
+def test_paths_gather_matches_window_means_and_slices(ohlc):
+    panel = build_vol_panel(ohlc, windows=[20])
+    panel.iloc[200:210, panel.columns.get_loc("gk_20")] = np.nan  # gk counts only its valid bars
+    events = synthetic_event_dates(ohlc.index, every=40)
+    events = events.append(pd.DatetimeIndex([ohlc.index[5], ohlc.index[-3]]))  # incomplete windows
+
+    study = PanelEvents(panel, events)
+    ok, pre_vol, post_vol = study.window_means(10, 5)
+    paths = study.paths(10, 5)
+
+    assert paths.values.shape == (len(events), 15, len(panel.columns))
+    assert (paths.complete == ok).all()
+    np.testing.assert_allclose(paths.values[:, :10].mean(axis=1)[ok], pre_vol[ok])
+    np.testing.assert_allclose(paths.values[:, 10:].mean(axis=1)[ok], post_vol[ok])
+    assert np.isnan(paths.values[-2, :5]).all() and np.isnan(paths.values[-1, -2:]).all()
+
+    # one event against a plain dropna() + iloc slice
+    gk = panel["gk_20"].dropna()
+    p = gk.index.searchsorted(events[3])
+    np.testing.assert_array_equal(paths.values[3, :, study.metrics.index("gk_20")], gk.iloc[p - 10:p + 5].to_numpy())
+
+
+def test_response_curves(ohlc):
+    panel = build_vol_panel(ohlc, windows=[20])
+    paths = event_paths(panel, synthetic_event_dates(ohlc.index, every=40), pre=5, post=5, metrics=["c2c_20", "rs_20"])
+
+    mean = paths.curves()
+    assert list(mean.index) == list(range(-5, 5)) and list(mean.columns) == ["c2c_20", "rs_20"]
+    np.testing.assert_allclose(mean.to_numpy(), np.nanmean(paths.values[paths.complete.all(axis=1)], axis=0))
+    # relative curves average to ~0 over the pre window by construction
+    assert abs(paths.curves(relative=True).loc[-5:-1].mean().abs().max()) < 1e-9
+
+    frame = paths.curve_frame("CPI")
+    assert list(frame["metric"].unique()) == ["c2c_20", "rs_20"]
+    assert len(frame) == 2 * 10 and (frame["event_name"] == "CPI").all()
+
+
+def test_cli_writes_curves_and_response_plot(ohlc, tmp_path, monkeypatch):
+    dates = ohlc.index[100::60]
+    pd.DataFrame({"date": dates.strftime("%Y-%m-%d")}).to_csv(tmp_path / "events.csv", index=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli, "load_ohlc_data", lambda *a, **k: ohlc)
+
+    cli.main([
+        "--ticker", "AAA", "--start", "2015-01-01", "--windows", "20", "--events", "events.csv",
+        "--pre", "10", "--post", "10", "--event_paths", "--make_plot",
+    ])
+
+    curves = pd.read_csv(tmp_path / "reports" / "event_curves.csv")
+    assert set(curves["rel_day"]) == set(range(-10, 10))
+    assert (tmp_path / "reports" / "event_response.png").stat().st_size > 0
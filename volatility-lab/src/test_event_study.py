@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cli import build_vol_panel, run_event_comparison
+from src.event_study import (
+    match_event_to_trading_day,
+    panel_event_study,
+    pre_post_event_change,
+    summarize_changes,
+)
+
+
+def _reference_pre_post(vol_series, event_dates, pre, post):
+    """
+    The original per-event loop, kept as the behavioural reference.
+    """
+    vol = vol_series.dropna().sort_index()
+    idx = pd.DatetimeIndex(vol.index).normalize()
+
+    rows = []
+    for d in event_dates:
+        t = match_event_to_trading_day(idx, d)
+        if t is None:
+            continue
+        t_pos = idx.get_indexer([t])[0]
+        if t_pos - pre < 0 or t_pos + post - 1 >= len(idx):
+            continue
+        pre_vol = float(vol.iloc[t_pos - pre:t_pos].mean())
+        post_vol = float(vol.iloc[t_pos:t_pos + post].mean())
+        delta = post_vol - pre_vol
+        rows.append({
+            "event_date": pd.Timestamp(d).date(),
+            "trading_date": pd.Timestamp(t).date(),
+            "pre_vol": pre_vol,
+            "post_vol": post_vol,
+            "delta": delta,
+            "pct_change": None if pre_vol == 0 else (delta / pre_vol) * 100.0,
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def events():
+    # month-start Saturdays/Sundays included to exercise the roll-forward, plus
+    # events before the history, inside the warm-up and after the last bar
+    return pd.DatetimeIndex(
+        ["2014-06-01", "2015-02-01", "2015-03-15"]
+        + [str(d.date()) for d in pd.date_range("2015-06-01", "2017-03-01", freq="MS")]
+        + ["2017-06-15", "2030-01-01"]
+    )
+
+
+@pytest.mark.parametrize("pre,post", [(20, 20), (5, 40), (1, 1)])
+def test_vectorized_pre_post_matches_loop(ohlc, events, pre, post):
+    panel = build_vol_panel(ohlc, windows=[20, 60])
+    for metric in ["c2c_20", "park_60", "rs_20"]:
+        got = pre_post_event_change(panel[metric], events, pre=pre, post=post)
+        expected = _reference_pre_post(panel[metric], events, pre=pre, post=post)
+        pd.testing.assert_frame_equal(got, expected, check_exact=False, rtol=1e-12)
+
+
+def test_vectorized_pre_post_with_no_matching_events(ohlc):
+    panel = build_vol_panel(ohlc, windows=[20])
+    rows = pre_post_event_change(panel["gk_20"], pd.DatetimeIndex(["2030-01-01"]))
+    assert rows.empty
+
+
+def test_zero_pre_vol_gives_missing_pct_change():
+    idx = pd.bdate_range("2020-01-01", periods=10)
+    vol = pd.Series([0.0] * 5 + [1.0] * 5, index=idx)
+    rows = pre_post_event_change(vol, pd.DatetimeIndex([idx[5]]), pre=3, post=3)
+    assert rows["pre_vol"].iloc[0] == 0.0
+    assert np.isnan(rows["pct_change"].iloc[0])
+
+
+def _reference_event_comparison(vol_panel, events, event_name, pre, post, metrics):
+    """
+    The original per-metric loop of run_event_comparison.
+    """
+    all_rows, summaries = [], []
+    for m in metrics:
+        if m not in vol_panel.columns:
+            continue
+        rows = _reference_pre_post(vol_panel[m], events, pre=pre, post=post)
+        if rows.empty:
+            continue
+        rows.insert(0, "event_name", event_name)
+        rows.insert(1, "metric", m)
+        all_rows.append(rows)
+
+        summary = summarize_changes(rows)
+        summary.insert(0, "event_name", event_name)
+        summary.insert(1, "metric", m)
+        summary.insert(2, "pre", pre)
+        summary.insert(3, "post", post)
+        summaries.append(summary)
+    return pd.concat(all_rows, ignore_index=True), pd.concat(summaries, ignore_index=True)
+
+
+@pytest.mark.parametrize("pre,post", [(20, 20), (10, 30)])
+def test_panel_event_study_matches_per_metric_loop(ohlc, events, pre, post):
+    panel = build_vol_panel(ohlc, windows=[20, 60, 120])
+    # interior gaps that differ per metric, so each metric's dropna() index differs
+    panel.iloc[200:205, panel.columns.get_loc("park_20")] = np.nan
+    panel.iloc[300, panel.columns.get_loc("c2c_60")] = np.nan
+    metrics = ["c2c_20", "c2c_60", "park_20", "gk_120", "rs_60", "not_a_column"]
+
+    rows, summary = panel_event_study(panel, events, pre=pre, post=post, metrics=metrics, event_name="CPI")
+    exp_rows, exp_summary = _reference_event_comparison(panel, events, "CPI", pre, post, metrics)
+
+    pd.testing.assert_frame_equal(rows, exp_rows, check_exact=False, rtol=1e-12)
+    pd.testing.assert_frame_equal(summary, exp_summary, check_exact=False, rtol=1e-12, check_dtype=False)
+
+
+def test_run_event_comparison_ranks_from_panel_study(ohlc, events, tmp_path):
+    panel = build_vol_panel(ohlc, windows=[20])
+    event_file = tmp_path / "events.csv"
+    pd.DataFrame({"date": events.strftime("%Y-%m-%d")}).to_csv(event_file, index=False)
+
+    rows, summary, ranking = run_event_comparison(
+        panel, str(event_file), "FOMC", pre=20, post=20, metrics=["c2c_20", "park_20", "gk_20", "rs_20"]
+    )
+    assert set(rows["metric"]) == {"c2c_20", "park_20", "gk_20", "rs_20"}
+    assert ranking["avg_pct_change"].is_monotonic_decreasing
+    assert list(summary.columns[:4]) == ["event_name", "metric", "pre", "post"]
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from src import cli
+from src.cli import build_vol_panel, event_metrics
+from src.volatility import (
+    ewma_volatility,
+    fit_garch,
+    garch_variance,
+    garch_volatility,
+    yang_zhang_volatility,
+)
+
+
+def test_yang_zhang_matches_pandas_reference(ohlc):
+    o, h, l, c = (np.log(ohlc[col]) for col in ["Open", "High", "Low", "Close"])
+    overnight = o - c.shift(1)
+    open_close = c - o
+    rs = ((h - o) * (h - c) + (l - o) * (l - c)).where(overnight.notna())
+
+    got = yang_zhang_volatility(ohlc, windows=[5, 20])
+    for w in [5, 20]:
+        k = 0.34 / (1.34 + (w + 1) / (w - 1))
+        var = overnight.rolling(w).var() + k * open_close.rolling(w).var() + (1 - k) * rs.rolling(w).mean()
+        expected = np.sqrt(var * 252)
+        np.testing.assert_allclose(got[f"yz_{w}"], expected, rtol=1e-9, atol=1e-12)
+        assert got[f"yz_{w}"].iloc[:w].isna().all()
+
+
+def test_recursions_match_python_loops(ohlc):
+    r = np.log(ohlc["Adj Close"]).diff().dropna().to_numpy()
+
+    lam = 1 - 2 / (20 + 1)
+    var, ref = r[0] ** 2, [r[0] ** 2]
+    for x in r[1:]:
+        var = lam * var + (1 - lam) * x * x
+        ref.append(var)
+    got = ewma_volatility(ohlc, windows=[20])["ewma_20"].to_numpy()
+    np.testing.assert_allclose(got[19:], np.sqrt(np.array(ref[19:]) * 252), rtol=1e-10)
+    assert np.isnan(got[:19]).all()
+
+    omega, alpha, beta = 2e-6, 0.07, 0.9
+    h, ref = omega / (1 - alpha - beta), []
+    for x in r:
+        h = omega + alpha * x * x + beta * h
+        ref.append(h)
+    np.testing.assert_allclose(garch_variance(r, omega, alpha, beta), ref, rtol=1e-10)
+
+
+def test_fit_garch_recovers_simulated_parameters():
+    rng = np.random.default_rng(3)
+    omega, alpha, beta = 1e-6, 0.08, 0.9
+    h, r = omega / (1 - alpha - beta), np.empty(20_000)
+    for t in range(len(r)):
+        r[t] = np.sqrt(h) * rng.standard_normal()
+        h = omega + alpha * r[t] ** 2 + beta * h
+
+    _, a, b = fit_garch(r)
+    assert abs(a - alpha) < 0.02
+    assert abs(b - beta) < 0.03
+
+
+def test_extra_columns_plug_into_panel_and_event_study(ohlc, tmp_path, monkeypatch):
+    extra = ["yz", "ewma", "garch"]
+    panel = build_vol_panel(ohlc, windows=[20], extra_estimators=extra)
+    assert list(panel.columns)[-3:] == ["yz_20", "ewma_20", "garch"]
+    assert event_metrics([20], extra)[-3:] == ["yz_20", "ewma_20", "garch"]
+
+    given = garch_volatility(ohlc, params=(1e-6, 0.05, 0.9))
+    assert given.index.equals(panel.index)
+
+    compact = build_vol_panel(ohlc, windows=[20], compact=True, chunk_size=128, extra_estimators=extra)
+    assert (compact.dtypes == np.float32).all()
+    np.testing.assert_allclose(compact["yz_20"], panel["yz_20"], rtol=1e-6)
+
+    dates = ohlc.index[150::60]
+    pd.DataFrame({"date": dates.strftime("%Y-%m-%d")}).to_csv(tmp_path / "events.csv", index=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli, "load_ohlc_data", lambda *a, **k: ohlc)
+    cli.main([
+        "--ticker", "AAA", "--start", "2015-01-01", "--windows", "20",
+        "--events", "events.csv", "--extra_estimators", "yz,ewma,garch",
+    ])
+
+    summary = pd.read_csv(tmp_path / "reports" / "event_summary.csv")
+    assert {"yz_20", "ewma_20", "garch"} <= set(summary["metric"])
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import cli, event_study
+from src.event_study import extend_event_study, panel_event_study
+from src.reports import read_report
+from src.synthetic import synthetic_ohlc
+
+REPORTS = ["vol_panel", "event_rows", "event_summary", "estimator_ranking"]
+
+
+def _run(tmp_path, monkeypatch, df, run_dir, *extra):
+    monkeypatch.chdir(run_dir)
+    monkeypatch.setattr(cli, "load_ohlc_data", lambda *a, **k: df)
+    cli.main([
+        "--ticker", "AAA", "--start", "2015-01-01", "--windows", "5,20", "--events", str(tmp_path / "events.csv"),
+        "--pre", "10", "--post", "10", *extra,
+    ])
+
+
+def _count_extends(monkeypatch) -> dict[str, int]:
+    # how often each run took the append path instead of a rebuild
+    calls = {"extend_vol_panel": 0, "extend_event_study": 0}
+    for name in calls:
+        def counted(*args, _name=name, _original=getattr(cli, name), **kwargs):
+            calls[_name] += 1
+            return _original(*args, **kwargs)
+        monkeypatch.setattr(cli, name, counted)
+    return calls
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_incremental_runs_match_a_full_recompute(tmp_path, monkeypatch, fmt):
+    df = synthetic_ohlc(600)
+    df.iloc[540:543, df.columns.get_loc("Adj Close")] = np.nan
+    # events in the middle, near the first run's end (post window completes later) and after it
+    dates = df.index[[100, 300, 545, 552, 559, 575, 590, 598]]
+    pd.DataFrame({"date": dates.strftime("%Y-%m-%d")}).to_csv(tmp_path / "events.csv", index=False)
+
+    full_dir, inc_dir = tmp_path / "full", tmp_path / "inc"
+    full_dir.mkdir()
+    inc_dir.mkdir()
+    fmt_args = ["--output_format", fmt]
+
+    _run(tmp_path, monkeypatch, df, full_dir, *fmt_args)
+    _run(tmp_path, monkeypatch, df.iloc[:550], inc_dir, *fmt_args)
+    calls = _count_extends(monkeypatch)
+    for n in [551, 580, 600]:  # one new bar, then a batch, then the rest
+        _run(tmp_path, monkeypatch, df.iloc[:n], inc_dir, *fmt_args, "--incremental")
+    assert calls == {"extend_vol_panel": 3, "extend_event_study": 3}
+
+    suffix = f".{fmt}"
+    for name in REPORTS:
+        index_col = "Date" if name == "vol_panel" else None
+        full = read_report(full_dir / "reports" / f"{name}{suffix}", index_col=index_col)
+        inc = read_report(inc_dir / "reports" / f"{name}{suffix}", index_col=index_col)
+        pd.testing.assert_frame_equal(inc, full, check_exact=False, rtol=1e-12, atol=1e-15, check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    "change, extends",
+    [
+        # (extend_vol_panel calls, extend_event_study calls) of the --incremental run
+        ("none", (1, 1)),
+        ("pre_post", (1, 0)),
+        ("events_file", (1, 0)),
+        ("earlier_start", (0, 0)),
+        ("quality", (0, 0)),
+        ("float32", (0, 0)),
+    ],
+)
+def test_incremental_rebuilds_when_the_run_changed(tmp_path, monkeypatch, change, extends):
+    df = synthetic_ohlc(600)
+    events = tmp_path / "events.csv"
+    pd.DataFrame({"date": df.index[[100, 300, 545]].strftime("%Y-%m-%d")}).to_csv(events, index=False)
+
+    full_dir, inc_dir = tmp_path / "full", tmp_path / "inc"
+    full_dir.mkdir()
+    inc_dir.mkdir()
+    first, args = df.iloc[:560], []
+    if change == "earlier_start":
+        first = df.iloc[30:560]
+    _run(tmp_path, monkeypatch, first, inc_dir)
+
+    if change == "pre_post":
+        args = ["--pre", "3", "--post", "3"]
+    elif change == "events_file":
+        pd.DataFrame({"date": df.index[[150, 400, 575]].strftime("%Y-%m-%d")}).to_csv(events, index=False)
+    elif change == "quality":
+        args = ["--quality", "flag"]
+    elif change == "float32":
+        args = ["--float32"]
+    calls = _count_extends(monkeypatch)
+    _run(tmp_path, monkeypatch, df, inc_dir, *args, "--incremental")
+    assert (calls["extend_vol_panel"], calls["extend_event_study"]) == extends
+    _run(tmp_path, monkeypatch, df, full_dir, *args)
+
+    for name in REPORTS:
+        index_col = "Date" if name == "vol_panel" else None
+        full = read_report(full_dir / "reports" / f"{name}.csv", index_col=index_col)
+        inc = read_report(inc_dir / "reports" / f"{name}.csv", index_col=index_col)
+        pd.testing.assert_frame_equal(inc, full, check_exact=False, rtol=1e-12, atol=1e-15, check_dtype=False)
+
+
+def test_extend_event_study_recomputes_only_the_tail(ohlc, monkeypatch):
+    panel = cli.build_vol_panel(ohlc, windows=[20])
+    events = ohlc.index[[60, 200, 380, 395, 420]]
+    n_old = 400
+    old_rows, _ = panel_event_study(panel.iloc[:n_old], events, pre=10, post=10)
+    full_rows, full_summary = panel_event_study(panel, events, pre=10, post=10)
+
+    seen = []
+
+    class Recording(event_study.PanelEvents):
+        def __init__(self, vol_panel, *args, **kwargs):
+            seen.append(len(vol_panel))
+            super().__init__(vol_panel, *args, **kwargs)
+
+    monkeypatch.setattr(event_study, "PanelEvents", Recording)
+    rows, summary = extend_event_study(panel, old_rows, n_old, events, pre=10, post=10)
+
+    # only the new bars plus pre + post bars of lookback were studied
+    assert seen == [len(panel) - n_old + 20]
+    pd.testing.assert_frame_equal(rows, full_rows, check_exact=False, rtol=1e-12, check_dtype=False)
+    pd.testing.assert_frame_equal(summary, full_summary, check_exact=False, rtol=1e-12, check_dtype=False)
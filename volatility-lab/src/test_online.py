@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from src.online import (
+    OnlineCloseToClose,
+    OnlineGarmanKlass,
+    OnlineParkinson,
+    OnlineRogersSatchell,
+    OnlineVolPanel,
+)
+from src.volatility import fused_vol_panel
+
+WINDOWS = [5, 20, 60]
+
+
+def _replay_panel(df, windows):
+    panel = OnlineVolPanel(windows)
+    rows = [panel.update(bar) for bar in df.to_dict("records")]
+    return pd.DataFrame(rows, index=df.index)
+
+
+def test_online_replay_matches_batch_panel(ohlc):
+    batch = fused_vol_panel(ohlc, windows=WINDOWS).drop(columns="log_return")
+    online = _replay_panel(ohlc, WINDOWS).loc[batch.index, batch.columns]
+    pd.testing.assert_frame_equal(online, batch, check_exact=False, rtol=1e-10, atol=1e-14, check_freq=False)
+
+
+def test_each_online_estimator_matches_its_batch_columns(ohlc):
+    batch = fused_vol_panel(ohlc, windows=WINDOWS)
+    for cls in (OnlineParkinson, OnlineGarmanKlass, OnlineRogersSatchell):
+        got = cls(WINDOWS).replay(ohlc).loc[batch.index]
+        pd.testing.assert_frame_equal(got, batch[got.columns], check_exact=False, rtol=1e-10, atol=1e-14)
+
+    c2c = OnlineCloseToClose(WINDOWS).replay(ohlc).iloc[1:]
+    pd.testing.assert_frame_equal(c2c, batch[c2c.columns], check_exact=False, rtol=1e-10, atol=1e-14)
+
+
+def test_online_bad_bars_only_poison_their_windows(ohlc):
+    df = ohlc.copy()
+    df.iloc[100, df.columns.get_loc("High")] = np.nan
+    df.iloc[150, df.columns.get_loc("Adj Close")] = np.nan
+
+    batch = fused_vol_panel(df, windows=WINDOWS).drop(columns="log_return")
+    online = _replay_panel(df, WINDOWS)
+
+    # NaN price: the batch panel drops those return rows, online simply emits no new observation
+    online = online.loc[batch.index, batch.columns]
+    pd.testing.assert_frame_equal(online, batch, check_exact=False, rtol=1e-10, atol=1e-14)
+
+
+def test_online_state_stays_accurate_over_a_long_stream():
+    rng = np.random.default_rng(11)
+    est = OnlineParkinson([20])
+    terms = []
+    for _ in range(50_000):
+        lo = 100.0 * math.exp(rng.normal(0, 0.01))
+        hi = lo * math.exp(abs(rng.normal(0, 0.01)))
+        est.update({"Open": lo, "High": hi, "Low": lo, "Close": hi})
+        terms.append(math.log(hi / lo) ** 2 / (4 * math.log(2)))
+
+    exact = math.sqrt(math.fsum(terms[-20:]) / 20) * math.sqrt(252)
+    assert math.isclose(est.current()["park_20"], exact, rel_tol=1e-12)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.panel_cache import PanelCache
+from src.synthetic import synthetic_ohlc
+from src.volatility import chunked_vol_panel, extend_vol_panel, fused_vol_panel
+
+
+class FakeSource:
+    """
+    Local OHLC source whose histories grow as `visible` bars are revealed.
+    """
+
+    def __init__(self, frames: dict[str, pd.DataFrame], visible: int):
+        self.frames = frames
+        self.visible = visible
+        self.calls = []
+
+    def __call__(self, ticker: str, start: str, end: str | None) -> pd.DataFrame:
+        self.calls.append((ticker, start))
+        if ticker not in self.frames:
+            raise ValueError(f"No data returned for ticker {ticker}")
+        df = self.frames[ticker].iloc[:self.visible]
+        return df[df.index >= pd.Timestamp(start)]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_extend_matches_full_rebuild(ohlc, compact):
+    ohlc = ohlc.copy()
+    ohlc.iloc[395:399, ohlc.columns.get_loc("Adj Close")] = np.nan  # gap just before the new bars
+    windows = [5, 20, 60]
+    build = (lambda df: chunked_vol_panel(df, windows=windows)) if compact else (lambda df: fused_vol_panel(df, windows=windows))
+
+    got = extend_vol_panel(ohlc, build(ohlc.iloc[:400]), windows=windows)
+
+    pd.testing.assert_frame_equal(got, build(ohlc), check_exact=False, rtol=1e-6 if compact else 1e-10)
+    assert extend_vol_panel(ohlc, got, windows=windows) is got
+
+
+def test_refresh_appends_only_new_bars():
+    source = FakeSource({"AAA": synthetic_ohlc(500)}, visible=450)
+    cache = PanelCache(source, start="2015-01-01", windows=[20, 60])
+
+    first = cache.get("aaa")
+    assert cache.get("AAA") is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    source.visible = 500
+    assert cache.refresh("AAA") == 50
+    assert source.calls[-1] == ("AAA", str(first.ohlc.index[-1].date()))
+    assert cache.refresh("AAA") == 0
+
+    full = fused_vol_panel(source.frames["AAA"], windows=[20, 60])
+    pd.testing.assert_frame_equal(cache.get("AAA").panel, full, check_exact=False, rtol=1e-10)
+
+
+def test_lru_eviction_keeps_total_bytes_under_budget():
+    frames = {t: synthetic_ohlc(300, seed=i) for i, t in enumerate(["AAA", "BBB", "CCC"])}
+    source = FakeSource(frames, visible=300)
+    probe = PanelCache(source, start="2015-01-01").get("AAA")
+
+    cache = PanelCache(source, start="2015-01-01", max_bytes=int(probe.nbytes * 2.5))
+    cache.get("AAA")
+    cache.get("BBB")
+    cache.get("AAA")  # BBB is now least recently used
+    cache.get("CCC")
+
+    assert "BBB" not in cache
+    assert "AAA" in cache and "CCC" in cache
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.stats()["evictions"] == 1
+
+    with pytest.raises(ValueError):
+        cache.get("ZZZ")
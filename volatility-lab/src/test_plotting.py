@@ -0,0 +1,70 @@
+from src import cli, plotting
+from src.data_loader import OHLCCache
+from src.plotting import PlotQueue, render_plot, ticker_plot_job, universe_plot_job
+from src.synthetic import synthetic_ohlc
+
+COLS = ["c2c_20", "park_20", "gk_20", "rs_20"]
+
+
+def _jobs(tmp_path, tickers):
+    return {
+        t: ticker_plot_job(cli.build_vol_panel(synthetic_ohlc(300, seed=i), windows=[20]), t, tmp_path / f"{t}.png", COLS)
+        for i, t in enumerate(tickers)
+    }
+
+
+def test_renders_reuse_one_figure_template(tmp_path):
+    jobs = _jobs(tmp_path, ["AAA", "BBB"])
+    plotting._TEMPLATES.clear()
+
+    paths = [render_plot(job) for job in jobs.values()]
+
+    assert all(p.stat().st_size > 0 for p in paths)
+    assert len(plotting._TEMPLATES) == 1
+
+
+def test_ticker_job_skips_empty_panels(tmp_path):
+    panel = cli.build_vol_panel(synthetic_ohlc(10), windows=[20])
+    assert ticker_plot_job(panel, "AAA", tmp_path / "x.png", COLS) is None
+
+
+def test_deferred_queue_renders_on_flush_in_a_process_pool(tmp_path):
+    jobs = _jobs(tmp_path, ["AAA", "BBB", "CCC"])
+
+    with PlotQueue(workers=2, defer=True) as queue:
+        for job in jobs.values():
+            queue.submit(job)
+        queue.submit(universe_plot_job(jobs, tmp_path / "universe.png", max_panels=2))
+        assert not any(p.exists() for p in tmp_path.iterdir() if p.suffix == ".png")
+        done = queue.flush()
+
+    assert sorted(p.name for p in done) == ["AAA.png", "BBB.png", "CCC.png", "universe.png"]
+    assert all(p.stat().st_size > 0 for p in done)
+
+
+def test_universe_job_takes_one_column_per_ticker(tmp_path):
+    jobs = _jobs(tmp_path, ["CCC", "AAA", "BBB"])
+    job = universe_plot_job(jobs, tmp_path / "u.png", column="park_20", max_panels=2)
+
+    assert list(job.panels) == ["AAA", "BBB"]
+    assert all(s.name == "park_20" for s in job.panels.values())
+    assert "2 of 3 tickers" in job.title
+
+
+def test_universe_mode_renders_ticker_and_universe_charts(tmp_path, monkeypatch):
+    tickers = ["AAA", "BBB"]
+    cache = OHLCCache(tmp_path / "cache")
+    for i, t in enumerate(tickers):
+        cache.write(t, "1d", synthetic_ohlc(400, seed=i), "2015-01-01", "2017-01-01")
+    (tmp_path / "universe.txt").write_text("\n".join(tickers) + "\n")
+
+    monkeypatch.chdir(tmp_path)
+    cli.main([
+        "--universe", "universe.txt", "--start", "2015-01-01", "--end", "2017-01-01", "--windows", "20",
+        "--cache_dir", "cache", "--offline", "--make_plot", "--defer_plots", "--plot_workers", "0", "--jobs", "2",
+    ])
+
+    reports = tmp_path / "reports"
+    for t in tickers:
+        assert (reports / t / "vol_plot.png").stat().st_size > 0
+    assert (reports / "universe_vol_plot.png").stat().st_size > 0
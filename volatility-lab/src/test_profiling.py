@@ -0,0 +1,61 @@
+import json
+import pstats
+
+import numpy as np
+
+from src import cli
+from src.data_loader import OHLCCache
+from src.profiling import STAGE_COLUMNS, PipelineProfiler
+from src.synthetic import synthetic_event_dates, synthetic_ohlc
+
+
+def test_stage_records_time_memory_and_fire_hooks(tmp_path):
+    seen = []
+    prof = PipelineProfiler(memory=True, cprofile_dir=tmp_path / "prof", hooks=[seen.append])
+
+    with prof.stage("outer", "SPY"):
+        with prof.stage("inner", "SPY"):
+            big = np.ones(2_000_000)  # ~15 MiB
+        del big
+
+    inner, outer = prof.records
+    assert [r["stage"] for r in seen] == ["inner", "outer"]
+    assert set(outer) == set(STAGE_COLUMNS)
+    assert (inner["depth"], outer["depth"]) == (1, 0)
+    assert inner["peak_mb"] > 14
+    # the parent's peak includes what its child allocated
+    assert outer["peak_mb"] >= inner["peak_mb"]
+    assert outer["wall_s"] >= inner["wall_s"] > 0
+
+    # only top-level stages are dumped, readable by pstats; a repeated stage gets its own file
+    with prof.stage("outer", "SPY"):
+        pass
+    assert sorted(p.name for p in (tmp_path / "prof").iterdir()) == ["SPY_outer_1.prof", "SPY_outer_2.prof"]
+    pstats.Stats(str(tmp_path / "prof" / "SPY_outer_1.prof"))
+
+
+def test_cli_profile_writes_timing_report(tmp_path, monkeypatch):
+    df = synthetic_ohlc(n_bars=500)
+    OHLCCache(tmp_path / "cache").write("SPY", "1d", df, "2015-01-01", "2017-01-01")
+    events = synthetic_event_dates(df.index, every=60)
+    (tmp_path / "events.csv").write_text("date\n" + "\n".join(events.strftime("%Y-%m-%d")) + "\n")
+
+    monkeypatch.chdir(tmp_path)
+    seen = []
+    cli.main(
+        [
+            "--ticker", "SPY", "--start", "2015-01-01", "--end", "2017-01-01",
+            "--events", "events.csv", "--cache_dir", "cache", "--offline", "--profile",
+        ],
+        hooks=[seen.append],
+    )
+
+    report = json.loads((tmp_path / "reports" / "timing_report.json").read_text())
+    stages = [r["stage"] for r in report["stages"]]
+    assert stages == ["load_ohlc", "build_vol_panel", "write_vol_panel", "event_study", "write_event_reports"]
+    assert all(r["ticker"] == "SPY" for r in report["stages"])
+    assert {t["stage"] for t in report["totals"]} == set(stages)
+    assert [r["stage"] for r in seen] == stages
+    # timings are taken without tracemalloc unless --profile_memory asks for it
+    assert report["meta"]["memory_traced"] is False
+    assert all(r["peak_mb"] is None for r in report["stages"])
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import cli
+from src.quality import QUALITY_CHECKS, quality_flags, quality_summary, validate_ohlc
+from src.reports import read_report
+from src.volatility import fused_vol_panel
+
+
+def _corrupt(df: pd.DataFrame) -> pd.DataFrame:
+    bad = df.copy()
+    bad.iloc[10, [1, 2]] = bad.iloc[10, [2, 1]].to_numpy()  # High/Low swapped
+    bad.iloc[20, 3] = bad.iloc[20, 1] * 1.01  # Close above High
+    bad.iloc[30] = bad.iloc[29]  # stale repeat
+    bad.iloc[40, 2] = 0.0  # zero Low: -inf log
+    bad.iloc[50, 1] = np.nan
+    bad.iloc[60, 1] *= 2.0  # bad-tick High
+    bad.iloc[:300, :4] *= 2.0  # unadjusted 2:1 split in OHLC at bar 300
+    bad.iloc[:300, 5] /= 2.0
+    return bad
+
+
+def test_flags_pin_every_check(ohlc):
+    assert not quality_flags(ohlc).any()
+
+    bad = _corrupt(ohlc)
+    bad.iloc[400:, :5] *= 0.5  # every price halves: a jump, not a split
+    flags = quality_flags(bad)
+    result = validate_ohlc(bad)[1]
+
+    labels = result.bars()["flags"]
+    assert labels.to_dict() == {
+        ohlc.index[10]: "high_low",
+        ohlc.index[20]: "out_of_range",
+        ohlc.index[30]: "stale",
+        ohlc.index[40]: "nonpositive",
+        ohlc.index[50]: "nonfinite|out_of_range",
+        ohlc.index[60]: "spike",
+        ohlc.index[300]: "split",
+        ohlc.index[400]: "jump",
+    }
+    assert np.count_nonzero(flags) == result.n_flagged == 8
+
+    row = quality_summary({"AAA": result}).iloc[0]
+    assert row["bars"] == len(ohlc) and row["flagged"] == 8
+    assert row[list(QUALITY_CHECKS)].to_dict() == {
+        "nonfinite": 1, "nonpositive": 1, "high_low": 1, "out_of_range": 2,
+        "stale": 1, "split": 1, "jump": 1, "spike": 1,
+    }
+    assert row["first_flagged"] == ohlc.index[10] and row["last_flagged"] == ohlc.index[400]
+
+
+def test_modes_mask_drop_and_repair(ohlc):
+    bad = _corrupt(ohlc)
+    broken = ohlc.index[[10, 20, 30, 40, 50]]
+
+    masked, result = validate_ohlc(bad, mode="mask")
+    assert masked.index.equals(ohlc.index) and result.n_removed == 5
+    assert masked.loc[broken, ["Open", "High", "Low", "Close", "Adj Close"]].isna().all().all()
+
+    dropped, _ = validate_ohlc(bad, mode="drop")
+    assert dropped.index.equals(ohlc.index.drop(broken))
+    assert np.isfinite(fused_vol_panel(dropped, windows=[20]).iloc[21:].to_numpy()).all()
+
+    repaired, result = validate_ohlc(bad, mode="repair")
+    # reordered High/Low, split undone; the bars with nothing to rebuild from are gone
+    assert repaired.index.equals(ohlc.index.drop(ohlc.index[[30, 40, 50]]))
+    assert result.n_removed == 3 and result.n_repaired == 297
+    keep = ohlc.index.drop(ohlc.index[[20, 30, 40, 50, 60]])
+    pd.testing.assert_frame_equal(repaired.loc[keep], ohlc.loc[keep], rtol=1e-12)
+    fixed = repaired.loc[ohlc.index[20]]
+    assert fixed["High"] == fixed["Close"] and fixed["Low"] <= min(fixed["Open"], fixed["Close"])
+
+    with pytest.raises(ValueError):
+        validate_ohlc(bad, mode="off")
+
+
+def test_cli_repairs_before_the_estimators_and_writes_reports(ohlc, tmp_path, monkeypatch):
+    bad = ohlc.copy()
+    bad.iloc[100, [1, 2]] = bad.iloc[100, [2, 1]].to_numpy()
+    bad.iloc[:300, :4] *= 3.0
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli, "load_ohlc_data", lambda *a, **k: bad)
+    # opt-in: a default run neither checks nor writes quality reports
+    cli.main(["--ticker", "AAA", "--start", "2015-01-01", "--windows", "20"])
+    assert not (tmp_path / "reports" / "data_quality_summary.csv").exists()
+
+    cli.main(["--ticker", "AAA", "--start", "2015-01-01", "--windows", "20", "--quality", "repair"])
+
+    reports = tmp_path / "reports"
+    summary = pd.read_csv(reports / "data_quality_summary.csv")
+    assert summary[["ticker", "flagged", "high_low", "split", "repaired"]].iloc[0].tolist() == ["AAA", 2, 1, 1, 300]
+    assert list(pd.read_csv(reports / "data_quality.csv")["flags"]) == ["high_low", "split"]
+
+    panel = read_report(reports / "vol_panel.csv", index_col="Date")
+    expected = fused_vol_panel(ohlc, windows=[20])
+    np.testing.assert_allclose(panel.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+    # a clean reload clears the list of bad bars
+    monkeypatch.setattr(cli, "load_ohlc_data", lambda *a, **k: ohlc)
+    cli.main(["--ticker", "AAA", "--start", "2015-01-01", "--windows", "20", "--quality", "flag"])
+    assert not (reports / "data_quality.csv").exists()
+    assert pd.read_csv(reports / "data_quality_summary.csv")["flagged"].tolist() == [0]
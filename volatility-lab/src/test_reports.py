@@ -0,0 +1,71 @@
+import sys
+
+import pandas as pd
+import pytest
+
+from src import cli
+from src.cli import build_vol_panel
+from src.synthetic import synthetic_ohlc
+from src.data_loader import OHLCCache
+from src.reports import read_report, write_partitioned, write_report
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_vol_panel_round_trips_through_every_format(tmp_path, ohlc, fmt):
+    panel = build_vol_panel(ohlc, windows=[20, 60])
+    path = write_report(panel, tmp_path, "vol_panel", fmt, index=True)
+    assert path.suffix == f".{fmt}"
+
+    back = read_report(path, index_col="Date")
+    pd.testing.assert_frame_equal(back, panel, check_freq=False, check_index_type=False, rtol=1e-15)
+
+
+def test_binary_formats_honour_compression(tmp_path, ohlc):
+    panel = build_vol_panel(ohlc, windows=[20, 60, 120])
+    plain = write_report(panel, tmp_path, "plain", "parquet", "none", index=True)
+    packed = write_report(panel, tmp_path, "packed", "parquet", "zstd", index=True)
+    assert packed.stat().st_size < plain.stat().st_size
+    pd.testing.assert_frame_equal(read_report(packed), read_report(plain))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_partitioned_dataset_appends_tickers_and_replaces_reruns(tmp_path, fmt):
+    root = tmp_path / "vol_panel"
+    panels = {t: build_vol_panel(synthetic_ohlc(400, seed=i), windows=[20]) for i, t in enumerate(["SPY", "QQQ"])}
+    for t, panel in panels.items():
+        write_partitioned(panel, root, t, fmt, date_col="Date")
+    # re-running a ticker must not duplicate its rows
+    write_partitioned(panels["SPY"], root, "SPY", fmt, date_col="Date")
+
+    assert (root / "ticker=SPY" / "year=2015").is_dir()
+
+    both = read_report(root)
+    assert len(both) == sum(len(p) for p in panels.values())
+
+    spy = read_report(root, tickers=["SPY"]).sort_values("Date").set_index("Date")
+    pd.testing.assert_frame_equal(
+        spy.drop(columns="ticker"), panels["SPY"], check_freq=False, check_index_type=False, check_names=False
+    )
+
+
+def test_universe_run_writes_partitioned_parquet(tmp_path, monkeypatch):
+    cache = OHLCCache(tmp_path / "cache")
+    for i, t in enumerate(["AAA", "BBB"]):
+        cache.write(t, "1d", synthetic_ohlc(500, seed=i), "2015-01-01", "2017-01-01")
+    (tmp_path / "u.txt").write_text("AAA\nBBB\n")
+    pd.DataFrame({"date": ["2015-09-14", "2016-01-12", "2016-05-10"]}).to_csv(tmp_path / "ev.csv", index=False)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", [
+        "cli", "--universe", "u.txt", "--start", "2015-01-01", "--end", "2017-01-01",
+        "--events", "ev.csv", "--cache_dir", "cache", "--offline", "--jobs", "2",
+        "--output_format", "parquet", "--partitioned",
+    ])
+    cli.main()
+
+    reports = tmp_path / "reports"
+    panels = read_report(reports / "vol_panel")
+    assert set(panels["ticker"]) == {"AAA", "BBB"}
+    rows = read_report(reports / "event_rows", tickers=["BBB"])
+    assert set(rows["ticker"]) == {"BBB"}
+    assert not read_report(reports / "estimator_ranking.parquet").empty
@@ -0,0 +1,58 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.panel_cache import PanelCache
+from src.service import create_app
+from src.synthetic import synthetic_ohlc
+from src.test_panel_cache import FakeSource
+
+
+@pytest.fixture
+def client_and_source(tmp_path):
+    source = FakeSource({"AAA": synthetic_ohlc(400)}, visible=380)
+    app = create_app(PanelCache(source, start="2015-01-01", windows=[20]), events_dir=tmp_path / "events")
+    return TestClient(app), source
+
+
+def test_latest_slice_and_refresh(client_and_source):
+    client, source = client_and_source
+
+    latest = client.get("/latest/aaa", params={"columns": "c2c_20,gk_20"}).json()
+    assert set(latest["values"]) == {"c2c_20", "gk_20"}
+
+    sliced = client.get("/panel/AAA", params={"columns": "park_20", "tail": 5}).json()
+    assert len(sliced["data"]) == 5 and sliced["index"][-1] == latest["time"]
+
+    source.visible = 400
+    assert client.post("/refresh/AAA").json()["new_bars"] == 20
+    assert client.get("/latest/AAA").json()["time"] > latest["time"]
+
+    assert client.get("/latest/ZZZ").status_code == 404
+    assert client.get("/latest/AAA", params={"columns": "nope"}).status_code == 400
+
+
+def test_event_study_endpoint(client_and_source):
+    client, _ = client_and_source
+    dates = ",".join(synthetic_ohlc(400).index[100::80].strftime("%Y-%m-%d"))
+
+    summary = client.get("/events/AAA", params={"dates": dates, "pre": 10, "post": 10}).json()["summary"]
+
+    assert {row["metric"] for row in summary} == {"c2c_20", "park_20", "gk_20", "rs_20"}
+    assert all(row["n_events"] > 0 for row in summary)
+
+
+def test_event_file_stays_inside_the_events_dir(client_and_source, tmp_path):
+    client, _ = client_and_source
+    (tmp_path / "events").mkdir()
+    dates = synthetic_ohlc(400).index[100::80].strftime("%Y-%m-%d")
+    (tmp_path / "events" / "fomc.csv").write_text("date\n" + "\n".join(dates) + "\n")
+    (tmp_path / "secret.csv").write_text("date\n2016-01-04\n")
+
+    ok = client.get("/events/AAA", params={"event_file": "fomc.csv", "pre": 10, "post": 10})
+    assert ok.status_code == 200 and ok.json()["summary"][0]["n_events"] > 0
+
+    for name in ["../secret.csv", str(tmp_path / "secret.csv")]:
+        assert client.get("/events/AAA", params={"event_file": name}).status_code == 400
+
+    closed = TestClient(create_app(PanelCache(FakeSource({}, visible=0), start="2015-01-01", windows=[20])))
+    assert closed.get("/events/AAA", params={"event_file": "fomc.csv"}).status_code == 400
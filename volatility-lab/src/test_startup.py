@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+
+# heavy optional dependencies that only plotting / downloading may load
+DEFERRED = ("matplotlib", "yfinance")
+
+# generous: the repo's own modules self-time a few ms; this only trips on real regressions
+SRC_IMPORT_BUDGET_S = 0.25
+
+
+def _importtime(code: str) -> dict[str, tuple[int, int]]:
+    """
+    Run code under python -X importtime; module -> (self us, cumulative us).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO, capture_output=True, text=True, check=True,
+    )
+    out = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        out[name.strip()] = (int(self_us), int(cum_us))
+    return out
+
+
+def test_cli_import_skips_plotting_and_download_stacks():
+    modules = _importtime("import src.cli, src.data_loader, src.event_study")
+
+    assert "src.cli" in modules
+    loaded = {name.split(".")[0] for name in modules}
+    assert not loaded & set(DEFERRED)
+
+    own = sum(self_us for name, (self_us, _) in modules.items() if name.startswith("src"))
+    assert own / 1e6 < SRC_IMPORT_BUDGET_S
+
+
+def test_plotting_renders_without_pyplot(tmp_path):
+    out = tmp_path / "vol_plot.png"
+    code = (
+        "import sys\n"
+        "from src import cli\n"
+        "from src.synthetic import synthetic_ohlc\n"
+        "panel = cli.build_vol_panel(synthetic_ohlc(300), windows=[20])\n"
+        f"cli.save_plot(panel, 'SPY', {str(out)!r}, plot_cols=['c2c_20', 'park_20'])\n"
+        "assert 'matplotlib.pyplot' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=REPO, check=True)
+    assert out.stat().st_size > 0
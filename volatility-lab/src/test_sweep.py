@@ -0,0 +1,38 @@
+import pandas as pd
+
+from src.cli import build_vol_panel
+from src.event_study import panel_event_study
+from src.sweep import sweep_event_study
+
+
+def test_sweep_matches_individual_runs(ohlc):
+    events = pd.date_range("2015-06-01", "2017-03-01", freq="MS")
+    pres, posts, windows = [5, 20], [10, 20, 40], [20, 60]
+
+    results = sweep_event_study(ohlc, events, pres=pres, posts=posts, windows=windows, event_name="CPI")
+    assert len(results) == len(pres) * len(posts) * len(windows) * 4
+    assert set(results["estimator"]) == {"c2c", "park", "gk", "rs"}
+
+    panel = build_vol_panel(ohlc, windows=windows)
+    for pre in pres:
+        for post in posts:
+            _, expected = panel_event_study(panel, events, pre=pre, post=post, event_name="CPI",
+                                            metrics=[c for c in panel.columns if c != "log_return"])
+            got = results[(results["pre"] == pre) & (results["post"] == post)]
+            got = got.set_index("metric").loc[expected["metric"]]
+            pd.testing.assert_series_equal(
+                got["avg_pct_change"].reset_index(drop=True),
+                expected["avg_pct_change"],
+                check_exact=False, rtol=1e-12,
+            )
+            assert (got["n_events"].to_numpy() == expected["n_events"].to_numpy()).all()
+
+
+def test_sweep_ranks_estimators_within_each_configuration(ohlc):
+    events = pd.date_range("2015-06-01", "2017-03-01", freq="MS")
+    results = sweep_event_study(ohlc, events, pres=[20], posts=[20], windows=[20, 60])
+
+    for _, group in results.groupby("window"):
+        assert sorted(group["rank"].tolist()) == [1, 2, 3, 4]
+        best = group.loc[group["rank"] == 1, "avg_pct_change"].iloc[0]
+        assert best == group["avg_pct_change"].max()
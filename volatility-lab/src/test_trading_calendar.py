@@ -0,0 +1,74 @@
+import datetime as dt
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.event_study import PanelEvents, match_event_to_trading_day
+from src.trading_calendar import EventDates, TradingCalendar, to_days
+
+
+def test_weekend_and_holiday_events_roll_forward_vectorially():
+    # NYSE-ish week around July 4th 2024 (a Thursday)
+    cal = TradingCalendar.from_holidays("2024-07-01", "2024-07-13", holidays=["2024-07-04"])
+    events = EventDates(["2024-07-03", "2024-07-04", "2024-07-06", "2024-07-07", "2024-07-20", "2024-06-20"])
+
+    pos = cal.locate(events.days)
+
+    assert pos.dtype == np.int64
+    assert list(cal.session_dates(pos[:4])) == [
+        dt.date(2024, 7, 3), dt.date(2024, 7, 5), dt.date(2024, 7, 8), dt.date(2024, 7, 8)
+    ]
+    assert pos[4] == len(cal)  # past the calendar
+    assert pos[5] == 0
+    assert list(cal.rolled(events.days)) == [False, True, True, True, True, True]
+
+
+def test_matches_per_event_reference(ohlc):
+    index = ohlc.index
+    cal = TradingCalendar.for_index(index)
+    events = pd.date_range("2014-12-25", "2017-06-01", freq="5D")
+
+    pos = cal.locate(to_days(events))
+    for d, p in zip(events, pos):
+        ref = match_event_to_trading_day(index, d)
+        if ref is None:
+            assert p == len(index)
+        else:
+            assert index[p] == ref
+
+
+def test_calendars_and_positions_are_shared(ohlc):
+    other = ohlc.copy()  # a second ticker on the same sessions
+    a = TradingCalendar.for_index(ohlc.index)
+    b = TradingCalendar.for_index(other.index)
+    assert a is b
+
+    days = to_days(pd.DatetimeIndex(["2015-03-01", "2015-06-01"]))
+    assert a.locate(days) is b.locate(days.copy())
+
+    # metrics of one panel reuse the panel calendar's positions
+    study = PanelEvents(ohlc[["Close", "Open"]], pd.DatetimeIndex(["2015-03-01"]))
+    assert study.calendar is a
+
+
+def test_intraday_tz_bars_use_the_local_session_date():
+    idx = pd.date_range("2024-03-04 09:30", periods=3 * 78, freq="5min", tz="America/New_York")
+    idx = idx[(idx.hour < 16)]
+    cal = TradingCalendar.for_index(idx)
+
+    pos = cal.locate(to_days(pd.DatetimeIndex(["2024-03-05"])))
+    assert idx[pos[0]] == idx[idx.normalize() == pd.Timestamp("2024-03-05", tz="America/New_York")][0]
+
+
+def test_event_file_is_parsed_once_until_it_changes(tmp_path):
+    path = tmp_path / "events.csv"
+    path.write_text("date\n2024-01-11\n2024-02-13\nnot-a-date\n")
+
+    first = EventDates.from_csv(str(path))
+    assert EventDates.from_csv(path) is first
+    assert list(first.dates.strftime("%Y-%m-%d")) == ["2024-01-11", "2024-02-13"]
+
+    path.write_text("date\n2024-03-12\n")
+    os.utime(path, ns=(0, 10**18))
+    assert list(EventDates.from_csv(path).dates.strftime("%Y-%m-%d")) == ["2024-03-12"]
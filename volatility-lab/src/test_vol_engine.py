@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cli import build_vol_panel
+from src.volatility import (
+    PrefixSums,
+    RollingMoments,
+    bars_per_year,
+    chunked_vol_panel,
+    close_to_close_volatility,
+    fused_vol_panel,
+    garman_klass_volatility,
+    parkinson_volatility,
+    rogers_satchell_volatility,
+    rolling_mean_multi,
+    rolling_std_multi,
+)
+
+
+def _reference_panel(df: pd.DataFrame, windows: list[int]) -> pd.DataFrame:
+    c2c = close_to_close_volatility(df, price_col="Adj Close", windows=windows)
+    park = parkinson_volatility(df, windows=windows)
+    gk = garman_klass_volatility(df, windows=windows)
+    rs = rogers_satchell_volatility(df, windows=windows)
+    return c2c.join(park).join(gk).join(rs)
+
+
+def test_fused_panel_matches_per_estimator_functions(ohlc):
+    windows = [5, 20, 60, 120]
+    expected = _reference_panel(ohlc, windows)
+    got = fused_vol_panel(ohlc, windows=windows)
+
+    assert list(got.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(got, expected, check_exact=False, rtol=1e-10, atol=1e-14)
+
+
+def test_build_vol_panel_uses_fused_layout(ohlc):
+    panel = build_vol_panel(ohlc, windows=(20, 60))
+    assert list(panel.columns) == [
+        "log_return",
+        "c2c_20", "c2c_60",
+        "park_20", "park_60",
+        "gk_20", "gk_60",
+        "rs_20", "rs_60",
+    ]
+    assert panel.index.equals(ohlc.index[1:])
+
+
+def test_fused_panel_handles_nan_prices_and_short_history(ohlc):
+    df = ohlc.copy()
+    df.iloc[50, df.columns.get_loc("Adj Close")] = np.nan
+    df.iloc[80, df.columns.get_loc("High")] = np.nan
+
+    windows = [20, 60]
+    pd.testing.assert_frame_equal(
+        fused_vol_panel(df, windows=windows),
+        _reference_panel(df, windows),
+        check_exact=False, rtol=1e-10, atol=1e-14,
+    )
+
+    short = fused_vol_panel(ohlc.iloc[:10], windows=[20])
+    assert short["c2c_20"].isna().all()
+    assert short["park_20"].isna().all()
+
+
+def test_rolling_kernels_match_pandas_over_window_grid(ohlc):
+    windows = list(range(5, 251, 15))
+    r = np.log(ohlc["Adj Close"]).diff().dropna()
+    var = (np.log(ohlc["High"] / ohlc["Low"]) ** 2) / (4.0 * np.log(2.0))
+
+    stds = rolling_std_multi(r.to_numpy(), windows)
+    means = rolling_mean_multi(var.to_numpy(), windows)
+
+    for j, w in enumerate(windows):
+        np.testing.assert_allclose(stds[:, j], r.rolling(w).std(ddof=1).to_numpy(), rtol=1e-9, atol=1e-15)
+        np.testing.assert_allclose(means[:, j], var.rolling(w).mean().to_numpy(), rtol=1e-9, atol=1e-15)
+
+
+def test_rolling_kernels_stay_accurate_on_long_offset_series():
+    rng = np.random.default_rng(3)
+    n, w = 200_000, 50
+    x = 1e4 + rng.normal(0.0, 1e-3, n)
+
+    view = np.lib.stride_tricks.sliding_window_view(x, w)
+    exact_mean = view.mean(axis=-1)
+    exact_std = view.std(axis=-1, ddof=1)
+
+    np.testing.assert_allclose(PrefixSums(x).rolling_mean(w)[w - 1:], exact_mean, rtol=1e-14)
+    np.testing.assert_allclose(RollingMoments(x).rolling_std(w)[w - 1:], exact_std, rtol=1e-7)
+
+
+def test_prefix_sums_poison_only_windows_with_bad_values():
+    x = np.arange(10, dtype=float)
+    x[4] = np.nan
+    x[7] = np.inf
+    got = PrefixSums(x).rolling_mean(2)
+    expected = pd.Series(np.where(np.isinf(x), np.nan, x)).rolling(2).mean().to_numpy()
+    np.testing.assert_array_equal(np.isnan(got), np.isnan(expected))
+    np.testing.assert_allclose(got[~np.isnan(got)], expected[~np.isnan(expected)])
+
+
+def test_bars_per_year_for_intraday_and_daily_intervals():
+    assert bars_per_year("1d") == 252
+    assert bars_per_year("5m") == 78 * 252
+    # last (partial) hourly bar of a 6.5h session still counts
+    assert bars_per_year("1h") == 7 * 252
+    assert bars_per_year("1m", session_hours=24, trading_days=365) == 1440 * 365
+    assert bars_per_year("1wk") == 52
+    with pytest.raises(ValueError):
+        bars_per_year("7x")
+
+
+def test_periods_per_year_scales_every_estimator(ohlc):
+    daily = fused_vol_panel(ohlc, windows=[20])
+    intraday = fused_vol_panel(ohlc, windows=[20], periods_per_year=bars_per_year("5m"))
+    ratio = np.sqrt(bars_per_year("5m") / 252)
+
+    cols = ["c2c_20", "park_20", "gk_20", "rs_20"]
+    pd.testing.assert_frame_equal(intraday[cols], daily[cols] * ratio, rtol=1e-12)
+    pd.testing.assert_series_equal(
+        parkinson_volatility(ohlc, windows=[20], periods_per_year=bars_per_year("5m"))["park_20"].iloc[1:],
+        intraday["park_20"],
+        rtol=1e-10,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [50, 128, 333])
+def test_chunked_panel_matches_monolithic(ohlc, chunk_size):
+    df = ohlc.copy()
+    # NaN prices right around chunk borders force a longer look-back for c2c
+    for pos in (127, 128, 129, 300):
+        df.iloc[pos, df.columns.get_loc("Adj Close")] = np.nan
+    df.iloc[260, df.columns.get_loc("Low")] = np.nan
+
+    windows = [5, 20, 60]
+    full = fused_vol_panel(df, windows=windows)
+
+    chunked = chunked_vol_panel(df, windows=windows, chunk_size=chunk_size, compact=False)
+    pd.testing.assert_frame_equal(chunked, full, check_exact=False, rtol=1e-10, atol=1e-14)
+
+    compact = chunked_vol_panel(df, windows=windows, chunk_size=chunk_size, compact=True)
+    assert "log_return" not in compact.columns
+    assert (compact.dtypes == np.float32).all()
+    pd.testing.assert_frame_equal(
+        compact, full.drop(columns="log_return").astype(np.float32), check_exact=False, rtol=1e-6
+    )
+
+
+def test_compact_panel_halves_memory(ohlc):
+    windows = [20, 60, 120]
+    full = build_vol_panel(ohlc, windows=windows)
+    compact = build_vol_panel(ohlc, windows=windows, compact=True)
+    assert compact.memory_usage(index=False).sum() * 2 < full.memory_usage(index=False).sum()
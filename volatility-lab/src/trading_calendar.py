@@ -0,0 +1,147 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# calendars / event-position arrays kept per process; oldest dropped beyond this
+MAX_CACHED = 64
+
+
+def _bounded_put(cache: dict, key, value, limit: int = MAX_CACHED):
+    if len(cache) >= limit:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+    return value
+
+
+def to_days(dates) -> np.ndarray:
+    """
+    Calendar day numbers (int64 days since 1970-01-01) of timestamps, on their local wall clock.
+
+    tz-aware timestamps keep their local date (an 09:30 New York bar is that
+    day, not the UTC one); NaT maps to the int64 minimum.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def days_to_dates(days: np.ndarray) -> np.ndarray:
+    """
+    int64 day numbers back to datetime.date objects (the event-row date format).
+    """
+    return np.asarray(days, dtype=np.int64).astype("datetime64[D]").astype(object)
+
+
+class TradingCalendar:
+    """
+    Session days of a bar index as a sorted int64 array, built once and shared.
+
+    Event matching is one vectorized searchsorted: an event maps to the first
+    bar on or after its day, so weekend and holiday events roll forward to
+    the next session (and intraday events to the session's first bar). The
+    resulting int64 positions are cached per event set, so every metric and
+    every ticker on the same calendar reuses them.
+
+    Use TradingCalendar.for_index() to share one object between identical
+    indexes (e.g. tickers on the same exchange).
+    """
+
+    __slots__ = ("days", "_positions")
+
+    _by_index: dict = {}
+
+    def __init__(self, days: np.ndarray):
+        self.days = np.asarray(days, dtype=np.int64)
+        self._positions: dict = {}
+
+    @classmethod
+    def for_index(cls, index: pd.DatetimeIndex) -> "TradingCalendar":
+        """
+        Calendar of a bar index, cached on its session days.
+        """
+        days = to_days(index)
+        key = (len(days), days.tobytes())
+        cal = cls._by_index.get(key)
+        if cal is None:
+            cal = _bounded_put(cls._by_index, key, cls(days))
+        return cal
+
+    @classmethod
+    def from_holidays(
+        cls, start: str, end: str, holidays: list | None = None, weekmask: str = "1111100"
+    ) -> "TradingCalendar":
+        """
+        Exchange-style calendar: every weekmask day in [start, end) except the holidays.
+        """
+        days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D"))
+        hol = np.asarray(pd.DatetimeIndex(holidays or []).to_numpy(), dtype="datetime64[D]")
+        days = days[np.is_busday(days, weekmask=weekmask, holidays=hol)]
+        return cls(days.astype(np.int64))
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def locate(self, event_days: np.ndarray) -> np.ndarray:
+        """
+        Bar position of the first session on/after each event day (len(self) when past the end).
+
+        Cached per distinct event set; the returned array is shared, don't modify it.
+        """
+        event_days = np.asarray(event_days, dtype=np.int64)
+        key = event_days.tobytes()
+        pos = self._positions.get(key)
+        if pos is None:
+            pos = self.days.searchsorted(event_days, side="left").astype(np.int64)
+            pos.flags.writeable = False
+            _bounded_put(self._positions, key, pos)
+        return pos
+
+    def rolled(self, event_days: np.ndarray) -> np.ndarray:
+        """
+        True for events that are not session days themselves (weekends, holidays, gaps).
+        """
+        pos = self.locate(event_days)
+        hit = np.zeros(len(pos), dtype=bool)
+        inside = pos < len(self.days)
+        hit[inside] = self.days[pos[inside]] == np.asarray(event_days)[inside]
+        return ~hit
+
+    def session_dates(self, positions: np.ndarray) -> np.ndarray:
+        return days_to_dates(self.days[positions])
+
+
+class EventDates:
+    """
+    An event file (or list of dates) parsed once: dates in file order plus their day numbers.
+    """
+
+    __slots__ = ("dates", "days")
+
+    _by_file: dict = {}
+
+    def __init__(self, dates):
+        dates = pd.DatetimeIndex(dates)
+        self.dates = dates
+        self.days = to_days(dates)
+
+    @classmethod
+    def from_csv(cls, csv_path: str) -> "EventDates":
+        """
+        Parse a CSV with a 'date' column; repeated calls for an unchanged file reuse the result.
+        """
+        path = Path(csv_path).resolve()
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        ev = cls._by_file.get(key)
+        if ev is None:
+            df = pd.read_csv(path)
+            if "date" not in df.columns:
+                raise ValueError("CSV must have a 'date' column")
+            dates = pd.to_datetime(df["date"], errors="coerce").dropna()
+            ev = _bounded_put(cls._by_file, key, cls(pd.DatetimeIndex(dates).normalize()))
+        return ev
+
+    def __len__(self) -> int:
+        return len(self.days)
@@ -1,8 +1,18 @@
+import math
+import re
+from typing import Iterator
+
 import numpy as np
 import pandas as pd
 
 TRADING_DAYS = 252
 
+# regular US equity session; pass session_hours=24 (and trading_days=365) for crypto
+SESSION_HOURS = 6.5
+
+_INTERVAL_MINUTES = {"m": 1, "h": 60}
+_INTERVAL_PER_YEAR = {"1wk": 52, "1mo": 12, "3mo": 4}
+
 
 def compute_log_returns(price_series: pd.Series) -> pd.Series:
     """
@@ -11,17 +21,233 @@ def compute_log_returns(price_series: pd.Series) -> pd.Series:
     return np.log(price_series / price_series.shift(1)).dropna()
 
 
-def annualize_vol(daily_vol: pd.Series | float) -> pd.Series | float:
+def bars_per_year(interval: str = "1d", session_hours: float = SESSION_HOURS, trading_days: float = TRADING_DAYS) -> float:
+    """
+    Annualization factor for a bar interval (yfinance spelling: 1m, 5m, 1h, 1d, 1wk, ...).
+
+    Intraday bars per session are ceil(session minutes / bar minutes), since
+    the last bar of a session is kept even when it is partial.
+    """
+    if interval == "1d":
+        return float(trading_days)
+    if interval == "5d":
+        return trading_days / 5.0
+    if interval in _INTERVAL_PER_YEAR:
+        return float(_INTERVAL_PER_YEAR[interval])
+
+    m = re.fullmatch(r"(\d+)([mh])", interval)
+    if not m:
+        raise ValueError(f"Unsupported interval: {interval}")
+    minutes = int(m.group(1)) * _INTERVAL_MINUTES[m.group(2)]
+    return math.ceil(session_hours * 60.0 / minutes) * float(trading_days)
+
+
+def periods_per_year_from_args(args) -> float:
+    """
+    bars_per_year for parsed CLI args carrying interval, session_hours and trading_days.
+    """
+    return bars_per_year(args.interval, session_hours=args.session_hours, trading_days=args.trading_days)
+
+
+def parse_int_list(text: str) -> list[int]:
+    return [int(x.strip()) for x in text.split(",") if x.strip()]
+
+
+def annualize_vol(daily_vol: pd.Series | float, periods_per_year: float = TRADING_DAYS) -> pd.Series | float:
     """
-    Annualize daily volatility using sqrt(252).
+    Annualize per-bar volatility using sqrt(periods_per_year) (sqrt(252) for daily bars).
     """
-    return daily_vol * np.sqrt(TRADING_DAYS)
+    return daily_vol * np.sqrt(periods_per_year)
+
+
+# ---------------------------------------------------------------------------
+# Rolling kernels: prefix sums built once per series, every window in O(1)
+# ---------------------------------------------------------------------------
+
+def _compensated_cumsum(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Prefix sums down axis 0 as a (hi, lo) pair, with a leading row of zeros.
+
+    hi is the plain running sum; lo accumulates the exact rounding error of
+    every addition (TwoSum on the accumulate result), so hi + lo carries the
+    prefix sum to roughly twice the working precision, Kahan-style, without
+    a Python loop.
+    """
+    hi = np.zeros((len(values) + 1,) + values.shape[1:], dtype=np.float64)
+    lo = np.zeros_like(hi)
+    if len(values) == 0:
+        return hi, lo
+
+    np.cumsum(values, axis=0, out=hi[1:])
+
+    a = hi[1:-1]
+    b = values[1:]
+    s = hi[2:]
+    b_virtual = s - a
+    a_virtual = s - b_virtual
+    err = (a - a_virtual) + (b - b_virtual)
+    np.cumsum(err, axis=0, out=lo[2:])
+
+    return hi, lo
+
+
+class PrefixSums:
+    """
+    Compensated prefix sums of a 1-D series (or of each column of a 2-D array).
+
+    Built once in O(n); the sum or mean over any [start, stop) range is then
+    an O(1) difference, so any number of windows can be read off one build.
+    Non-finite inputs are counted separately: a range containing one yields
+    NaN, matching pandas' rolling behaviour with min_periods == window.
+    """
+
+    __slots__ = ("hi", "lo", "n_bad")
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        bad = ~np.isfinite(values)
+        if bad.any():
+            values = np.where(bad, 0.0, values)
+
+        self.hi, self.lo = _compensated_cumsum(values)
+        self.n_bad = np.zeros(self.hi.shape, dtype=np.int32)
+        np.cumsum(bad, axis=0, out=self.n_bad[1:])
+
+    def __len__(self) -> int:
+        return len(self.hi) - 1
+
+    def range_sum(self, start, stop) -> np.ndarray:
+        """
+        Sum over [start, stop) for scalar or array bounds; NaN where the range has bad values.
+        """
+        total = (self.hi[stop] - self.hi[start]) + (self.lo[stop] - self.lo[start])
+        return np.where(self.n_bad[stop] - self.n_bad[start] > 0, np.nan, total)
+
+    def column_range_sum(self, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+        """
+        For a 2-D build: sum over [start[..., j], stop[..., j]) within column j.
+
+        start/stop have the column axis last, so each column gets its own ranges.
+        """
+        cols = np.arange(self.hi.shape[1])
+        total = (self.hi[stop, cols] - self.hi[start, cols]) + (self.lo[stop, cols] - self.lo[start, cols])
+        return np.where(self.n_bad[stop, cols] - self.n_bad[start, cols] > 0, np.nan, total)
+
+    def range_mean(self, start, stop) -> np.ndarray:
+        """
+        Mean over [start, stop); NaN for empty ranges or ranges with bad values.
+        """
+        count = np.asarray(stop) - np.asarray(start)
+        if self.hi.ndim > 1:
+            count = count[..., np.newaxis]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.range_sum(start, stop) / count
+
+    def rolling_sum(self, window: int, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Trailing-window sums aligned like pandas .rolling(window).sum() (NaN until full).
+        """
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window}")
+        n = len(self)
+        if out is None:
+            out = np.empty((n,) + self.hi.shape[1:], dtype=np.float64)
+        out[:min(window - 1, n)] = np.nan
+        if window > n:
+            return out
+
+        hi, lo = self.hi, self.lo
+        body = out[window - 1:]
+        np.subtract(hi[window:], hi[:-window], out=body)
+        body += lo[window:] - lo[:-window]
+        if self.n_bad[-1].any():
+            body[self.n_bad[window:] - self.n_bad[:-window] > 0] = np.nan
+        return out
+
+    def rolling_mean(self, window: int, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Trailing-window means aligned like pandas .rolling(window).mean().
+        """
+        out = self.rolling_sum(window, out=out)
+        out /= window
+        return out
+
+
+def rolling_mean_multi(values: np.ndarray, windows: list[int]) -> np.ndarray:
+    """
+    Rolling means of a 1-D series for every window, from a single prefix-sum build.
+
+    Returns an array of shape (n, len(windows)).
+    """
+    prefix = PrefixSums(values)
+    # column-major so each window writes one contiguous column
+    out = np.empty((len(prefix), len(windows)), dtype=np.float64, order="F")
+    for j, w in enumerate(windows):
+        prefix.rolling_mean(int(w), out=out[:, j])
+    return out
+
+
+class RollingMoments:
+    """
+    Compensated prefix sums of x and x**2 for rolling variance over many windows.
+
+    The series is shifted by its mean before squaring, which removes most of
+    the cancellation in sum(x^2) - sum(x)^2 / w.
+    """
+
+    __slots__ = ("s1", "s2")
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        shift = values[finite].mean() if finite.any() else 0.0
+        centred = values - shift
+        self.s1 = PrefixSums(centred)
+        self.s2 = PrefixSums(centred * centred)
+
+    def __len__(self) -> int:
+        return len(self.s1)
+
+    def rolling_std(self, window: int, ddof: int = 1, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Trailing-window standard deviation aligned like pandas .rolling(window).std(ddof).
+        """
+        n = len(self)
+        if out is None:
+            out = np.empty(n, dtype=np.float64)
+        if window <= ddof:
+            out[:] = np.nan
+            return out
+
+        self.s1.rolling_sum(window, out=out)
+        sum_sq = self.s2.rolling_sum(window)
+        # out holds sum(x); turn it into the sample variance in place
+        np.multiply(out, out, out=out)
+        out /= -window
+        out += sum_sq
+        out /= window - ddof
+        np.maximum(out, 0.0, out=out)
+        return np.sqrt(out, out=out)
+
+
+def rolling_std_multi(values: np.ndarray, windows: list[int], ddof: int = 1) -> np.ndarray:
+    """
+    Rolling standard deviations of a 1-D series for every window, from one set of prefix sums.
+
+    Returns an array of shape (n, len(windows)).
+    """
+    moments = RollingMoments(values)
+    out = np.empty((len(moments), len(windows)), dtype=np.float64, order="F")
+    for j, w in enumerate(windows):
+        moments.rolling_std(int(w), ddof=ddof, out=out[:, j])
+    return out
 
 
 def close_to_close_volatility(
     df: pd.DataFrame,
     price_col: str = "Adj Close",
     windows: list[int] = [20, 60, 120],
+    periods_per_year: float = TRADING_DAYS,
 ) -> pd.DataFrame:
     """
     Close-to-close volatility using log returns on a chosen price column.
@@ -39,20 +265,39 @@ def close_to_close_volatility(
     out = pd.DataFrame(index=r.index)
     out["log_return"] = r
 
-    for w in windows:
-        out[f"c2c_{w}"] = annualize_vol(out["log_return"].rolling(w).std(ddof=1))
+    stds = rolling_std_multi(r.to_numpy(), windows, ddof=1)
+    for j, w in enumerate(windows):
+        out[f"c2c_{w}"] = annualize_vol(stds[:, j], periods_per_year)
 
     return out
 
-def _annualized_rolling_vol_from_daily_var(daily_var: pd.Series, window: int) -> pd.Series:
+def _annualized_rolling_vol_from_daily_var(
+    daily_var: pd.Series, window: int, periods_per_year: float = TRADING_DAYS
+) -> pd.Series:
     """
     Convert a daily variance series into an annualized rolling volatility series:
-      vol_t = sqrt(mean(var over window)) * sqrt(252)
+      vol_t = sqrt(mean(var over window)) * sqrt(periods_per_year)
     """
-    return np.sqrt(daily_var.rolling(window).mean()) * np.sqrt(TRADING_DAYS)
+    mean_var = PrefixSums(daily_var.to_numpy()).rolling_mean(window)
+    return pd.Series(np.sqrt(mean_var) * np.sqrt(periods_per_year), index=daily_var.index)
 
 
-def parkinson_volatility(df: pd.DataFrame, windows: list[int] = [20, 60, 120]) -> pd.DataFrame:
+def _annualized_rolling_vols_from_daily_var(
+    daily_var: pd.Series, prefix: str, windows: list[int], periods_per_year: float = TRADING_DAYS
+) -> pd.DataFrame:
+    """
+    Same as _annualized_rolling_vol_from_daily_var for every window, sharing one prefix-sum build.
+    """
+    mean_var = rolling_mean_multi(daily_var.to_numpy(), windows)
+    vols = np.sqrt(mean_var) * np.sqrt(periods_per_year)
+    return pd.DataFrame(vols, index=daily_var.index, columns=[f"{prefix}_{w}" for w in windows])
+
+
+def parkinson_volatility(
+    df: pd.DataFrame,
+    windows: list[int] = [20, 60, 120],
+    periods_per_year: float = TRADING_DAYS,
+) -> pd.DataFrame:
     """
     Parkinson volatility (uses High, Low).
     Returns annualized rolling vols: park_20, park_60, park_120
@@ -63,14 +308,14 @@ def parkinson_volatility(df: pd.DataFrame, windows: list[int] = [20, 60, 120]) -
     # daily variance estimate
     daily_var = (np.log(H / L) ** 2) / (4.0 * np.log(2.0))
 
-    out = pd.DataFrame(index=df.index)
-    for w in windows:
-        out[f"park_{w}"] = _annualized_rolling_vol_from_daily_var(daily_var, w)
-
-    return out
+    return _annualized_rolling_vols_from_daily_var(daily_var, "park", windows, periods_per_year)
 
 
-def garman_klass_volatility(df: pd.DataFrame, windows: list[int] = [20, 60, 120]) -> pd.DataFrame:
+def garman_klass_volatility(
+    df: pd.DataFrame,
+    windows: list[int] = [20, 60, 120],
+    periods_per_year: float = TRADING_DAYS,
+) -> pd.DataFrame:
     """
     Garman-Klass volatility (uses Open, High, Low, Close).
     Returns annualized rolling vols: gk_20, gk_60, gk_120
@@ -89,14 +334,14 @@ def garman_klass_volatility(df: pd.DataFrame, windows: list[int] = [20, 60, 120]
     # numerical safety: variance shouldn't be negative, clamp small negatives to 0
     daily_var = daily_var.clip(lower=0.0)
 
-    out = pd.DataFrame(index=df.index)
-    for w in windows:
-        out[f"gk_{w}"] = _annualized_rolling_vol_from_daily_var(daily_var, w)
-
-    return out
+    return _annualized_rolling_vols_from_daily_var(daily_var, "gk", windows, periods_per_year)
 
 
-def rogers_satchell_volatility(df: pd.DataFrame, windows: list[int] = [20, 60, 120]) -> pd.DataFrame:
+def rogers_satchell_volatility(
+    df: pd.DataFrame,
+    windows: list[int] = [20, 60, 120],
+    periods_per_year: float = TRADING_DAYS,
+) -> pd.DataFrame:
     """
     Rogers-Satchell volatility (drift-robust, uses Open, High, Low, Close).
     Returns annualized rolling vols: rs_20, rs_60, rs_120
@@ -117,8 +362,458 @@ def rogers_satchell_volatility(df: pd.DataFrame, windows: list[int] = [20, 60, 1
     # variance should be non-negative; clamp tiny negatives from floating error
     daily_var = daily_var.clip(lower=0.0)
 
+    return _annualized_rolling_vols_from_daily_var(daily_var, "rs", windows, periods_per_year)
+
+
+# ---------------------------------------------------------------------------
+# Fused engine: every estimator and every window from a single pass over OHLC
+# ---------------------------------------------------------------------------
+
+ESTIMATORS = ("c2c", "park", "gk", "rs")
+
+
+def bar_variance_terms(df: pd.DataFrame, price_col: str = "Adj Close") -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the per-bar inputs of every estimator in one vectorized pass.
+
+    Returns:
+      - log_return: array of length n (first element is NaN)
+      - daily_var:  (n, 3) array with the Parkinson, Garman-Klass and
+                    Rogers-Satchell daily variance terms (in that order)
+    """
+    if price_col not in df.columns:
+        raise ValueError(f"{price_col} not found in DataFrame columns: {df.columns.tolist()}")
+
+    ohlc = df[["Open", "High", "Low", "Close"]].to_numpy(dtype=np.float64)
+    price = df[price_col].to_numpy(dtype=np.float64)
+    n = len(ohlc)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_ohlc = np.log(ohlc)
+        log_price = np.log(price)
+
+    log_o, log_h, log_l, log_c = log_ohlc.T
+
+    log_return = np.empty(n, dtype=np.float64)
+    log_return[:1] = np.nan
+    np.subtract(log_price[1:], log_price[:-1], out=log_return[1:])
+
+    hl = log_h - log_l
+    co = log_c - log_o
+
+    daily_var = np.empty((n, 3), dtype=np.float64)
+    daily_var[:, 0] = (hl ** 2) / (4.0 * np.log(2.0))
+    daily_var[:, 1] = 0.5 * (hl ** 2) - (2.0 * np.log(2.0) - 1.0) * (co ** 2)
+    daily_var[:, 2] = (log_h - log_o) * (log_h - log_c) + (log_l - log_o) * (log_l - log_c)
+
+    # same numerical safety as the single-estimator functions (NaN stays NaN)
+    np.maximum(daily_var[:, 1:], 0.0, out=daily_var[:, 1:])
+
+    return log_return, daily_var
+
+
+def panel_columns(windows: list[int], include_returns: bool = True) -> list[str]:
+    cols = [f"{name}_{w}" for name in ESTIMATORS for w in windows]
+    return (["log_return"] + cols) if include_returns else cols
+
+
+def _fused_panel_values(
+    df: pd.DataFrame,
+    windows: list[int],
+    price_col: str,
+    periods_per_year: float,
+    dtype=np.float64,
+    include_returns: bool = True,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Engine core: (row positions in df, values array) for the panel columns.
+    """
+    log_return, daily_var = bar_variance_terms(df, price_col=price_col)
+
+    # the panel lives on the close-to-close index (first bar / NaN prices dropped)
+    keep = np.flatnonzero(~np.isnan(log_return))
+    returns = log_return[keep]
+
+    n_win = len(windows)
+    first = 1 if include_returns else 0
+    values = np.empty((len(keep), first + len(ESTIMATORS) * n_win), dtype=dtype, order="F")
+    if include_returns:
+        values[:, 0] = returns
+
+    # prefix sums are built once; every window below is an O(n) difference
+    moments = RollingMoments(returns)
+    var_sums = PrefixSums(daily_var)
+
+    scale = np.sqrt(periods_per_year)
+    # float64 scratch so a float32 output only rounds the final values
+    col = np.empty(len(returns), dtype=np.float64)
+    block = np.empty_like(daily_var)
+
+    for j, w in enumerate(windows):
+        moments.rolling_std(w, ddof=1, out=col)
+        col *= scale
+        values[:, first + j] = col
+
+        # range estimators roll over every bar, then land on the return index
+        var_sums.rolling_mean(w, out=block)
+        np.sqrt(block, out=block)
+        block *= scale
+        values[:, first + n_win + j + n_win * np.arange(daily_var.shape[1])] = block[keep]
+
+    return keep, values
+
+
+def fused_vol_panel(
+    df: pd.DataFrame,
+    windows: list[int] = [20, 60, 120],
+    price_col: str = "Adj Close",
+    periods_per_year: float = TRADING_DAYS,
+) -> pd.DataFrame:
+    """
+    All four estimators for all windows in one pass over the OHLC arrays.
+
+    Equivalent to joining close_to_close_volatility, parkinson_volatility,
+    garman_klass_volatility and rogers_satchell_volatility, with the same
+    index (the log-return index) and column layout:
+      log_return, c2c_<w>..., park_<w>..., gk_<w>..., rs_<w>...
+    """
+    windows = [int(w) for w in windows]
+    keep, values = _fused_panel_values(df, windows, price_col, periods_per_year)
+    return pd.DataFrame(values, index=df.index[keep], columns=panel_columns(windows))
+
+
+def _chunk_lookback_start(nan_price: np.ndarray, start: int, max_window: int) -> int:
+    """
+    Earliest bar a chunk starting at `start` needs so every window is already full there.
+
+    Range estimators need max_window - 1 earlier bars; close-to-close needs
+    max_window valid returns, which reaches further back across NaN prices.
+    """
+    back = max_window
+    while True:
+        lo = max(start - back, 0)
+        seg = nan_price[lo:start + 1]
+        n_valid = int(np.count_nonzero(~seg[1:] & ~seg[:-1]))
+        if lo == 0 or n_valid >= max_window:
+            return lo
+        back *= 2
+
+
+def iter_vol_panel_chunks(
+    df: pd.DataFrame,
+    windows: list[int] = [20, 60, 120],
+    chunk_size: int = 100_000,
+    price_col: str = "Adj Close",
+    periods_per_year: float = TRADING_DAYS,
+    dtype=np.float64,
+    include_returns: bool = True,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    fused_vol_panel over consecutive blocks of chunk_size bars, in bounded memory.
+
+    Each block is computed from its own bars plus the trailing bars every
+    window needs (see _chunk_lookback_start), so rolling state carries across
+    block borders and the rows match a monolithic run.
+
+    Yields (row positions in df, values) per block, rows in order.
+    """
+    windows = [int(w) for w in windows]
+    max_window = max(windows)
+    nan_price = np.isnan(df[price_col].to_numpy(dtype=np.float64))
+
+    for start in range(0, len(df), chunk_size):
+        stop = min(start + chunk_size, len(df))
+        lo = _chunk_lookback_start(nan_price, start, max_window)
+
+        keep, values = _fused_panel_values(
+            df.iloc[lo:stop], windows, price_col, periods_per_year, dtype=dtype, include_returns=include_returns
+        )
+        keep += lo
+        own = keep >= start
+        yield keep[own], values[own]
+
+
+def chunked_vol_panel(
+    df: pd.DataFrame,
+    windows: list[int] = [20, 60, 120],
+    chunk_size: int = 100_000,
+    price_col: str = "Adj Close",
+    periods_per_year: float = TRADING_DAYS,
+    compact: bool = True,
+) -> pd.DataFrame:
+    """
+    Memory-lean fused_vol_panel: chunked computation into one preallocated result.
+
+    compact=True stores float32 and drops the log_return column, which is
+    about 2x smaller than the default panel; peak working memory beyond the
+    result is bounded by chunk_size, not by the length of the history.
+    """
+    windows = [int(w) for w in windows]
+    dtype = np.float32 if compact else np.float64
+    columns = panel_columns(windows, include_returns=not compact)
+
+    # same row set as the engine's log-return index, known before any chunk runs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n_rows = int(np.count_nonzero(~np.isnan(np.diff(np.log(df[price_col].to_numpy(dtype=np.float64))))))
+
+    values = np.empty((n_rows, len(columns)), dtype=dtype, order="F")
+    positions = np.empty(n_rows, dtype=np.int64)
+
+    filled = 0
+    for keep, block in iter_vol_panel_chunks(
+        df, windows, chunk_size, price_col, periods_per_year, dtype=dtype, include_returns=not compact
+    ):
+        values[filled:filled + len(keep)] = block
+        positions[filled:filled + len(keep)] = keep
+        filled += len(keep)
+
+    return pd.DataFrame(values, index=df.index[positions], columns=columns)
+
+
+def extend_vol_panel(
+    df: pd.DataFrame,
+    panel: pd.DataFrame,
+    windows: list[int] = [20, 60, 120],
+    price_col: str = "Adj Close",
+    periods_per_year: float = TRADING_DAYS,
+) -> pd.DataFrame:
+    """
+    panel plus the rows for the bars of df after its last row, recomputing only the tail.
+
+    df is the whole history (old bars followed by new ones) and panel a
+    fused_vol_panel or chunked_vol_panel of an earlier prefix of it. Only the
+    new bars and the lookback their windows need are run through the engine
+    (as in iter_vol_panel_chunks), so the appended rows match a full rebuild.
+    """
+    windows = [int(w) for w in windows]
+    include_returns = "log_return" in panel.columns
+    columns = panel_columns(windows, include_returns=include_returns)
+    if list(panel.columns) != columns:
+        raise ValueError(f"panel columns {list(panel.columns)} are not the engine layout for windows {windows}")
+    dtype = panel.dtypes.iloc[0] if len(panel.columns) else np.float64
+
+    start = int(df.index.searchsorted(panel.index[-1], side="right")) if len(panel) else 0
+    if start >= len(df):
+        return panel
+
+    nan_price = np.isnan(df[price_col].to_numpy(dtype=np.float64))
+    lo = _chunk_lookback_start(nan_price, start, max(windows))
+    keep, values = _fused_panel_values(
+        df.iloc[lo:], windows, price_col, periods_per_year, dtype=dtype, include_returns=include_returns
+    )
+    keep += lo
+    own = keep >= start
+    tail = pd.DataFrame(values[own], index=df.index[keep[own]], columns=columns)
+    return pd.concat([panel, tail]) if len(panel) else tail
+
+
+# ---------------------------------------------------------------------------
+# Overnight-aware and recursive estimators (opt-in panel columns)
+# ---------------------------------------------------------------------------
+
+EXTRA_ESTIMATORS = ("yz", "ewma", "garch")
+
+
+def yang_zhang_volatility(
+    df: pd.DataFrame,
+    windows: list[int] = [20, 60, 120],
+    periods_per_year: float = TRADING_DAYS,
+) -> pd.DataFrame:
+    """
+    Yang-Zhang volatility (overnight + open-to-close + Rogers-Satchell, uses Open, High, Low, Close).
+
+    Per window n:
+      var = var(overnight) + k * var(open-to-close) + (1 - k) * mean(RS)
+      k   = 0.34 / (1.34 + (n + 1) / (n - 1))
+    with sample variances (ddof=1). The first bar has no overnight return, so
+    the first n rows are NaN. Returns annualized rolling vols: yz_20, yz_60, ...
+    """
+    ohlc = df[["Open", "High", "Low", "Close"]].to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_o, log_h, log_l, log_c = np.log(ohlc).T
+
+    overnight = np.empty(len(ohlc), dtype=np.float64)
+    overnight[:1] = np.nan
+    np.subtract(log_o[1:], log_c[:-1], out=overnight[1:])
+    open_close = log_c - log_o
+    rs = np.maximum((log_h - log_o) * (log_h - log_c) + (log_l - log_o) * (log_l - log_c), 0.0)
+    rs[np.isnan(overnight)] = np.nan
+
+    var_o = RollingMoments(overnight)
+    var_c = RollingMoments(open_close)
+    mean_rs = PrefixSums(rs)
+
     out = pd.DataFrame(index=df.index)
     for w in windows:
-        out[f"rs_{w}"] = _annualized_rolling_vol_from_daily_var(daily_var, w)
+        w = int(w)
+        if w < 2:
+            out[f"yz_{w}"] = np.nan
+            continue
+        k = 0.34 / (1.34 + (w + 1) / (w - 1))
+        var = var_o.rolling_std(w) ** 2 + k * var_c.rolling_std(w) ** 2 + (1.0 - k) * mean_rs.rolling_mean(w)
+        out[f"yz_{w}"] = np.sqrt(var) * np.sqrt(periods_per_year)
+    return out
+
+
+def ewma_volatility(
+    df: pd.DataFrame,
+    price_col: str = "Adj Close",
+    windows: list[int] = [20, 60, 120],
+    periods_per_year: float = TRADING_DAYS,
+) -> pd.DataFrame:
+    """
+    EWMA (RiskMetrics-style) volatility of log returns, one decay per window.
+
+    A window n is read as an EWMA span: lambda = 1 - 2 / (n + 1), so n = 32
+    is close to RiskMetrics' daily 0.94. The recursion
+      var_t = lambda * var_{t-1} + (1 - lambda) * r_t^2
+    runs in pandas' compiled ewm (adjust=False); the first n - 1 rows are
+    NaN like the rolling estimators. Returns ewma_20, ewma_60, ... on the
+    log-return index.
+    """
+    if price_col not in df.columns:
+        raise ValueError(f"{price_col} not found in DataFrame columns: {df.columns.tolist()}")
 
+    r = compute_log_returns(df[price_col].astype(float))
+    r2 = r * r
+
+    out = pd.DataFrame(index=r.index)
+    for w in windows:
+        var = r2.ewm(span=int(w), adjust=False, min_periods=int(w)).mean()
+        out[f"ewma_{w}"] = annualize_vol(np.sqrt(var.to_numpy()), periods_per_year)
     return out
+
+
+def garch_variance(returns: np.ndarray, omega: float, alpha: float, beta: float, h0: float | None = None) -> np.ndarray:
+    """
+    GARCH(1,1) filter: h_t = omega + alpha * r_t^2 + beta * h_{t-1}.
+
+    h_t is the variance forecast for bar t + 1 made after seeing r_t; h_{-1}
+    defaults to the unconditional variance omega / (1 - alpha - beta). The
+    recursion is linear in h, so it runs as one compiled EWMA pass: with
+    z_t = (omega + alpha * r_t^2) / (1 - beta), h is ewm(alpha=1 - beta) of
+    [h_{-1}, z_0, z_1, ...].
+    """
+    if not (omega > 0 and alpha >= 0 and 0 <= beta < 1 and alpha + beta < 1):
+        raise ValueError(f"GARCH(1,1) needs omega > 0, alpha, beta >= 0 and alpha + beta < 1, got {(omega, alpha, beta)}")
+    r = np.asarray(returns, dtype=np.float64)
+    if h0 is None:
+        h0 = omega / (1.0 - alpha - beta)
+
+    z = np.empty(len(r) + 1, dtype=np.float64)
+    z[0] = h0
+    np.multiply(r, r, out=z[1:])
+    z[1:] *= alpha
+    z[1:] += omega
+    z[1:] /= 1.0 - beta
+    h = pd.Series(z).ewm(alpha=1.0 - beta, adjust=False).mean().to_numpy()
+    return h[1:]
+
+
+def _garch_loglik(r: np.ndarray, sample_var: float, alpha: float, persistence: float) -> float:
+    beta = persistence - alpha
+    omega = sample_var * (1.0 - persistence)
+    h = garch_variance(r, omega, alpha, beta, h0=sample_var)
+    # r_t is scored against the forecast made at t-1
+    sigma2 = np.concatenate(([sample_var], h[:-1]))
+    return float(-0.5 * np.sum(np.log(sigma2) + r * r / sigma2))
+
+
+def fit_garch(returns: np.ndarray, refine_steps: int = 40) -> tuple[float, float, float]:
+    """
+    Gaussian quasi-ML fit of GARCH(1,1) with variance targeting; returns (omega, alpha, beta).
+
+    omega is pinned to sample_var * (1 - alpha - beta), leaving (alpha,
+    alpha + beta) to a coarse grid and then a shrinking pattern search. Each
+    likelihood evaluation is one compiled filter pass, so no optimizer
+    dependency is needed. returns should be demeaned and free of NaN.
+    """
+    r = np.asarray(returns, dtype=np.float64)
+    r = r[np.isfinite(r)]
+    sample_var = float(np.mean(r * r))
+    if len(r) < 10 or sample_var <= 0:
+        raise ValueError("fit_garch needs at least 10 finite, non-constant returns")
+
+    def score(alpha: float, persistence: float) -> float:
+        if not (0.0 <= alpha < persistence < 0.9999):
+            return -np.inf
+        return _garch_loglik(r, sample_var, alpha, persistence)
+
+    grid = [(a, p) for p in (0.8, 0.9, 0.95, 0.97, 0.98, 0.99, 0.995) for a in (0.02, 0.05, 0.08, 0.12, 0.18, 0.25) if a < p]
+    best = max(grid, key=lambda ap: score(*ap))
+    best_ll = score(*best)
+
+    step_a, step_p = 0.02, 0.01
+    for _ in range(refine_steps):
+        improved = False
+        for da, dp in ((step_a, 0), (-step_a, 0), (0, step_p), (0, -step_p)):
+            cand = (best[0] + da, best[1] + dp)
+            ll = score(*cand)
+            if ll > best_ll:
+                best, best_ll, improved = cand, ll, True
+        if not improved:
+            step_a /= 2.0
+            step_p /= 2.0
+            if step_p < 1e-4:
+                break
+
+    alpha, persistence = best
+    return sample_var * (1.0 - persistence), alpha, persistence - alpha
+
+
+def garch_volatility(
+    df: pd.DataFrame,
+    price_col: str = "Adj Close",
+    params: tuple[float, float, float] | None = None,
+    periods_per_year: float = TRADING_DAYS,
+) -> pd.DataFrame:
+    """
+    GARCH(1,1) conditional volatility of (demeaned) log returns, annualized.
+
+    params is (omega, alpha, beta) per bar; None fits them with fit_garch.
+    Returns one column, garch, on the log-return index: the forecast for the
+    next bar made at each close.
+    """
+    if price_col not in df.columns:
+        raise ValueError(f"{price_col} not found in DataFrame columns: {df.columns.tolist()}")
+
+    r = compute_log_returns(df[price_col].astype(float))
+    x = r.to_numpy(dtype=np.float64)
+    x = x - x.mean()
+    omega, alpha, beta = params if params is not None else fit_garch(x)
+
+    h = garch_variance(x, omega, alpha, beta)
+    return pd.DataFrame({"garch": annualize_vol(np.sqrt(h), periods_per_year)}, index=r.index)
+
+
+def extra_panel_columns(estimators: list[str], windows: list[int]) -> list[str]:
+    cols = []
+    for name in estimators:
+        cols += ["garch"] if name == "garch" else [f"{name}_{w}" for w in windows]
+    return cols
+
+
+def extra_vol_panel(
+    df: pd.DataFrame,
+    estimators: list[str],
+    windows: list[int] = [20, 60, 120],
+    price_col: str = "Adj Close",
+    periods_per_year: float = TRADING_DAYS,
+    garch_params: tuple[float, float, float] | None = None,
+) -> pd.DataFrame:
+    """
+    Columns of the opt-in estimators (any of EXTRA_ESTIMATORS), ready to join onto a vol panel.
+    """
+    unknown = [e for e in estimators if e not in EXTRA_ESTIMATORS]
+    if unknown:
+        raise ValueError(f"Unknown estimators {unknown}, expected some of {EXTRA_ESTIMATORS}")
+
+    parts = []
+    for name in estimators:
+        if name == "yz":
+            parts.append(yang_zhang_volatility(df, windows=windows, periods_per_year=periods_per_year))
+        elif name == "ewma":
+            parts.append(ewma_volatility(df, price_col=price_col, windows=windows, periods_per_year=periods_per_year))
+        else:
+            parts.append(garch_volatility(df, price_col=price_col, params=garch_params, periods_per_year=periods_per_year))
+    return pd.concat(parts, axis=1) if parts else pd.DataFrame(index=df.index)